@@ -1,6 +1,54 @@
+import asyncio
 import csv
+import hashlib
+import io
+import math
+import mmap
+import operator
+import os
 import re
-from typing import Dict, List, Optional, TextIO
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, namedtuple
+from collections.abc import Sequence
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import partial
+from heapq import merge
+from itertools import accumulate, chain, islice, repeat
+from types import MappingProxyType
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from ._narzedzia import BLEDY_ROZPAKOWANIA, modul_kompresji
+
+try:
+    import numpy as np
+except ImportError:  # numpy jest opcjonalne – wtedy array.array
+    np = None
 
 
 class CSVParsingError(Exception):
@@ -8,105 +56,386 @@ class CSVParsingError(Exception):
     pass
 
 
+class CSVErrorReport(CSVParsingError):
+    """Zbiorczy raport błędów (tryb bledy="collect").
+
+    bledy: lista (numer wiersza, komunikat) w kolejności wystąpienia;
+    przerwano=True, gdy skanowanie zatrzymał limit max_bledow."""
+
+    def __init__(
+        self,
+        bledy: List[Tuple[int, str]],
+        przerwano: bool = False,
+    ) -> None:
+        self.bledy = list(bledy)
+        self.przerwano = przerwano
+        naglowek = (
+            f"Znaleziono {len(self.bledy)} błędów w pliku CSV"
+            f"{' (przerwano po limicie)' if przerwano else ''}:"
+        )
+        super().__init__(
+            "\n".join([naglowek] + [k for _, k in self.bledy])
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self.bledy, self.przerwano))
+
+
 def parse_csv_file(
     sciezka: str,
     wymagane_pola: Optional[List[str]] = None,
     separator: str = ",",
-) -> List[Dict[str, str]]:
+    typ_wiersza: str = "dict",
+    zapisz_indeks: bool = False,
+    pamiec_podreczna: bool = False,
+    bledy: str = "raise",
+    max_bledow: Optional[int] = None,
+    kolumny: Optional[List[str]] = None,
+    warunek: Optional[Any] = None,
+    statystyki: Optional[Dict[str, Any]] = None,
+    unikalne_pola: Optional[List[str]] = None,
+    internuj: Optional[Union[bool, List[str]]] = None,
+    migawka: Optional[str] = None,
+    limit_pamieci: Optional[int] = None,
+    limit_unikalnych: Optional[int] = None,
+) -> Union[List[Any], "CSVRows"]:
+    """migawka: ścieżka pliku z kolumnowym zapisem zwalidowanego wyniku.
+    Jeśli jest aktualna (ten sam rozmiar i czas modyfikacji źródła oraz
+    te same opcje), wiersze odtwarzane są z niej bez parsowania CSV;
+    w przeciwnym razie plik jest parsowany, a migawka zapisywana na nowo.
+    Przy warunku będącym funkcją migawka nie jest ani czytana, ani
+    zapisywana – funkcji nie da się trwale porównać między procesami.
+
+    limit_pamieci: jak w parse_csv. Wynik przeniesiony na dysk (CSVRows)
+    nie trafia do pamięci podręcznej ani do migawki."""
+
+    # wynik z pamięci podręcznej jest tylko do odczytu (krotka wierszy)
+    if pamiec_podreczna:
+        klucz = _CACHE.klucz(
+            sciezka,
+            wymagane_pola,
+            separator,
+            typ_wiersza,
+            kolumny,
+            warunek,
+            unikalne_pola,
+        )
+        dane = _CACHE.pobierz(klucz)
+        if dane is not None:
+            if statystyki is not None:
+                _nowe_statystyki(statystyki)
+                statystyki["wiersze_zwrocone"] = len(dane)
+                statystyki["z_pamieci_podrecznej"] = True
+            return dane
+
+    if callable(warunek):
+        migawka = None
+    if migawka is not None:
+        stat = os.stat(sciezka)
+        opcje = _odcisk_opcji(
+            wymagane_pola, separator, kolumny, warunek, unikalne_pola
+        )
+        dane = _wczytaj_migawke(migawka, stat, opcje, typ_wiersza)
+        if dane is not None:
+            if statystyki is not None:
+                _nowe_statystyki(statystyki)
+                statystyki["wiersze_zwrocone"] = len(dane)
+                statystyki["z_migawki"] = True
+            if pamiec_podreczna:
+                dane = _CACHE.dodaj(klucz, dane)
+            return dane
 
     try:
-        with open(sciezka, "r", encoding="utf-8") as plik:
-            return parse_csv(plik, wymagane_pola, separator)
+        with _otworz_plik(sciezka) as plik:
+            dane = parse_csv(
+                plik,
+                wymagane_pola,
+                separator,
+                typ_wiersza=typ_wiersza,
+                bledy=bledy,
+                max_bledow=max_bledow,
+                kolumny=kolumny,
+                warunek=warunek,
+                statystyki=statystyki,
+                unikalne_pola=unikalne_pola,
+                internuj=internuj,
+                limit_pamieci=limit_pamieci,
+                limit_unikalnych=limit_unikalnych,
+            )
     except FileNotFoundError:
         # pozwalamy, by testy wychwyciły FileNotFoundError
         raise
 
+    if statystyki is not None:
+        statystyki["bajty"] = os.path.getsize(sciezka)
+    if isinstance(dane, CSVRows):
+        migawka = None
+        pamiec_podreczna = False
+    if migawka is not None:
+        naglowki = (
+            list(kolumny) if kolumny is not None
+            else probe_csv_header(sciezka, separator=separator)
+        )
+        _zapisz_migawke(migawka, stat, opcje, naglowki, dane)
+    if zapisz_indeks:
+        _zapisz_indeks(sciezka, separator)
+    if pamiec_podreczna:
+        dane = _CACHE.dodaj(klucz, dane)
+    return dane
+
+
+def iter_csv_file(
+    sciezka: str,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    typ_wiersza: str = "dict",
+    bledy: str = "raise",
+    max_bledow: Optional[int] = None,
+    kolumny: Optional[List[str]] = None,
+    warunek: Optional[Any] = None,
+    statystyki: Optional[Dict[str, Any]] = None,
+    unikalne_pola: Optional[List[str]] = None,
+    internuj: Optional[Union[bool, List[str]]] = None,
+    limit_unikalnych: Optional[int] = None,
+) -> Iterator[Any]:
+    """Strumieniowa wersja parse_csv_file – wiersze czytane są na bieżąco."""
+
+    with _otworz_plik(sciezka) as plik:
+        yield from iter_csv(
+            plik,
+            wymagane_pola,
+            separator,
+            typ_wiersza=typ_wiersza,
+            bledy=bledy,
+            max_bledow=max_bledow,
+            kolumny=kolumny,
+            warunek=warunek,
+            statystyki=statystyki,
+            unikalne_pola=unikalne_pola,
+            internuj=internuj,
+            limit_unikalnych=limit_unikalnych,
+        )
+
 
 def parse_csv(
     plik: TextIO,
     wymagane_pola: Optional[List[str]] = None,
     separator: str = ",",
-) -> List[Dict[str, str]]:
+    typ_wiersza: str = "dict",
+    bledy: str = "raise",
+    max_bledow: Optional[int] = None,
+    kolumny: Optional[List[str]] = None,
+    warunek: Optional[Any] = None,
+    statystyki: Optional[Dict[str, Any]] = None,
+    unikalne_pola: Optional[List[str]] = None,
+    internuj: Optional[Union[bool, List[str]]] = None,
+    limit_pamieci: Optional[int] = None,
+    limit_unikalnych: Optional[int] = None,
+) -> Union[List[Any], "CSVRows"]:
+    """limit_pamieci: szacowany limit bajtów dla wierszy w pamięci. Gdy
+    wynik go przekroczy, wiersze przenoszone są do tymczasowej bazy
+    sqlite3 na dysku, a zwracany jest CSVRows – leniwa sekwencja
+    z len(), iteracją i dostępem po indeksie."""
 
-    try:
-        #1. Skan pustych wierszy
+    wiersze = iter_csv(
+        plik,
+        wymagane_pola,
+        separator,
+        typ_wiersza=typ_wiersza,
+        bledy=bledy,
+        max_bledow=max_bledow,
+        kolumny=kolumny,
+        warunek=warunek,
+        statystyki=statystyki,
+        unikalne_pola=unikalne_pola,
+        internuj=internuj,
+        limit_unikalnych=limit_unikalnych,
+    )
+    if limit_pamieci is None:
+        return list(wiersze)
+    return _zbierz_z_limitem(wiersze, typ_wiersza, limit_pamieci)
+
+
+class _Zbieracz:
+    """Zbiera błędy wierszy w trybie bledy="collect"."""
+
+    def __init__(self, max_bledow: Optional[int]) -> None:
+        self.bledy: List[Tuple[int, str]] = []
+        self.max_bledow = max_bledow
+        self.puste_linie = 0
+
+    def zglos(self, nr: int, komunikat: str) -> None:
+        self.bledy.append((nr, komunikat))
+        if self.max_bledow is not None and len(self.bledy) >= self.max_bledow:
+            raise CSVErrorReport(self.bledy, przerwano=True)
+
+    def zakoncz(self) -> None:
+        if self.bledy:
+            raise CSVErrorReport(self.bledy)
+
+
+def _zbieracz(bledy: str, max_bledow: Optional[int]) -> Optional[_Zbieracz]:
+    if bledy == "raise":
+        return None
+    if bledy == "collect":
+        return _Zbieracz(max_bledow)
+    raise CSVParsingError(
+        f"Nieznany tryb bledy: {bledy!r} (dozwolone: 'raise', 'collect')."
+    )
+
+
+def _nowe_statystyki(statystyki: Dict[str, Any]) -> Dict[str, Any]:
+    """Przygotowuje słownik statystyk jednego wywołania."""
+
+    statystyki.clear()
+    statystyki.update(
+        {
+            "czasy_s": dict.fromkeys(
+                ["naglowek", "parsowanie", "walidacja", "filtrowanie",
+                 "budowanie", "razem"],
+                0.0,
+            ),
+            "znaki": 0,
+            "linie": 0,
+            "wiersze": 0,
+            "wiersze_zwrocone": 0,
+            "reguly": dict.fromkeys(
+                ["pusta_linia", "dodatkowe_kolumny", "brak_wartosci",
+                 "duplikaty", "odfiltrowane"],
+                0,
+            ),
+        }
+    )
+    return statystyki
+
+
+def _zliczaj_linie(
+    plik: Iterable[str],
+    statystyki: Dict[str, Any],
+) -> Iterator[str]:
+    for line in plik:
+        statystyki["linie"] += 1
+        statystyki["znaki"] += len(line)
+        yield line
+
+
+def _mierzony(
+    funkcja: Callable[..., Any],
+    czasy: Dict[str, float],
+    etap: str,
+) -> Callable[..., Any]:
+    """Opakowuje funkcję tak, by jej czas doliczał się do etapu."""
+
+    def opakowana(*args: Any) -> Any:
+        start = time.perf_counter()
         try:
-            for idx, line in enumerate(plik.readlines(), start=1):
-                if not line.strip() and idx != 1:
-                    raise CSVParsingError(
-                        f"Pusta linia wykryta w wierszu {idx}."
-                    )
-            plik.seek(0)
-        except AttributeError:
-            # Obiekt nie wspiera readlines/seek pomijamy skan
-            pass
+            return funkcja(*args)
+        finally:
+            czasy[etap] += time.perf_counter() - start
+    return opakowana
 
-        reader = csv.DictReader(
-            plik,
-            delimiter=separator,
-            skipinitialspace=True,
+
+def _linie(
+    plik: Iterable[str],
+    pierwsza_linia: int = 1,
+    zbieracz: Optional[_Zbieracz] = None,
+    statystyki: Optional[Dict[str, Any]] = None,
+) -> Iterator[str]:
+    """Przepuszcza linie pliku, zgłaszając puste linie po nagłówku."""
+
+    if statystyki is not None:
+        plik = _zliczaj_linie(plik, statystyki)
+
+    for idx, line in enumerate(plik, start=pierwsza_linia):
+        if not line.strip() and idx != 1:
+            if statystyki is not None:
+                statystyki["reguly"]["pusta_linia"] += 1
+            komunikat = f"Pusta linia wykryta w wierszu {idx}."
+            if zbieracz is None:
+                raise CSVParsingError(komunikat)
+            zbieracz.puste_linie += 1
+            zbieracz.zglos(idx, komunikat)
+            continue
+        yield line
+
+
+def _waliduj_naglowek(
+    naglowki: Optional[List[str]],
+    wymagane_pola: Optional[List[str]],
+) -> List[str]:
+    """Sprawdza nagłówek i zwraca listę pól wymaganych."""
+
+    if not naglowki:
+        raise CSVParsingError(
+            "Brak wiersza nagłówka w pliku CSV."
         )
-        naglowki = reader.fieldnames
-        if not naglowki:
-            raise CSVParsingError(
-                "Brak wiersza nagłówka w pliku CSV."
-            )
 
-        #2. Walidacja nagłówka
-        if all(h.strip().isdigit() or not h.strip() for h in naglowki):
-            raise CSVParsingError(
-                "Nagłówek wygląda niepoprawnie (tylko liczby lub puste)."
-            )
+    if all(h.strip().isdigit() or not h.strip() for h in naglowki):
+        raise CSVParsingError(
+            "Nagłówek wygląda niepoprawnie (tylko liczby lub puste)."
+        )
 
-        if any(re.match(r"^\d", h.strip()) for h in naglowki):
-            raise CSVParsingError(
-                f"Niewłaściwe nazwy kolumn: {', '.join(naglowki)}. "
-                "Nazwy nie mogą zaczynać się od cyfry."
-            )
+    if any(re.match(r"^\d", h.strip()) for h in naglowki):
+        raise CSVParsingError(
+            f"Niewłaściwe nazwy kolumn: {', '.join(naglowki)}. "
+            "Nazwy nie mogą zaczynać się od cyfry."
+        )
 
-        if any(" " in h for h in naglowki):
-            raise CSVParsingError(
-                f"Nazwy kolumn zawierają spacje: {', '.join(naglowki)}."
-            )
+    if any(" " in h for h in naglowki):
+        raise CSVParsingError(
+            f"Nazwy kolumn zawierają spacje: {', '.join(naglowki)}."
+        )
 
-        if len(naglowki) != len(set(naglowki)):
-            raise CSVParsingError(
-                f"Powtórzone nazwy kolumn: {', '.join(naglowki)}."
-            )
+    if len(naglowki) != len(set(naglowki)):
+        raise CSVParsingError(
+            f"Powtórzone nazwy kolumn: {', '.join(naglowki)}."
+        )
 
-        #3. Sprawdzenie wymaganych pól
-        if wymagane_pola is None:
-            wymagane_pola = naglowki.copy()
+    if wymagane_pola is None:
+        wymagane_pola = naglowki.copy()
 
-        brakujace = [p for p in wymagane_pola if p not in naglowki]
-        if brakujace:
-            raise CSVParsingError(
-                f"Brakujące pola w nagłówku: {', '.join(brakujace)}."
-            )
+    brakujace = [p for p in wymagane_pola if p not in naglowki]
+    if brakujace:
+        raise CSVParsingError(
+            f"Brakujące pola w nagłówku: {', '.join(brakujace)}."
+        )
 
-        #4. Iteracja po danych
-        dane: List[Dict[str, str]] = []
-        for idx, row in enumerate(reader, start=2):
-            if None in row:
-                raise CSVParsingError(
-                    f"Dodatkowe kolumny w wierszu {idx}."
-                )
+    return wymagane_pola
 
-            puste = [
-                p
-                for p in wymagane_pola
-                if not row.get(p) or not row[p].strip()
-            ]
-            if puste:
-                raise CSVParsingError(
-                    f"Brak wartości w polach: {', '.join(puste)} "
-                    f"w wierszu {idx}."
-                )
 
-            dane.append(row)
+def _kompresja(sciezka: str) -> Optional[Any]:
+    """Moduł gzip, bz2 lub lzma, jeśli plik jest skompresowany."""
 
-        return dane
+    with open(sciezka, "rb") as plik:
+        return modul_kompresji(plik.read(6))
+
+
+def _otworz_plik(sciezka: str) -> TextIO:
+    """Otwiera plik do czytania jako tekst UTF-8; pliki gzip, bz2 i xz
+    (rozpoznane po sygnaturze) są rozpakowywane strumieniowo."""
+
+    modul = _kompresja(sciezka)
+    if modul is None:
+        return open(sciezka, "r", encoding="utf-8")
+    return modul.open(sciezka, "rt", encoding="utf-8")
+
+
+def _tylko_nieskompresowany(sciezka: str) -> None:
+    if _kompresja(sciezka) is not None:
+        raise CSVParsingError(
+            f"Plik {sciezka} jest skompresowany; ta operacja wymaga "
+            f"swobodnego dostępu do bajtów pliku."
+        )
 
+
+@contextmanager
+def _bledy_csv() -> Iterator[None]:
+    """Zamienia błędy odczytu/parsowania na CSVParsingError."""
+
+    try:
+        yield
+    except CSVParsingError:
+        raise
     except UnicodeDecodeError as exc:
         raise CSVParsingError(
             "Nie można odczytać pliku CSV (błąd kodowania)."
@@ -115,6 +444,11 @@ def parse_csv(
         raise CSVParsingError(
             f"Błąd parsowania CSV: {exc}"
         ) from exc
+    except BLEDY_ROZPAKOWANIA as exc:
+        # uszkodzony lub urwany plik skompresowany
+        raise CSVParsingError(
+            f"Nie można odczytać pliku CSV: {exc}"
+        ) from exc
     except TypeError as exc:
         raise CSVParsingError(
             "Nieprawidłowy obiekt pliku CSV."
@@ -123,3 +457,2745 @@ def parse_csv(
         raise CSVParsingError(
             f"Nieoczekiwany błąd: {exc}"
         ) from exc
+
+
+def _otworz(
+    plik: TextIO,
+    wymagane_pola: Optional[List[str]],
+    separator: str,
+    zbieracz: Optional[_Zbieracz] = None,
+    statystyki: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[str], List[str], Iterator[Tuple[int, List[str]]]]:
+    """Czyta i waliduje nagłówek; zwraca nagłówki, pola wymagane
+    oraz iterator zwalidowanych wierszy (numer, lista pól)."""
+
+    start = time.perf_counter()
+    reader = csv.reader(
+        _linie(plik, zbieracz=zbieracz, statystyki=statystyki),
+        delimiter=separator,
+        skipinitialspace=True,
+    )
+    naglowki = next(reader, None)
+    wymagane_pola = _waliduj_naglowek(naglowki, wymagane_pola)
+
+    if statystyki is None:
+        wiersze = _waliduj_wiersze(reader, naglowki, wymagane_pola, zbieracz)
+    else:
+        statystyki["czasy_s"]["naglowek"] += time.perf_counter() - start
+        wiersze = _waliduj_wiersze_mierzone(
+            reader, naglowki, wymagane_pola, zbieracz, statystyki
+        )
+    return naglowki, wymagane_pola, wiersze
+
+
+def _waliduj_wiersze(
+    reader: Iterator[List[str]],
+    naglowki: List[str],
+    wymagane_pola: List[str],
+    zbieracz: Optional[_Zbieracz] = None,
+    pierwszy_wiersz: int = 2,
+) -> Iterator[Tuple[int, List[str]]]:
+    """Sprawdza dodatkowe kolumny i puste pola wymagane w każdym wierszu.
+
+    Ze zbieraczem błędne wiersze są pomijane, a numeracja uwzględnia
+    pominięte puste linie."""
+
+    liczba_kolumn = len(naglowki)
+    indeksy = _indeksy_wymaganych(naglowki, wymagane_pola)
+
+    if zbieracz is None:
+        for idx, row in enumerate(reader, start=pierwszy_wiersz):
+            _sprawdz_wiersz(row, idx, liczba_kolumn, indeksy)
+            yield idx, row
+        return
+
+    for nr, row in enumerate(reader, start=pierwszy_wiersz):
+        idx = nr + zbieracz.puste_linie
+        try:
+            _sprawdz_wiersz(row, idx, liczba_kolumn, indeksy)
+        except CSVParsingError as exc:
+            zbieracz.zglos(idx, str(exc))
+            continue
+        yield idx, row
+    zbieracz.zakoncz()
+
+
+def _waliduj_wiersze_mierzone(
+    reader: Iterator[List[str]],
+    naglowki: List[str],
+    wymagane_pola: List[str],
+    zbieracz: Optional[_Zbieracz],
+    statystyki: Dict[str, Any],
+) -> Iterator[Tuple[int, List[str]]]:
+    """Jak _waliduj_wiersze, ale z pomiarem czasu parsowania i walidacji
+    oraz licznikami naruszonych reguł."""
+
+    liczba_kolumn = len(naglowki)
+    indeksy = _indeksy_wymaganych(naglowki, wymagane_pola)
+    czasy = statystyki["czasy_s"]
+    reguly = statystyki["reguly"]
+    zegar = time.perf_counter
+
+    nr = 1
+    while True:
+        start = zegar()
+        row = next(reader, None)
+        sparsowano = zegar()
+        czasy["parsowanie"] += sparsowano - start
+        if row is None:
+            break
+
+        nr += 1
+        statystyki["wiersze"] += 1
+        idx = nr if zbieracz is None else nr + zbieracz.puste_linie
+        try:
+            _sprawdz_wiersz(row, idx, liczba_kolumn, indeksy)
+        except CSVParsingError as exc:
+            if len(row) > liczba_kolumn:
+                reguly["dodatkowe_kolumny"] += 1
+            else:
+                reguly["brak_wartosci"] += 1
+            if zbieracz is None:
+                raise
+            zbieracz.zglos(idx, str(exc))
+            continue
+        finally:
+            czasy["walidacja"] += zegar() - sparsowano
+        yield idx, row
+
+    if zbieracz is not None:
+        zbieracz.zakoncz()
+
+
+def _indeksy_wymaganych(
+    naglowki: List[str],
+    wymagane_pola: List[str],
+) -> List[Tuple[str, int]]:
+    return [(p, naglowki.index(p)) for p in wymagane_pola]
+
+
+def _sprawdz_wiersz(
+    row: List[str],
+    idx: int,
+    liczba_kolumn: int,
+    indeksy: List[Tuple[str, int]],
+) -> None:
+    if len(row) > liczba_kolumn:
+        raise CSVParsingError(
+            f"Dodatkowe kolumny w wierszu {idx}."
+        )
+
+    puste = [
+        p
+        for p, i in indeksy
+        if i >= len(row) or not row[i].strip()
+    ]
+    if puste:
+        raise CSVParsingError(
+            f"Brak wartości w polach: {', '.join(puste)} "
+            f"w wierszu {idx}."
+        )
+
+
+def _jako_slownik(naglowki: List[str], row: List[str]) -> Dict[str, str]:
+    """Buduje słownik jak csv.DictReader (brakujące kolumny -> None)."""
+
+    if len(row) == len(naglowki):
+        return dict(zip(naglowki, row))
+    wiersz = dict.fromkeys(naglowki)
+    wiersz.update(zip(naglowki, row))
+    return wiersz
+
+
+def _klasa_slots(naglowki: List[str]) -> type:
+    """Generuje lekką klasę wiersza z __slots__ dla danego nagłówka."""
+
+    niepoprawne = [h for h in naglowki if not h.isidentifier()]
+    if niepoprawne:
+        raise CSVParsingError(
+            f"Kolumny {', '.join(niepoprawne)} nie mogą być atrybutami "
+            "(typ_wiersza='slots')."
+        )
+
+    pola = tuple(naglowki)
+
+    def __repr__(self) -> str:
+        wartosci = ", ".join(f"{p}={getattr(self, p)!r}" for p in pola)
+        return f"WierszCSV({wartosci})"
+
+    def __eq__(self, other: object) -> bool:
+        # każde parsowanie tworzy nową klasę, więc porównujemy pola,
+        # a nie typ – wiersze z dwóch parsowań tego samego pliku są równe
+        klasa = type(other)
+        if (
+            getattr(klasa, "__slots__", None) != pola
+            or getattr(klasa, "_fields", None) != pola
+        ):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        return (getattr(self, p) for p in pola)
+
+    def __getitem__(self, pole: str) -> Optional[str]:
+        return getattr(self, pole)
+
+    def _asdict(self) -> Dict[str, Optional[str]]:
+        return dict(zip(pola, self))
+
+    klasa = type(
+        "WierszCSV",
+        (),
+        {
+            "__slots__": pola,
+            "__repr__": __repr__,
+            "__eq__": __eq__,
+            "__hash__": None,
+            "__iter__": __iter__,
+            "__getitem__": __getitem__,
+            "_fields": pola,
+            "_asdict": _asdict,
+        },
+    )
+    deskryptory = [getattr(klasa, p).__set__ for p in pola]
+
+    def _make(row: List[str]) -> Any:
+        wiersz = object.__new__(klasa)
+        for ustaw, wartosc in zip(deskryptory, row):
+            ustaw(wiersz, wartosc)
+        return wiersz
+
+    klasa._make = staticmethod(_make)
+    return klasa
+
+
+def _fabryka_wiersza(
+    naglowki: List[str],
+    typ_wiersza: str,
+) -> Callable[[List[str]], Any]:
+    """Zwraca funkcję budującą wiersz wynikowy z listy pól."""
+
+    if typ_wiersza == "dict":
+        return partial(_jako_slownik, naglowki)
+    if typ_wiersza == "tuple":
+        return namedtuple("WierszCSV", naglowki, rename=True)._make
+    if typ_wiersza == "slots":
+        return _klasa_slots(naglowki)._make
+    raise CSVParsingError(
+        f"Nieznany typ_wiersza: {typ_wiersza!r} "
+        "(dozwolone: 'dict', 'tuple', 'slots')."
+    )
+
+
+def iter_csv(
+    plik: TextIO,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    typ_wiersza: str = "dict",
+    bledy: str = "raise",
+    max_bledow: Optional[int] = None,
+    kolumny: Optional[List[str]] = None,
+    warunek: Optional[Any] = None,
+    statystyki: Optional[Dict[str, Any]] = None,
+    unikalne_pola: Optional[List[str]] = None,
+    internuj: Optional[Union[bool, List[str]]] = None,
+    limit_unikalnych: Optional[int] = None,
+) -> Iterator[Any]:
+    """Waliduje i zwraca wiersze CSV jeden po drugim, bez wczytywania
+    całego pliku do pamięci.
+
+    typ_wiersza: "dict" (domyślnie), "tuple" (namedtuple) lub "slots"
+    (klasa z __slots__) – jedna klasa na nagłówek, bez pośrednich
+    słowników.
+
+    bledy="collect": błędne wiersze i puste linie są pomijane, a po
+    przejściu całego pliku (lub po max_bledow błędach) zgłaszany jest
+    jeden CSVErrorReport ze wszystkimi błędami.
+
+    kolumny: zwracane są tylko wybrane kolumny (wybierane po indeksach
+    z listy pól, pozostałe nie trafiają do wiersza). Bez wymagane_pola
+    wymagane są wybrane kolumny.
+
+    warunek: filtr sprawdzany na surowej liście pól, zanim powstanie
+    wiersz wynikowy – funkcja przyjmująca listę pól (w kolejności
+    nagłówka), słownik {kolumna: wartość} albo lista krotek
+    (kolumna, operator, wartość), np. [("age", ">=", 18)]. Odfiltrowane
+    wiersze nadal przechodzą walidację.
+
+    statystyki: słownik wypełniany czasami etapów (czasy_s), liczbą
+    przeczytanych znaków i linii, wierszy oraz trafień reguł walidacji.
+
+    unikalne_pola: kombinacja wartości tych pól musi być unikalna w całym
+    pliku (jak klucz główny); sprawdzane w locie, w ograniczonej pamięci.
+    Błąd podaje numer powtórzonego wiersza i pierwszego wystąpienia.
+    limit_unikalnych: budżet bajtów na skróty kluczy w pamięci (domyślnie
+    _LIMIT_UNIKALNYCH); po jego przekroczeniu skróty trafiają na dysk.
+
+    internuj: lista kolumn, w których równe wartości mają być jednym
+    obiektem str (mniej pamięci przy powtarzalnych wartościach), albo
+    True – wszystkie kolumny, dopóki liczba różnych wartości w kolumnie
+    nie przekroczy _PROG_INTERNOWANIA."""
+
+    if statystyki is not None:
+        _nowe_statystyki(statystyki)
+        start = time.perf_counter()
+
+    try:
+        yield from _iter_csv(
+            plik,
+            wymagane_pola,
+            separator,
+            typ_wiersza,
+            bledy,
+            max_bledow,
+            kolumny,
+            warunek,
+            statystyki,
+            unikalne_pola,
+            internuj,
+            limit_unikalnych,
+        )
+    finally:
+        if statystyki is not None:
+            statystyki["czasy_s"]["razem"] = time.perf_counter() - start
+
+
+def _iter_csv(
+    plik: TextIO,
+    wymagane_pola: Optional[List[str]],
+    separator: str,
+    typ_wiersza: str,
+    bledy: str,
+    max_bledow: Optional[int],
+    kolumny: Optional[List[str]],
+    warunek: Optional[Any],
+    statystyki: Optional[Dict[str, Any]],
+    unikalne_pola: Optional[List[str]],
+    internuj: Optional[Union[bool, List[str]]],
+    limit_unikalnych: Optional[int],
+) -> Iterator[Any]:
+
+    zbieracz = _zbieracz(bledy, max_bledow)
+    with _bledy_csv():
+        naglowki, _, wiersze = _otworz(
+            plik,
+            kolumny if wymagane_pola is None else wymagane_pola,
+            separator,
+            zbieracz,
+            statystyki,
+        )
+        liczba_kolumn = len(naglowki)
+        zbior = None
+        if unikalne_pola is not None:
+            zbior = _ZbiorSkrotow(limit_unikalnych or _LIMIT_UNIKALNYCH)
+            sprawdz_unikalnosc = _sprawdzanie_unikalnosci(
+                naglowki, unikalne_pola, zbior
+            )
+        spelnia = None
+        if warunek is not None:
+            spelnia = _kompiluj_warunek(naglowki, warunek)
+        internuj_wiersz = None
+        if internuj:
+            internuj_wiersz = _internowanie(naglowki, internuj)
+        wybierz = None
+        if kolumny is not None:
+            wybierz = _projekcja(naglowki, kolumny)
+            naglowki = list(kolumny)
+
+        buduj = _fabryka_wiersza(naglowki, typ_wiersza)
+        if statystyki is not None:
+            buduj, spelnia = _mierz_etapy(buduj, spelnia, statystyki)
+        dopelnij = (
+            typ_wiersza != "dict"
+            or wybierz is not None
+            or spelnia is not None
+            or internuj_wiersz is not None
+        )
+
+        try:
+            for idx, row in wiersze:
+                if zbior is not None:
+                    try:
+                        sprawdz_unikalnosc(idx, row)
+                    except CSVParsingError as exc:
+                        if statystyki is not None:
+                            statystyki["reguly"]["duplikaty"] += 1
+                        if zbieracz is None:
+                            raise
+                        zbieracz.zglos(idx, str(exc))
+                        continue
+                if dopelnij and len(row) < liczba_kolumn:
+                    row = row + [None] * (liczba_kolumn - len(row))
+                if spelnia is not None and not spelnia(row):
+                    continue
+                if internuj_wiersz is not None:
+                    internuj_wiersz(row)
+                if wybierz is not None:
+                    row = wybierz(row)
+                yield buduj(row)
+        finally:
+            if zbior is not None:
+                zbior.zamknij()
+
+
+# Wynik większy niż limit_pamieci (wiersze w tymczasowej bazie sqlite3)
+
+_PROBKA_ROZMIARU = 1000
+
+
+def _zbierz_z_limitem(
+    wiersze: Iterator[Any],
+    typ_wiersza: str,
+    limit_bajtow: int,
+) -> Union[List[Any], "CSVRows"]:
+    """Lista wierszy albo CSVRows, gdy szacowany rozmiar listy (średnia
+    z pierwszych _PROBKA_ROZMIARU wierszy) przekroczyłby limit."""
+
+    dane = list(islice(wiersze, _PROBKA_ROZMIARU))
+    if not dane:
+        return dane
+    na_wiersz = _szacuj_rozmiar(dane) / len(dane)
+    limit_wierszy = max(int(limit_bajtow // na_wiersz), 1)
+
+    if len(dane) < limit_wierszy:
+        dane.extend(islice(wiersze, limit_wierszy - len(dane)))
+        nastepny = next(wiersze, None)
+        if nastepny is None:
+            return dane
+        dane.append(nastepny)
+
+    if isinstance(dane[0], dict):
+        naglowki = list(dane[0])
+    else:
+        naglowki = list(dane[0]._fields)
+    return CSVRows(naglowki, typ_wiersza, chain(dane, wiersze))
+
+
+class CSVRows(Sequence):
+    """Wiersze przechowywane w tymczasowej bazie sqlite3 na dysku.
+
+    Zachowuje się jak lista tylko do odczytu: len(), iteracja, indeksy
+    (także ujemne) i wycinki; każdy odczyt buduje nowe obiekty wierszy.
+    Baza znika po close() lub po usunięciu obiektu."""
+
+    def __init__(
+        self,
+        naglowki: List[str],
+        typ_wiersza: str,
+        wiersze: Iterable[Any],
+    ) -> None:
+        self.naglowki = naglowki
+        self._buduj = _fabryka_wiersza(naglowki, typ_wiersza)
+        # pusta nazwa pliku: prywatna baza tymczasowa na dysku
+        self._baza = sqlite3.connect("", check_same_thread=False)
+        kolumny = ", ".join(f"c{i}" for i in range(len(naglowki)))
+        znaki = ", ".join("?" * len(naglowki))
+        try:
+            self._baza.execute(f"CREATE TABLE wiersze ({kolumny})")
+            with self._baza:
+                self._baza.executemany(
+                    f"INSERT INTO wiersze VALUES ({znaki})",
+                    (
+                        tuple(w.values() if isinstance(w, dict) else w)
+                        for w in wiersze
+                    ),
+                )
+            (self._liczba,) = self._baza.execute(
+                "SELECT count(*) FROM wiersze"
+            ).fetchone()
+        except BaseException:
+            self._baza.close()
+            raise
+
+    def __len__(self) -> int:
+        return self._liczba
+
+    def __getitem__(self, indeks: Union[int, slice]) -> Any:
+        if isinstance(indeks, slice):
+            od, do, krok = indeks.indices(self._liczba)
+            if krok != 1:
+                return [self[i] for i in range(od, do, krok)]
+            wynik = self._baza.execute(
+                "SELECT * FROM wiersze WHERE rowid > ? AND rowid <= ? "
+                "ORDER BY rowid",
+                (od, max(od, do)),
+            )
+            return list(map(self._buduj, wynik))
+
+        if indeks < 0:
+            indeks += self._liczba
+        if not 0 <= indeks < self._liczba:
+            raise IndexError("Indeks wiersza poza zakresem.")
+        wiersz = self._baza.execute(
+            "SELECT * FROM wiersze WHERE rowid = ?", (indeks + 1,)
+        ).fetchone()
+        return self._buduj(wiersz)
+
+    def __iter__(self) -> Iterator[Any]:
+        kursor = self._baza.execute("SELECT * FROM wiersze ORDER BY rowid")
+        while True:
+            paczka = kursor.fetchmany(1000)
+            if not paczka:
+                return
+            yield from map(self._buduj, paczka)
+
+    def close(self) -> None:
+        self._baza.close()
+
+    def __enter__(self) -> "CSVRows":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        baza = getattr(self, "_baza", None)
+        if baza is not None:
+            baza.close()
+
+
+# Internowanie powtarzalnych wartości (internuj)
+
+_PROG_INTERNOWANIA = 1024
+
+
+def _internowanie(
+    naglowki: List[str],
+    internuj: Union[bool, List[str]],
+) -> Callable[[List[Optional[str]]], None]:
+    """Zwraca funkcję podmieniającą w wierszu (w miejscu) wartości na
+    wspólne obiekty str – po jednym słowniku wartości na kolumnę.
+
+    Przy internuj=True kolumna, w której przybyło więcej niż
+    _PROG_INTERNOWANIA różnych wartości, przestaje być internowana."""
+
+    if internuj is True:
+        kolumny, prog = naglowki, _PROG_INTERNOWANIA
+    else:
+        brakujace = [k for k in internuj if k not in naglowki]
+        if brakujace:
+            raise CSVParsingError(
+                f"Brakujące pola w nagłówku: {', '.join(brakujace)}."
+            )
+        kolumny, prog = internuj, None
+
+    tabele: List[Tuple[int, Dict[Optional[str], Optional[str]]]] = [
+        (naglowki.index(k), {}) for k in kolumny
+    ]
+
+    def internuj_wiersz(row: List[Optional[str]]) -> None:
+        nonlocal tabele
+        for i, tabela in tabele:
+            wartosc = row[i]
+            row[i] = tabela.setdefault(wartosc, wartosc)
+        if prog is not None and any(len(t) > prog for _, t in tabele):
+            tabele = [(i, t) for i, t in tabele if len(t) <= prog]
+
+    return internuj_wiersz
+
+
+# Unikalność wartości (unikalne_pola)
+
+_LIMIT_UNIKALNYCH = 64 * 1024 * 1024
+
+
+class _ZbiorSkrotow:
+    """Zbiór 64-bitowych skrótów kluczy z numerem wiersza pierwszego
+    wystąpienia: tablica z adresowaniem otwartym na dwóch array('Q').
+
+    Gdy tablica przekroczyłaby limit bajtów, jej zawartość jest sortowana
+    i zrzucana do pliku tymczasowego, przeszukiwanego dalej binarnie
+    przez mmap. Zrzuty podobnej wielkości są scalane, więc jest ich
+    najwyżej logarytmicznie wiele. Zero oznacza pusty slot.
+
+    Zrzut sortuje tablicę w miejscu kawałkami po _PACZKA slotów i scala
+    kawałki strumieniowo, więc poza samą tablicą zajmuje stałą pamięć."""
+
+    _POCZATKOWA_POJEMNOSC = 1 << 10
+    _PACZKA = 1 << 10
+
+    def __init__(self, limit_bajtow: int) -> None:
+        self.limit_bajtow = limit_bajtow
+        self._zrzuty: List[Tuple[Any, ...]] = []
+        self._nowa_tablica(self._POCZATKOWA_POJEMNOSC)
+
+    def _nowa_tablica(self, pojemnosc: int) -> None:
+        self._skroty = array("Q", [0]) * pojemnosc
+        self._wiersze = array("Q", [0]) * pojemnosc
+        self._maska = pojemnosc - 1
+        self._liczba = 0
+
+    def dodaj(self, skrot: int, wiersz: int) -> int:
+        """Dodaje skrót; zwraca numer wiersza wcześniejszego wystąpienia
+        tego samego skrótu albo 0, gdy go nie było."""
+
+        for skroty, wiersze, *_ in self._zrzuty:
+            i = bisect_left(skroty, skrot)
+            if i < len(skroty) and skroty[i] == skrot:
+                return wiersze[i]
+
+        skroty = self._skroty
+        maska = self._maska
+        i = skrot & maska
+        obecny = skroty[i]
+        while obecny:
+            if obecny == skrot:
+                return self._wiersze[i]
+            i = (i + 1) & maska
+            obecny = skroty[i]
+        skroty[i] = skrot
+        self._wiersze[i] = wiersz
+        self._liczba += 1
+        if 2 * self._liczba > len(skroty):
+            self._powieksz()
+        return 0
+
+    def _powieksz(self) -> None:
+        # przy przepisywaniu w pamięci są obie tablice, stara i nowa
+        stara = len(self._skroty)
+        pojemnosc = 4 * stara
+        if 16 * (pojemnosc + stara) > self.limit_bajtow:
+            pojemnosc = 2 * stara
+        if 16 * (pojemnosc + stara) > self.limit_bajtow:
+            self._zrzuc()
+            return
+
+        stare = zip(self._skroty, self._wiersze)
+        liczba = self._liczba
+        self._nowa_tablica(pojemnosc)
+        skroty, wiersze, maska = self._skroty, self._wiersze, self._maska
+        for skrot, wiersz in stare:
+            if skrot:
+                i = skrot & maska
+                while skroty[i]:
+                    i = (i + 1) & maska
+                skroty[i] = skrot
+                wiersze[i] = wiersz
+        self._liczba = liczba
+
+    def _zrzuc(self) -> None:
+        skroty, wiersze = self._skroty, self._wiersze
+        n = self._liczba
+
+        # posortowane kawałki zapisywane w miejscu, na początku swoich
+        # zakresów slotów; tablica przestaje być tablicą mieszającą
+        kawalki = []
+        for start in range(0, len(skroty), self._PACZKA):
+            koniec = start + self._PACZKA
+            pary = sorted(
+                p for p in zip(skroty[start:koniec], wiersze[start:koniec])
+                if p[0]
+            )
+            koniec = start + len(pary)
+            skroty[start:koniec] = array("Q", [s for s, _ in pary])
+            wiersze[start:koniec] = array("Q", [w for _, w in pary])
+            kawalki.append((start, koniec))
+        widok_skrotow, widok_wierszy = memoryview(skroty), memoryview(wiersze)
+        strumienie = [
+            zip(widok_skrotow[start:koniec], widok_wierszy[start:koniec])
+            for start, koniec in kawalki
+        ]
+
+        # scalanie z ostatnimi zrzutami nie większymi niż dwukrotność
+        scalane = []
+        while self._zrzuty and len(self._zrzuty[-1][0]) <= 2 * n:
+            scalane.append(self._zrzuty.pop())
+            n += len(scalane[-1][0])
+        strumienie.extend(zip(z[0], z[1]) for z in scalane)
+        self._zrzuty.append(self._zapisz_zrzut(merge(*strumienie), n))
+
+        del strumienie
+        widok_skrotow.release()
+        widok_wierszy.release()
+        self._nowa_tablica(self._POCZATKOWA_POJEMNOSC)
+        for zrzut in scalane:
+            self._zamknij_zrzut(zrzut)
+
+    @classmethod
+    def _zapisz_zrzut(
+        cls, pary: Iterable[Tuple[int, int]], n: int
+    ) -> Tuple[Any, ...]:
+        """Zapisuje n posortowanych par jako [skróty..., wiersze...]."""
+
+        plik = tempfile.TemporaryFile()
+        plik.truncate(16 * n)
+        pary = iter(pary)
+        pozycja = 0
+        while True:
+            blok = list(islice(pary, cls._PACZKA))
+            if not blok:
+                break
+            plik.seek(8 * pozycja)
+            array("Q", [s for s, _ in blok]).tofile(plik)
+            plik.seek(8 * (n + pozycja))
+            array("Q", [w for _, w in blok]).tofile(plik)
+            pozycja += len(blok)
+        plik.flush()
+
+        dane = mmap.mmap(plik.fileno(), 0, access=mmap.ACCESS_READ)
+        widok = memoryview(dane).cast("Q")
+        return widok[:n], widok[n:], widok, dane, plik
+
+    @staticmethod
+    def _zamknij_zrzut(zrzut: Tuple[Any, ...]) -> None:
+        skroty, wiersze, widok, dane, plik = zrzut
+        skroty.release()
+        wiersze.release()
+        widok.release()
+        dane.close()
+        plik.close()
+
+    def zamknij(self) -> None:
+        for zrzut in self._zrzuty:
+            self._zamknij_zrzut(zrzut)
+        self._zrzuty = []
+
+
+def _sprawdzanie_unikalnosci(
+    naglowki: List[str],
+    unikalne_pola: List[str],
+    zbior: _ZbiorSkrotow,
+) -> Callable[[int, List[str]], None]:
+    """Funkcja (numer wiersza, pola) zgłaszająca powtórzony klucz."""
+
+    brakujace = [p for p in unikalne_pola if p not in naglowki]
+    if brakujace:
+        raise CSVParsingError(
+            f"Brakujące pola w nagłówku: {', '.join(brakujace)}."
+        )
+    pozycje = [naglowki.index(p) for p in unikalne_pola]
+    pobierz = _pola_wymagane(pozycje)
+
+    def sprawdz(idx: int, row: List[str]) -> None:
+        try:
+            klucz = pobierz(row)
+        except IndexError:
+            klucz = tuple(row[i] if i < len(row) else None for i in pozycje)
+        poprzedni = zbior.dodaj(hash(klucz) & 0xFFFFFFFFFFFFFFFF or 1, idx)
+        if poprzedni:
+            opis = ", ".join(
+                f"{p}={w!r}" for p, w in zip(unikalne_pola, klucz)
+            )
+            raise CSVParsingError(
+                f"Zduplikowana wartość {opis} w wierszu {idx} "
+                f"(pierwsze wystąpienie w wierszu {poprzedni})."
+            )
+    return sprawdz
+
+
+def _mierz_etapy(
+    buduj: Callable[[List[str]], Any],
+    spelnia: Optional[Callable[[List[str]], bool]],
+    statystyki: Dict[str, Any],
+) -> Tuple[Callable[[List[str]], Any], Optional[Callable[[List[str]], bool]]]:
+    """Wersje buduj/spelnia doliczające czas i liczniki do statystyk."""
+
+    czasy = statystyki["czasy_s"]
+    buduj_mierzony = _mierzony(buduj, czasy, "budowanie")
+
+    def buduj_i_licz(row: List[str]) -> Any:
+        statystyki["wiersze_zwrocone"] += 1
+        return buduj_mierzony(row)
+
+    if spelnia is None:
+        return buduj_i_licz, None
+
+    spelnia_mierzony = _mierzony(spelnia, czasy, "filtrowanie")
+
+    def spelnia_i_licz(row: List[str]) -> bool:
+        if spelnia_mierzony(row):
+            return True
+        statystyki["reguly"]["odfiltrowane"] += 1
+        return False
+
+    return buduj_i_licz, spelnia_i_licz
+
+
+_OPERATORY: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda pole, wartosc: pole in wartosc,
+    "not in": lambda pole, wartosc: pole not in wartosc,
+}
+
+
+def _porownanie(
+    i: int,
+    op: Callable[[Any, Any], bool],
+    wartosc: Any,
+) -> Callable[[List[str]], bool]:
+    """Porównanie pola nr i z wartością; liczby porównywane są
+    liczbowo, brakujące lub nieliczbowe pola nie spełniają warunku."""
+
+    if isinstance(wartosc, (int, float)) and not isinstance(wartosc, bool):
+        def sprawdz(row: List[str]) -> bool:
+            try:
+                return op(float(row[i]), wartosc)
+            except (TypeError, ValueError):
+                return False
+    else:
+        def sprawdz(row: List[str]) -> bool:
+            pole = row[i]
+            return pole is not None and op(pole, wartosc)
+    return sprawdz
+
+
+def _kompiluj_warunek(
+    naglowki: List[str],
+    warunek: Any,
+) -> Callable[[List[str]], bool]:
+    """Zamienia warunek (funkcja, słownik lub lista porównań) na funkcję
+    sprawdzającą surową listę pól."""
+
+    if callable(warunek):
+        return warunek
+
+    if isinstance(warunek, dict):
+        warunek = [(k, "==", v) for k, v in warunek.items()]
+
+    porownania = []
+    for kolumna, op, wartosc in warunek:
+        if kolumna not in naglowki:
+            raise CSVParsingError(
+                f"Nieznana kolumna w warunku: {kolumna}."
+            )
+        if op not in _OPERATORY:
+            raise CSVParsingError(
+                f"Nieznany operator w warunku: {op!r}."
+            )
+        porownania.append(
+            _porownanie(naglowki.index(kolumna), _OPERATORY[op], wartosc)
+        )
+
+    if len(porownania) == 1:
+        return porownania[0]
+    return lambda row: all(p(row) for p in porownania)
+
+
+def _projekcja(
+    naglowki: List[str],
+    kolumny: List[str],
+) -> Callable[[List[str]], List[str]]:
+    """Zwraca funkcję wybierającą pola wskazanych kolumn z wiersza."""
+
+    brakujace = [k for k in kolumny if k not in naglowki]
+    if brakujace:
+        raise CSVParsingError(
+            f"Brakujące pola w nagłówku: {', '.join(brakujace)}."
+        )
+
+    indeksy = [naglowki.index(k) for k in kolumny]
+    if len(indeksy) == 1:
+        (i,) = indeksy
+        return lambda row: [row[i]]
+    if not indeksy:
+        return lambda row: []
+    return operator.itemgetter(*indeksy)
+
+
+def probe_csv_header(
+    zrodlo: Union[str, TextIO],
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+) -> List[str]:
+    """Waliduje i zwraca sam nagłówek (ścieżka lub otwarty plik).
+    Czytany jest tylko pierwszy rekord, niezależnie od rozmiaru pliku."""
+
+    if isinstance(zrodlo, (str, os.PathLike)):
+        with _otworz_plik(zrodlo) as plik:
+            return probe_csv_header(plik, wymagane_pola, separator)
+
+    with _bledy_csv():
+        naglowki, _, _ = _otworz(zrodlo, wymagane_pola, separator)
+        return naglowki
+
+
+CSVValidation = namedtuple(
+    "CSVValidation", ["poprawny", "wiersze", "bledy", "bajty"]
+)
+
+
+def validate_csv(
+    zrodlo: Union[str, TextIO],
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    wszystkie_bledy: bool = False,
+    max_bledow: Optional[int] = None,
+) -> CSVValidation:
+    """Sprawdza plik tymi samymi regułami co parse_csv, nie budując
+    wierszy; zamiast wyjątku zwraca podsumowanie CSVValidation.
+
+    wiersze: liczba poprawnych wierszy danych (przy przerwaniu – do
+    miejsca przerwania), bledy: lista (numer wiersza, komunikat); numer
+    to None dla błędów całego pliku (nagłówek, kodowanie). Domyślnie
+    skanowanie kończy się na pierwszym błędzie; wszystkie_bledy=True
+    zbiera wszystkie (lub do max_bledow). bajty: rozmiar pliku albo None
+    dla otwartego strumienia."""
+
+    if isinstance(zrodlo, (str, os.PathLike)):
+        with _otworz_plik(zrodlo) as plik:
+            wynik = validate_csv(
+                plik, wymagane_pola, separator, wszystkie_bledy, max_bledow
+            )
+        return wynik._replace(bajty=os.path.getsize(zrodlo))
+
+    zbieracz = _Zbieracz(max_bledow if wszystkie_bledy else 1)
+    licznik = [0, 0]  # przeczytane wiersze, błędne wiersze
+    bledy: List[Tuple[Optional[int], str]] = []
+    try:
+        with _bledy_csv():
+            _sprawdz_bez_budowania(
+                zrodlo, wymagane_pola, separator, zbieracz, licznik
+            )
+    except CSVErrorReport as exc:
+        bledy = exc.bledy
+    except CSVParsingError as exc:
+        bledy = zbieracz.bledy + [(None, str(exc))]
+
+    return CSVValidation(not bledy, licznik[0] - licznik[1], bledy, None)
+
+
+def _sprawdz_bez_budowania(
+    plik: TextIO,
+    wymagane_pola: Optional[List[str]],
+    separator: str,
+    zbieracz: _Zbieracz,
+    licznik: List[int],
+) -> None:
+    """Pętla walidacji dla validate_csv: typowy poprawny wiersz sprawdzany
+    jest porównaniem długości i jednym przejściem po polach wymaganych,
+    a pełne _sprawdz_wiersz (z komunikatem) uruchamiane tylko poza nim."""
+
+    reader = csv.reader(
+        _linie(plik, zbieracz=zbieracz),
+        delimiter=separator,
+        skipinitialspace=True,
+    )
+    naglowki = next(reader, None)
+    wymagane_pola = _waliduj_naglowek(naglowki, wymagane_pola)
+    liczba_kolumn = len(naglowki)
+    indeksy = _indeksy_wymaganych(naglowki, wymagane_pola)
+    pobierz = _pola_wymagane([i for _, i in indeksy])
+
+    nr = 1
+    try:
+        for nr, row in enumerate(reader, start=2):
+            if len(row) == liczba_kolumn and "" not in map(
+                str.strip, pobierz(row)
+            ):
+                continue
+            idx = nr + zbieracz.puste_linie
+            try:
+                _sprawdz_wiersz(row, idx, liczba_kolumn, indeksy)
+            except CSVParsingError as exc:
+                licznik[1] += 1
+                zbieracz.zglos(idx, str(exc))
+    finally:
+        licznik[0] = nr - 1
+    zbieracz.zakoncz()
+
+
+def _pola_wymagane(pozycje: List[int]) -> Callable[[List[str]], Tuple]:
+    """Zwraca funkcję wybierającą krotkę pól wymaganych z wiersza."""
+
+    if len(pozycje) > 1:
+        return operator.itemgetter(*pozycje)
+    if pozycje:
+        i = pozycje[0]
+        return lambda row: (row[i],)
+    return lambda row: ()
+
+
+CSVBatch = namedtuple(
+    "CSVBatch",
+    ["dane", "naglowki", "pierwszy_wiersz", "ostatni_wiersz"],
+)
+
+
+def iter_csv_batches(
+    zrodlo: Union[str, TextIO],
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    rozmiar_paczki: int = 10_000,
+    uklad: str = "wiersze",
+    kolumny: Optional[List[str]] = None,
+) -> Iterator[CSVBatch]:
+    """Zwraca zwalidowane wiersze w paczkach po rozmiar_paczki.
+
+    uklad="wiersze": dane to lista krotek (gotowa do executemany),
+    uklad="kolumny": krotka kolumn (po jednej krotce wartości na kolumnę).
+    Każda paczka niesie numery pierwszego i ostatniego wiersza, co
+    pozwala wskazać zakres przy błędzie zapisu."""
+
+    if uklad not in ("wiersze", "kolumny"):
+        raise CSVParsingError(
+            f"Nieznany uklad: {uklad!r} (dozwolone: 'wiersze', 'kolumny')."
+        )
+    if rozmiar_paczki < 1:
+        raise CSVParsingError("rozmiar_paczki musi być dodatni.")
+
+    if isinstance(zrodlo, (str, os.PathLike)):
+        with _otworz_plik(zrodlo) as plik:
+            yield from iter_csv_batches(
+                plik,
+                wymagane_pola,
+                separator,
+                rozmiar_paczki,
+                uklad,
+                kolumny,
+            )
+        return
+
+    with _bledy_csv():
+        naglowki, _, wiersze = _otworz(
+            zrodlo,
+            kolumny if wymagane_pola is None else wymagane_pola,
+            separator,
+        )
+        liczba_kolumn = len(naglowki)
+        wybierz = None
+        if kolumny is not None:
+            wybierz = _projekcja(naglowki, kolumny)
+            naglowki = list(kolumny)
+
+        def paczka(dane: List[tuple], od: int, do: int) -> CSVBatch:
+            if uklad == "kolumny":
+                dane = tuple(zip(*dane))
+            return CSVBatch(dane, naglowki, od, do)
+
+        dane: List[tuple] = []
+        pierwszy = 0
+        for idx, row in wiersze:
+            if len(row) < liczba_kolumn:
+                row = row + [None] * (liczba_kolumn - len(row))
+            if wybierz is not None:
+                row = wybierz(row)
+            if not dane:
+                pierwszy = idx
+            dane.append(tuple(row))
+            if len(dane) == rozmiar_paczki:
+                yield paczka(dane, pierwszy, idx)
+                dane = []
+
+        if dane:
+            yield paczka(dane, pierwszy, idx)
+
+
+def parse_csv_columns_file(
+    sciezka: str,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+) -> Tuple[Dict[str, List[str]], int]:
+
+    with _otworz_plik(sciezka) as plik:
+        return parse_csv_columns(plik, wymagane_pola, separator)
+
+
+def parse_csv_columns(
+    plik: TextIO,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+) -> Tuple[Dict[str, List[str]], int]:
+    """Układ kolumnowy: jedna lista wartości na kolumnę nagłówka
+    oraz liczba wierszy. Walidacja jak w parse_csv."""
+
+    with _bledy_csv():
+        naglowki, _, wiersze = _otworz(plik, wymagane_pola, separator)
+        liczba_kolumn = len(naglowki)
+        kolumny: List[List[Optional[str]]] = [[] for _ in naglowki]
+        dopisz = [k.append for k in kolumny]
+
+        liczba_wierszy = 0
+        for _, row in wiersze:
+            if len(row) < liczba_kolumn:
+                row = row + [None] * (liczba_kolumn - len(row))
+            for append, wartosc in zip(dopisz, row):
+                append(wartosc)
+            liczba_wierszy += 1
+
+        return dict(zip(naglowki, kolumny)), liczba_wierszy
+
+
+def _na_bool(wartosc: str) -> bool:
+    tekst = wartosc.strip().lower()
+    if tekst in ("true", "1"):
+        return True
+    if tekst in ("false", "0"):
+        return False
+    raise ValueError(wartosc)
+
+
+def _na_date(wartosc: str) -> date:
+    return datetime.strptime(wartosc.strip(), "%Y-%m-%d").date()
+
+
+# typ ze schematu -> (konwerter, typecode array.array, dtype numpy)
+_TYPY: Dict[Any, Tuple[Callable[[str], Any], Optional[str], str]] = {
+    int: (int, "q", "int64"),
+    float: (float, "d", "float64"),
+    bool: (_na_bool, "b", "bool"),
+    "iso": (_na_date, None, "datetime64[D]"),
+}
+
+
+def _konwertuj_kolumne(
+    nazwa: str,
+    wartosci: List[str],
+    typ: Any,
+) -> Any:
+    """Konwertuje całą kolumnę naraz; przy błędzie szuka winnego wiersza."""
+
+    konwerter, typecode, dtype = _TYPY[typ]
+    try:
+        if typecode is None:
+            daty = list(map(konwerter, wartosci))
+            return daty if np is None else np.array(daty, dtype=dtype)
+        if np is not None:
+            return np.fromiter(
+                map(konwerter, wartosci),
+                dtype=dtype,
+                count=len(wartosci),
+            )
+        return array(typecode, map(konwerter, wartosci))
+    except (ValueError, TypeError, AttributeError, OverflowError):
+        pass
+
+    for idx, wartosc in enumerate(wartosci, start=2):
+        try:
+            wynik = konwerter(wartosc)
+            if typecode is not None:
+                array(typecode, [wynik])
+        except (ValueError, TypeError, AttributeError, OverflowError):
+            oczekiwany = typ if isinstance(typ, str) else typ.__name__
+            raise CSVParsingError(
+                f"Wartość {wartosc!r} w kolumnie {nazwa} nie jest typu "
+                f"{oczekiwany} (wiersz {idx})."
+            ) from None
+
+    raise CSVParsingError(
+        f"Nie udało się przekonwertować kolumny {nazwa}."
+    )
+
+
+def parse_csv_typed_file(
+    sciezka: str,
+    schemat: Dict[str, Any],
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+) -> Tuple[Dict[str, Any], int]:
+
+    with _otworz_plik(sciezka) as plik:
+        return parse_csv_typed(plik, schemat, wymagane_pola, separator)
+
+
+def parse_csv_typed(
+    plik: TextIO,
+    schemat: Dict[str, Any],
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+) -> Tuple[Dict[str, Any], int]:
+    """Jak parse_csv_columns, ale kolumny ze schematu, np.
+    {"age": int, "is_active": bool, "join_date": "iso"}, są konwertowane
+    do tablic numpy (lub array.array, gdy numpy nie jest dostępne).
+    Pozostałe kolumny zostają listami napisów."""
+
+    nieznane_typy = [k for k, t in schemat.items() if t not in _TYPY]
+    if nieznane_typy:
+        raise CSVParsingError(
+            f"Nieobsługiwany typ w schemacie dla: {', '.join(nieznane_typy)}."
+        )
+
+    kolumny, liczba_wierszy = parse_csv_columns(
+        plik, wymagane_pola, separator
+    )
+
+    nieznane = [k for k in schemat if k not in kolumny]
+    if nieznane:
+        raise CSVParsingError(
+            f"Kolumny ze schematu nie występują w nagłówku: "
+            f"{', '.join(nieznane)}."
+        )
+
+    for nazwa, typ in schemat.items():
+        kolumny[nazwa] = _konwertuj_kolumne(nazwa, kolumny[nazwa], typ)
+
+    return kolumny, liczba_wierszy
+
+
+# Ładowanie do bazy SQLite
+
+# typ ze schematu -> typ kolumny w SQLite
+_TYPY_SQLITE: Dict[Any, str] = {
+    int: "INTEGER",
+    float: "REAL",
+    bool: "INTEGER",
+    "iso": "TEXT",
+    str: "TEXT",
+}
+
+# zgadywany typ -> wzorzec wartości (int() przyjąłby też np. "1_000");
+# zera wiodące ("02134") oznaczają tekst, nie liczbę
+_WZORCE_TYPOW = {
+    int: re.compile(r"\s*[+-]?(?:0|[1-9][0-9]*)\s*"),
+    float: re.compile(
+        r"\s*[+-]?(?:(?:0|[1-9][0-9]*)(?:\.[0-9]*)?|\.[0-9]+)"
+        r"(?:[eE][+-]?[0-9]+)?\s*"
+    ),
+}
+
+# zakres INTEGER w SQLite (64 bity ze znakiem)
+_ZAKRES_INTEGER = (-(1 << 63), (1 << 63) - 1)
+
+CSVSQLiteLoad = namedtuple(
+    "CSVSQLiteLoad", ["tabela", "wiersze", "paczki", "typy", "czas_s"]
+)
+
+
+def _nazwa_sql(nazwa: str) -> str:
+    return '"' + nazwa.replace('"', '""') + '"'
+
+
+def _pasuje_do_typu(wartosc: str, typ: Any) -> bool:
+    """Czy wartość pasuje do zgadywanego typu; liczby całkowite (także
+    w kolumnie float) muszą mieścić się w zakresie INTEGER w SQLite, by
+    duży identyfikator nie stracił cyfr."""
+
+    if not _WZORCE_TYPOW[typ].fullmatch(wartosc):
+        return False
+    if typ is float and not _WZORCE_TYPOW[int].fullmatch(wartosc):
+        return True
+    dolna, gorna = _ZAKRES_INTEGER
+    return len(wartosc.strip()) <= 20 and dolna <= int(wartosc) <= gorna
+
+
+def _na_integer(wartosc: str) -> int:
+    liczba = int(wartosc)
+    dolna, gorna = _ZAKRES_INTEGER
+    if not dolna <= liczba <= gorna:
+        raise OverflowError(wartosc)
+    return liczba
+
+
+def _zgadnij_typ(wartosci: Sequence[Optional[str]]) -> Any:
+    """Najwęższy z int, float, str pasujący do wszystkich niepustych
+    wartości kolumny."""
+
+    niepuste = [w for w in wartosci if w and not w.isspace()]
+    if not niepuste:
+        return str
+    for typ in (int, float):
+        if all(_pasuje_do_typu(w, typ) for w in niepuste):
+            return typ
+    return str
+
+
+def _na_iso(wartosc: str) -> str:
+    return _na_date(wartosc).isoformat()
+
+
+def _kolumna_sqlite(
+    nazwa: str,
+    wartosci: Sequence[Optional[str]],
+    typ: Any,
+    pierwszy_wiersz: int,
+    zgadniety: bool = False,
+) -> Sequence[Any]:
+    """Konwertuje kolumnę paczki; puste wartości stają się NULL.
+
+    Dla typu zgadniętego z pierwszej paczki wartości, które do niego nie
+    pasują, trafiają do bazy bez zmian jako tekst."""
+
+    if typ is str:
+        return wartosci
+    if zgadniety:
+        return [
+            typ(w) if w is not None and _pasuje_do_typu(w, typ)
+            else w if w and not w.isspace()
+            else None
+            for w in wartosci
+        ]
+    konwerter = {"iso": _na_iso, int: _na_integer}.get(typ) or _TYPY[typ][0]
+    try:
+        return list(map(konwerter, wartosci))
+    except (ValueError, TypeError, AttributeError, OverflowError):
+        pass
+
+    wynik: List[Any] = []
+    for idx, wartosc in enumerate(wartosci, start=pierwszy_wiersz):
+        if wartosc is None or not wartosc.strip():
+            wynik.append(None)
+            continue
+        try:
+            wynik.append(konwerter(wartosc))
+        except OverflowError:
+            raise CSVParsingError(
+                f"Wartość {wartosc!r} w kolumnie {nazwa} wykracza poza "
+                f"zakres INTEGER w SQLite (wiersz {idx})."
+            ) from None
+        except (ValueError, TypeError, AttributeError):
+            oczekiwany = typ if isinstance(typ, str) else typ.__name__
+            raise CSVParsingError(
+                f"Wartość {wartosc!r} w kolumnie {nazwa} nie jest typu "
+                f"{oczekiwany} (wiersz {idx})."
+            ) from None
+    return wynik
+
+
+@contextmanager
+def _szybki_zapis(polaczenie: sqlite3.Connection) -> Iterator[None]:
+    """journal_mode=WAL i synchronous=OFF na czas ładowania, transakcje
+    sterowane ręcznie; na koniec przywraca poprzednie ustawienia."""
+
+    if polaczenie.in_transaction:
+        raise CSVParsingError(
+            "Połączenie ma otwartą transakcję; zatwierdź ją przed "
+            "ładowaniem."
+        )
+    izolacja = polaczenie.isolation_level
+    (dziennik,) = polaczenie.execute("PRAGMA journal_mode").fetchone()
+    (synchronizacja,) = polaczenie.execute("PRAGMA synchronous").fetchone()
+    polaczenie.isolation_level = None
+    try:
+        polaczenie.execute("PRAGMA journal_mode=WAL")
+        polaczenie.execute("PRAGMA synchronous=OFF")
+        yield
+    finally:
+        polaczenie.execute(f"PRAGMA synchronous={int(synchronizacja)}")
+        polaczenie.execute(f"PRAGMA journal_mode={dziennik}")
+        polaczenie.isolation_level = izolacja
+
+
+def _utworz_tabele(
+    polaczenie: sqlite3.Connection,
+    nazwa: str,
+    naglowki: List[str],
+    typy: Dict[str, Any],
+) -> None:
+    definicje = ", ".join(
+        f"{_nazwa_sql(k)} {_TYPY_SQLITE[typy.get(k, str)]}" for k in naglowki
+    )
+    polaczenie.execute(f"CREATE TABLE {nazwa} ({definicje})")
+
+
+def load_csv_into_sqlite(
+    sciezka: str,
+    baza: Union[str, sqlite3.Connection],
+    tabela: str,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    typy: Optional[Dict[str, Any]] = None,
+    rozmiar_paczki: int = 50_000,
+    jesli_istnieje: str = "blad",
+) -> CSVSQLiteLoad:
+    """Wczytuje zwalidowany plik CSV do tabeli SQLite (ścieżka bazy lub
+    otwarte połączenie).
+
+    typy to schemat jak w parse_csv_typed (int, float, bool, "iso"), może
+    też zawierać str; typy pozostałych kolumn są zgadywane z pierwszej
+    paczki (INTEGER, REAL albo TEXT; liczby z zerami wiodącymi lub spoza
+    zakresu 64 bitów to TEXT), a wartości późniejszych paczek
+    niepasujące do zgadniętego typu przekazywane są bez zmian (SQLite na
+    to pozwala, stosując powinowactwo typu kolumny); typy podane jawnie
+    są sprawdzane ściśle. Puste wartości w kolumnach nietekstowych
+    trafiają do bazy jako NULL.
+    jesli_istnieje: "blad", "dopisz" albo "zastap".
+
+    Paczki po rozmiar_paczki wierszy idą przez executemany w jednej
+    transakcji, przy journal_mode=WAL i synchronous=OFF. Błąd w dowolnym
+    wierszu wycofuje całe ładowanie."""
+
+    if jesli_istnieje not in ("blad", "dopisz", "zastap"):
+        raise CSVParsingError(
+            f"Nieznana wartość jesli_istnieje: {jesli_istnieje!r} "
+            f"(dozwolone: 'blad', 'dopisz', 'zastap')."
+        )
+    typy = dict(typy or {})
+    podane = set(typy)
+    nieznane_typy = [k for k, t in typy.items() if t not in _TYPY_SQLITE]
+    if nieznane_typy:
+        raise CSVParsingError(
+            f"Nieobsługiwany typ w schemacie dla: {', '.join(nieznane_typy)}."
+        )
+
+    start = time.perf_counter()
+    naglowki = probe_csv_header(sciezka, wymagane_pola, separator)
+    nieznane = [k for k in typy if k not in naglowki]
+    if nieznane:
+        raise CSVParsingError(
+            f"Kolumny ze schematu nie występują w nagłówku: "
+            f"{', '.join(nieznane)}."
+        )
+
+    nazwa = _nazwa_sql(tabela)
+    kolumny_sql = ", ".join(map(_nazwa_sql, naglowki))
+    wstaw = (
+        f"INSERT INTO {nazwa} ({kolumny_sql}) "
+        f"VALUES ({', '.join('?' * len(naglowki))})"
+    )
+
+    polaczenie = baza
+    if not isinstance(baza, sqlite3.Connection):
+        polaczenie = sqlite3.connect(baza)
+
+    wiersze = 0
+    paczki = 0
+    try:
+        with _szybki_zapis(polaczenie):
+            polaczenie.execute("BEGIN")
+            try:
+                istnieje = polaczenie.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                    "AND name = ? COLLATE NOCASE",
+                    (tabela,),
+                ).fetchone()
+                if istnieje and jesli_istnieje == "blad":
+                    raise CSVParsingError(f"Tabela {tabela} już istnieje.")
+                if istnieje and jesli_istnieje == "zastap":
+                    polaczenie.execute(f"DROP TABLE {nazwa}")
+                utworz = not istnieje or jesli_istnieje == "zastap"
+
+                paczki_csv = iter_csv_batches(
+                    sciezka, wymagane_pola, separator, rozmiar_paczki,
+                    "kolumny",
+                )
+                for paczka in paczki_csv:
+                    if utworz:
+                        for kolumna, wartosci in zip(naglowki, paczka.dane):
+                            typy.setdefault(kolumna, _zgadnij_typ(wartosci))
+                        _utworz_tabele(polaczenie, nazwa, naglowki, typy)
+                        utworz = False
+                    dane = [
+                        _kolumna_sqlite(
+                            kolumna,
+                            wartosci,
+                            typy.get(kolumna, str),
+                            paczka.pierwszy_wiersz,
+                            kolumna not in podane,
+                        )
+                        for kolumna, wartosci in zip(naglowki, paczka.dane)
+                    ]
+                    polaczenie.executemany(wstaw, zip(*dane))
+                    wiersze += len(dane[0])
+                    paczki += 1
+
+                if utworz:
+                    _utworz_tabele(polaczenie, nazwa, naglowki, typy)
+                polaczenie.execute("COMMIT")
+            except BaseException:
+                if polaczenie.in_transaction:
+                    polaczenie.execute("ROLLBACK")
+                raise
+    finally:
+        if polaczenie is not baza:
+            polaczenie.close()
+
+    return CSVSQLiteLoad(
+        tabela,
+        wiersze,
+        paczki,
+        {k: _TYPY_SQLITE[typy.get(k, str)] for k in naglowki},
+        time.perf_counter() - start,
+    )
+
+
+# Równoległe parsowanie dużych plików
+
+_BLOK = 1 << 20
+
+
+def _obszary_poza_cudzyslowem(
+    dane: Union[bytes, mmap.mmap],
+    separator: str,
+) -> Iterator[Tuple[int, int]]:
+    """Zakresy [początek, koniec) danych leżące poza polami w cudzysłowie.
+
+    Dane muszą zaczynać się na początku rekordu. Tak jak csv.reader ze
+    skipinitialspace=True, cudzysłów otwiera pole tylko na jego początku
+    (po separatorze, nowej linii lub pominiętych spacjach); wewnątrz pola
+    bez cudzysłowu jest zwykłym znakiem. Niezamknięte pole kończy skan."""
+
+    sep = separator.encode("utf-8")
+    rozmiar = len(dane)
+    start = szukaj = 0
+    po_polu = False  # obszar zaczyna się tuż za zamkniętym polem
+
+    while True:
+        q = dane.find(b'"', szukaj)
+        if q < 0:
+            yield start, rozmiar
+            return
+
+        p = q
+        while p > start and dane[p - 1] == 0x20:
+            p -= 1
+        if p > start:
+            otwiera = (
+                dane[p - 1] == 0x0A
+                or dane[max(p - len(sep), 0):p] == sep
+            )
+        else:
+            otwiera = not po_polu
+        if not otwiera:
+            szukaj = q + 1
+            continue
+
+        yield start, q
+        k = q + 1
+        while True:
+            k = dane.find(b'"', k)
+            if k < 0:
+                return
+            if dane[k + 1:k + 2] != b'"':
+                break
+            k += 2
+        start = szukaj = k + 1
+        po_polu = True
+
+
+def _granice_fragmentow(
+    dane: mmap.mmap,
+    liczba: int,
+    separator: str = ",",
+) -> List[Tuple[int, int]]:
+    """Dzieli plik na zakresy bajtów kończące się na granicy rekordu.
+
+    Zwraca listę (początek, numer pierwszej linii). Pierwszy zakres zaczyna
+    się zaraz po nagłówku. Znaki nowej linii wewnątrz pól w cudzysłowie
+    pomija _obszary_poza_cudzyslowem."""
+
+    rozmiar = len(dane)
+    obszary = _obszary_poza_cudzyslowem(dane, separator)
+    obszar = next(obszary, None)
+    linie = 0
+    pozycja = 0
+
+    def przesun(do: int) -> None:
+        nonlocal linie, pozycja
+        while pozycja < do:
+            koniec = min(pozycja + _BLOK, do)
+            linie += dane[pozycja:koniec].count(b"\n")
+            pozycja = koniec
+
+    def nastepny_rekord(od: int) -> int:
+        """Pozycja tuż za najbliższym końcem rekordu od `od` (lub -1)."""
+        nonlocal obszar
+        while obszar is not None:
+            start, koniec = obszar
+            if koniec > od:
+                nl = dane.find(b"\n", max(start, od), koniec)
+                if nl >= 0:
+                    przesun(nl + 1)
+                    return nl + 1
+            obszar = next(obszary, None)
+        return -1
+
+    poczatek = nastepny_rekord(0)
+    if poczatek < 0 or poczatek >= rozmiar:
+        return []
+
+    granice = [(poczatek, linie + 1)]
+    krok = max((rozmiar - poczatek) // liczba, 1)
+    while len(granice) < liczba:
+        cel = granice[-1][0] + krok
+        if cel >= rozmiar:
+            break
+        przesun(cel)
+        start = nastepny_rekord(cel)
+        if start < 0 or start >= rozmiar:
+            break
+        granice.append((start, linie + 1))
+
+    return granice
+
+
+def _parsuj_fragment(
+    sciezka: str,
+    poczatek: int,
+    koniec: int,
+    pierwsza_linia: int,
+    naglowki: List[str],
+    wymagane_pola: List[str],
+    separator: str,
+) -> Tuple[List[List[str]], Optional[List[str]]]:
+    """Parsuje zakres bajtów w procesie roboczym.
+
+    Zwraca poprawne wiersze oraz pierwszy wiersz, który nie przeszedł
+    walidacji (numer wiersza zna tylko proces główny)."""
+
+    with open(sciezka, "rb") as plik:
+        plik.seek(poczatek)
+        tekst = plik.read(koniec - poczatek).decode("utf-8")
+
+    reader = csv.reader(
+        _linie(io.StringIO(tekst, newline=None), pierwsza_linia),
+        delimiter=separator,
+        skipinitialspace=True,
+    )
+    liczba_kolumn = len(naglowki)
+    indeksy = _indeksy_wymaganych(naglowki, wymagane_pola)
+
+    wiersze: List[List[str]] = []
+    for row in reader:
+        try:
+            _sprawdz_wiersz(row, 0, liczba_kolumn, indeksy)
+        except CSVParsingError:
+            return wiersze, row
+        wiersze.append(row)
+    return wiersze, None
+
+
+def parse_csv_file_parallel(
+    sciezka: str,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    typ_wiersza: str = "dict",
+    procesy: Optional[int] = None,
+) -> List[Any]:
+    """Jak parse_csv_file, ale plik dzielony jest na zakresy bajtów
+    parsowane równolegle w ProcessPoolExecutor. Wynik i numery wierszy
+    w błędach są takie same jak przy parsowaniu sekwencyjnym."""
+
+    procesy = procesy or os.cpu_count() or 1
+
+    with _otworz_plik(sciezka) as plik:
+        with _bledy_csv():
+            naglowki, wymagane_pola, _ = _otworz(
+                plik, wymagane_pola, separator
+            )
+            buduj = _fabryka_wiersza(naglowki, typ_wiersza)
+
+    granice: List[Tuple[int, int]] = []
+    rozmiar = os.path.getsize(sciezka)
+    if procesy > 1 and rozmiar and _kompresja(sciezka) is None:
+        with open(sciezka, "rb") as plik:
+            with mmap.mmap(plik.fileno(), 0, access=mmap.ACCESS_READ) as dane:
+                granice = _granice_fragmentow(dane, procesy, separator)
+
+    if len(granice) <= 1:
+        return parse_csv_file(sciezka, wymagane_pola, separator, typ_wiersza)
+
+    liczba_kolumn = len(naglowki)
+    indeksy = _indeksy_wymaganych(naglowki, wymagane_pola)
+    dopelnij = typ_wiersza != "dict"
+    konce = [start for start, _ in granice[1:]] + [rozmiar]
+
+    dane_wynikowe: List[Any] = []
+    with ProcessPoolExecutor(max_workers=procesy) as pula:
+        zadania = [
+            pula.submit(
+                _parsuj_fragment,
+                sciezka,
+                start,
+                koniec,
+                linia,
+                naglowki,
+                wymagane_pola,
+                separator,
+            )
+            for (start, linia), koniec in zip(granice, konce)
+        ]
+        try:
+            with _bledy_csv():
+                for zadanie in zadania:
+                    wiersze, bledny = zadanie.result()
+                    for row in wiersze:
+                        if dopelnij and len(row) < liczba_kolumn:
+                            row = row + [None] * (liczba_kolumn - len(row))
+                        dane_wynikowe.append(buduj(row))
+                    if bledny is not None:
+                        idx = len(dane_wynikowe) + 2
+                        _sprawdz_wiersz(bledny, idx, liczba_kolumn, indeksy)
+        except CSVParsingError:
+            for zadanie in zadania:
+                zadanie.cancel()
+            raise
+
+    return dane_wynikowe
+
+
+# Profil kolumn (profile_csv)
+
+_PAKIET_PROFILU = 10_000
+
+
+class _HyperLogLog:
+    """Szkic HyperLogLog (2**precyzja rejestrów) do szacowania liczby
+    różnych wartości. Skrót blake2b jest taki sam w każdym procesie,
+    więc szkice z różnych fragmentów pliku można scalać."""
+
+    def __init__(self, precyzja: int = 12) -> None:
+        self.precyzja = precyzja
+        self.rejestry = bytearray(1 << precyzja)
+
+    def dodaj(self, wartosc: str) -> None:
+        skrot = int.from_bytes(
+            hashlib.blake2b(
+                wartosc.encode("utf-8"), digest_size=8
+            ).digest(),
+            "little",
+        )
+        bity = 64 - self.precyzja
+        j = skrot >> bity
+        ranga = bity - (skrot & ((1 << bity) - 1)).bit_length() + 1
+        if ranga > self.rejestry[j]:
+            self.rejestry[j] = ranga
+
+    def scal(self, inny: "_HyperLogLog") -> None:
+        self.rejestry = bytearray(map(max, self.rejestry, inny.rejestry))
+
+    def szacuj(self) -> int:
+        m = len(self.rejestry)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        wynik = alfa * m * m / sum(2.0 ** -r for r in self.rejestry)
+        zera = self.rejestry.count(0)
+        if wynik <= 2.5 * m and zera:
+            wynik = m * math.log(m / zera)
+        return round(wynik)
+
+
+def _przytnij_liczniki(liczniki: Dict[str, int], k: int) -> Dict[str, int]:
+    """Redukcja Misra-Gries: odejmuje (k+1)-szą największą wartość
+    licznika i zostawia najwyżej k dodatnich liczników. Działa tak samo
+    po dodaniu paczki jak po scaleniu dwóch szkiców."""
+
+    if len(liczniki) <= k:
+        return liczniki
+    prog = sorted(liczniki.values(), reverse=True)[k]
+    return {w: n - prog for w, n in liczniki.items() if n > prog}
+
+
+class _ProfilKolumny:
+    """Statystyki jednej kolumny zbierane paczkami; scalalne."""
+
+    def __init__(self, liczniki: int) -> None:
+        self.puste = 0
+        self.niepuste = 0
+        self.min: Optional[str] = None
+        self.max: Optional[str] = None
+        self.liczbowa = True
+        self.min_liczba: Optional[float] = None
+        self.max_liczba: Optional[float] = None
+        self.hll = _HyperLogLog()
+        self.k = liczniki
+        self.najczestsze: Dict[str, int] = {}
+
+    def dodaj_paczke(self, wartosci: List[Optional[str]]) -> None:
+        niepuste = [w for w in wartosci if w is not None and w.strip()]
+        self.puste += len(wartosci) - len(niepuste)
+        if not niepuste:
+            return
+        self.niepuste += len(niepuste)
+
+        self._min_max(min(niepuste), max(niepuste))
+        if self.liczbowa:
+            try:
+                liczby = list(map(float, niepuste))
+            except ValueError:
+                self.liczbowa = False
+            else:
+                self._min_max_liczb(min(liczby), max(liczby))
+
+        paczka = Counter(niepuste)
+        for wartosc in paczka:
+            self.hll.dodaj(wartosc)
+        for wartosc, n in self.najczestsze.items():
+            paczka[wartosc] += n
+        self.najczestsze = _przytnij_liczniki(paczka, self.k)
+
+    def _min_max(self, mn: Optional[str], mx: Optional[str]) -> None:
+        if mn is not None and (self.min is None or mn < self.min):
+            self.min = mn
+        if mx is not None and (self.max is None or mx > self.max):
+            self.max = mx
+
+    def _min_max_liczb(
+        self, mn: Optional[float], mx: Optional[float]
+    ) -> None:
+        if mn is not None and (
+            self.min_liczba is None or mn < self.min_liczba
+        ):
+            self.min_liczba = mn
+        if mx is not None and (
+            self.max_liczba is None or mx > self.max_liczba
+        ):
+            self.max_liczba = mx
+
+    def scal(self, inny: "_ProfilKolumny") -> None:
+        self.puste += inny.puste
+        self.niepuste += inny.niepuste
+        self._min_max(inny.min, inny.max)
+        self.liczbowa = self.liczbowa and inny.liczbowa
+        self._min_max_liczb(inny.min_liczba, inny.max_liczba)
+        self.hll.scal(inny.hll)
+        liczniki = Counter(self.najczestsze)
+        liczniki.update(inny.najczestsze)
+        self.najczestsze = _przytnij_liczniki(liczniki, self.k)
+
+    def wynik(self, top_k: int) -> Dict[str, Any]:
+        liczbowa = self.liczbowa and self.niepuste > 0
+        return {
+            "puste": self.puste,
+            "niepuste": self.niepuste,
+            "typ": "liczba" if liczbowa else "tekst",
+            "min": self.min_liczba if liczbowa else self.min,
+            "max": self.max_liczba if liczbowa else self.max,
+            "unikalne_szac": min(self.hll.szacuj(), self.niepuste),
+            "najczestsze": Counter(self.najczestsze).most_common(top_k),
+        }
+
+
+def _profiluj_wiersze(
+    wiersze: Iterator[Tuple[int, List[str]]],
+    liczba_kolumn: int,
+    top_k: int,
+) -> Tuple[List[_ProfilKolumny], int]:
+    profile = [_ProfilKolumny(10 * top_k) for _ in range(liczba_kolumn)]
+    suma = 0
+    while True:
+        paczka = [row for _, row in islice(wiersze, _PAKIET_PROFILU)]
+        if not paczka:
+            return profile, suma
+        suma += len(paczka)
+        for i, profil in enumerate(profile):
+            profil.dodaj_paczke(
+                [row[i] if i < len(row) else None for row in paczka]
+            )
+
+
+def profile_csv(
+    sciezka: str,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    top_k: int = 10,
+    procesy: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Profil kolumn w jednym przejściu po pliku, w ograniczonej pamięci.
+
+    Dla każdej kolumny: liczba pustych i niepustych wartości, typ
+    ("liczba", gdy każda niepusta wartość jest liczbą, inaczej "tekst"),
+    min/max, szacunek liczby różnych wartości (HyperLogLog)
+    i top_k najczęstszych wartości (Misra-Gries; liczności są dolnym
+    oszacowaniem). Plik przechodzi tę samą walidację co parse_csv_file.
+    procesy > 1: fragmenty pliku profilowane są równolegle, a szkice
+    scalane."""
+
+    with _otworz_plik(sciezka) as plik:
+        with _bledy_csv():
+            naglowki, wymagane_pola, wiersze = _otworz(
+                plik, wymagane_pola, separator
+            )
+            granice: List[Tuple[int, int]] = []
+            if (
+                procesy is not None
+                and procesy > 1
+                and _kompresja(sciezka) is None
+            ):
+                with open(sciezka, "rb") as surowy, mmap.mmap(
+                    surowy.fileno(), 0, access=mmap.ACCESS_READ
+                ) as dane:
+                    granice = _granice_fragmentow(
+                        dane, procesy, separator
+                    )
+            if len(granice) <= 1:
+                profile, suma = _profiluj_wiersze(
+                    wiersze, len(naglowki), top_k
+                )
+    if len(granice) > 1:
+        profile, suma = _profiluj_rownolegle(
+            sciezka, granice, naglowki, wymagane_pola, separator, top_k
+        )
+
+    return {
+        "wiersze": suma,
+        "kolumny": {
+            nazwa: profil.wynik(top_k)
+            for nazwa, profil in zip(naglowki, profile)
+        },
+    }
+
+
+def _profiluj_fragment(
+    sciezka: str,
+    poczatek: int,
+    koniec: int,
+    pierwsza_linia: int,
+    naglowki: List[str],
+    wymagane_pola: List[str],
+    separator: str,
+    top_k: int,
+) -> Tuple[List[_ProfilKolumny], int, Optional[List[str]]]:
+    """Profil zakresu bajtów w procesie roboczym; przy błędnym wierszu
+    zwraca go wraz z liczbą poprawnych wierszy przed nim."""
+
+    with open(sciezka, "rb") as plik:
+        plik.seek(poczatek)
+        tekst = plik.read(koniec - poczatek).decode("utf-8")
+
+    reader = csv.reader(
+        _linie(io.StringIO(tekst, newline=None), pierwsza_linia),
+        delimiter=separator,
+        skipinitialspace=True,
+    )
+    liczba_kolumn = len(naglowki)
+    indeksy = _indeksy_wymaganych(naglowki, wymagane_pola)
+    bledny: List[Optional[List[str]]] = [None]
+
+    def poprawne() -> Iterator[Tuple[int, List[str]]]:
+        for row in reader:
+            try:
+                _sprawdz_wiersz(row, 0, liczba_kolumn, indeksy)
+            except CSVParsingError:
+                bledny[0] = row
+                return
+            yield 0, row
+
+    profile, suma = _profiluj_wiersze(poprawne(), liczba_kolumn, top_k)
+    return profile, suma, bledny[0]
+
+
+def _profiluj_rownolegle(
+    sciezka: str,
+    granice: List[Tuple[int, int]],
+    naglowki: List[str],
+    wymagane_pola: List[str],
+    separator: str,
+    top_k: int,
+) -> Tuple[List[_ProfilKolumny], int]:
+    konce = [start for start, _ in granice[1:]] + [os.path.getsize(sciezka)]
+    indeksy = _indeksy_wymaganych(naglowki, wymagane_pola)
+    profile: Optional[List[_ProfilKolumny]] = None
+    suma = 0
+
+    with ProcessPoolExecutor(max_workers=len(granice)) as pula:
+        zadania = [
+            pula.submit(
+                _profiluj_fragment,
+                sciezka,
+                start,
+                koniec,
+                linia,
+                naglowki,
+                wymagane_pola,
+                separator,
+                top_k,
+            )
+            for (start, linia), koniec in zip(granice, konce)
+        ]
+        try:
+            with _bledy_csv():
+                for zadanie in zadania:
+                    czesc, liczba, bledny = zadanie.result()
+                    suma += liczba
+                    if bledny is not None:
+                        _sprawdz_wiersz(
+                            bledny, suma + 2, len(naglowki), indeksy
+                        )
+                    if profile is None:
+                        profile = czesc
+                    else:
+                        for profil, inny in zip(profile, czesc):
+                            profil.scal(inny)
+        except CSVParsingError:
+            for zadanie in zadania:
+                zadanie.cancel()
+            raise
+
+    return profile, suma
+
+
+# Wiele plików naraz (parse_csv_files)
+
+CSVFileResult = namedtuple(
+    "CSVFileResult", ["sciezka", "dane", "blad", "bajty", "czas_s"]
+)
+
+
+def _parsuj_plik(sciezka: str, opcje: Dict[str, Any]) -> CSVFileResult:
+    """Parsuje jeden plik (w procesie roboczym); błąd wraca jako wynik."""
+
+    start = time.perf_counter()
+    try:
+        dane, blad = parse_csv_file(sciezka, **opcje), None
+    except (CSVParsingError, OSError) as exc:
+        dane, blad = None, exc
+    try:
+        bajty = os.path.getsize(sciezka)
+    except OSError:
+        bajty = 0
+    return CSVFileResult(
+        sciezka, dane, blad, bajty, time.perf_counter() - start
+    )
+
+
+def parse_csv_files(
+    sciezki: Iterable[str],
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    typ_wiersza: str = "dict",
+    procesy: Optional[int] = None,
+    w_kolejnosci: bool = False,
+    statystyki: Optional[Dict[str, Any]] = None,
+    **opcje: Any,
+) -> Iterator[CSVFileResult]:
+    """Waliduje i parsuje wiele plików w puli procesów.
+
+    Zwraca CSVFileResult(sciezka, dane, blad, bajty, czas_s) dla każdego
+    pliku, gdy tylko zostanie sparsowany (w_kolejnosci=True – w kolejności
+    sciezki). Błąd pliku (CSVParsingError lub OSError) trafia do pola
+    blad, a pozostałe pliki są przetwarzane dalej. Pozostałe opcje jak
+    w parse_csv_file; muszą dać się przekazać do innego procesu.
+    limit_pamieci i pamiec_podreczna nie są obsługiwane – ich wyniki
+    (CSVRows, wiersze tylko do odczytu) nie przechodzą między procesami.
+
+    statystyki: słownik z sumami dla całej partii, aktualizowany po
+    każdym pliku (pliki, bledne, wiersze, bajty, czas_s, bajty_na_s,
+    wiersze_na_s)."""
+
+    nieobslugiwane = [
+        o for o in ("limit_pamieci", "pamiec_podreczna") if opcje.get(o)
+    ]
+    if nieobslugiwane:
+        raise CSVParsingError(
+            f"parse_csv_files nie obsługuje opcji: "
+            f"{', '.join(nieobslugiwane)}."
+        )
+
+    # nieznany typ_wiersza zgłaszamy od razu, nie jako błąd każdego pliku
+    _fabryka_wiersza([], typ_wiersza)
+    procesy = procesy or os.cpu_count() or 1
+    sciezki = list(sciezki)
+    # wiersze typu tuple/slots to klasy tworzone w locie – między
+    # procesami przesyłane są słowniki, przebudowywane tutaj
+    opcje.update(
+        wymagane_pola=wymagane_pola, separator=separator, typ_wiersza="dict"
+    )
+
+    if statystyki is not None:
+        statystyki.clear()
+        statystyki.update(
+            dict.fromkeys(["pliki", "bledne", "wiersze", "bajty"], 0),
+            czas_s=0.0,
+            bajty_na_s=0.0,
+            wiersze_na_s=0.0,
+        )
+    start = time.perf_counter()
+    fabryki: Dict[Tuple[str, ...], Callable[[List[str]], Any]] = {}
+
+    def wynik(gotowy: CSVFileResult) -> CSVFileResult:
+        if gotowy.dane and typ_wiersza != "dict":
+            naglowki = tuple(gotowy.dane[0])
+            try:
+                if naglowki not in fabryki:
+                    fabryki[naglowki] = _fabryka_wiersza(
+                        list(naglowki), typ_wiersza
+                    )
+            except CSVParsingError as exc:
+                # nagłówek nie nadaje się na typ_wiersza – błąd tego pliku
+                gotowy = gotowy._replace(dane=None, blad=exc)
+            else:
+                buduj = fabryki[naglowki]
+                gotowy = gotowy._replace(
+                    dane=[buduj(list(w.values())) for w in gotowy.dane]
+                )
+        if statystyki is not None:
+            statystyki["pliki"] += 1
+            statystyki["bledne"] += gotowy.blad is not None
+            statystyki["wiersze"] += len(gotowy.dane or ())
+            statystyki["bajty"] += gotowy.bajty
+            czas = statystyki["czas_s"] = time.perf_counter() - start
+            if czas > 0:
+                statystyki["bajty_na_s"] = statystyki["bajty"] / czas
+                statystyki["wiersze_na_s"] = statystyki["wiersze"] / czas
+        return gotowy
+
+    if procesy <= 1:
+        for sciezka in sciezki:
+            yield wynik(_parsuj_plik(sciezka, opcje))
+        return
+
+    pula = ProcessPoolExecutor(max_workers=min(procesy, len(sciezki) or 1))
+    try:
+        zadania = [
+            pula.submit(_parsuj_plik, sciezka, opcje) for sciezka in sciezki
+        ]
+        gotowe = zadania if w_kolejnosci else as_completed(zadania)
+        for zadanie in gotowe:
+            yield wynik(zadanie.result())
+    finally:
+        # przerwana iteracja nie czeka na pliki, których nikt nie odbierze
+        pula.shutdown(wait=True, cancel_futures=True)
+
+
+# Indeks przesunięć wierszy (plik obok danych, *.idx)
+
+def _sciezka_indeksu(sciezka: str) -> str:
+    return sciezka + ".idx"
+
+
+def _offsety_rekordow(plik: Iterable[bytes], separator: str) -> array:
+    """Początki kolejnych rekordów danych (bez nagłówka) oraz koniec
+    ostatniego rekordu jako ostatni element.
+
+    Rekordy wyznacza csv.reader czytający linie pliku binarnego, więc
+    granice są takie same jak przy parsowaniu (pola wieloliniowe,
+    cudzysłowy wewnątrz pól bez cudzysłowu)."""
+
+    offsety = array("Q")
+    pozycja = 0
+
+    def linie() -> Iterator[str]:
+        nonlocal pozycja
+        for linia in plik:
+            pozycja += len(linia)
+            yield linia.decode("utf-8")
+
+    reader = csv.reader(linie(), delimiter=separator, skipinitialspace=True)
+    for _ in reader:
+        # reader zwraca rekord zaraz po przeczytaniu jego ostatniej linii
+        offsety.append(pozycja)
+    return offsety or array("Q", [pozycja])
+
+
+def _zapisz_indeks(sciezka: str, separator: str = ",") -> None:
+    _tylko_nieskompresowany(sciezka)
+    stat = os.stat(sciezka)
+    with open(sciezka, "rb") as plik:
+        offsety = _offsety_rekordow(plik, separator)
+
+    with open(_sciezka_indeksu(sciezka), "wb") as plik:
+        array("Q", [stat.st_size, stat.st_mtime_ns]).tofile(plik)
+        offsety.tofile(plik)
+
+
+def _wczytaj_indeks(sciezka: str) -> Optional[array]:
+    """Offsety z pliku indeksu lub None, gdy indeks nie istnieje albo
+    plik danych zmienił rozmiar/czas modyfikacji."""
+
+    try:
+        with open(_sciezka_indeksu(sciezka), "rb") as plik:
+            tresc = array("Q")
+            tresc.frombytes(plik.read())
+    except FileNotFoundError:
+        return None
+
+    stat = os.stat(sciezka)
+    if len(tresc) < 3 or tresc[0] != stat.st_size or tresc[1] != stat.st_mtime_ns:
+        return None
+    return tresc[2:]
+
+
+def build_csv_index(
+    sciezka: str,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+) -> str:
+    """Waliduje plik i zapisuje obok niego indeks początków wierszy
+    (array('Q')). Zwraca ścieżkę indeksu."""
+
+    for _ in iter_csv_file(sciezka, wymagane_pola, separator):
+        pass
+    _zapisz_indeks(sciezka, separator)
+    return _sciezka_indeksu(sciezka)
+
+
+def read_csv_rows(
+    sciezka: str,
+    od: int,
+    do: Optional[int] = None,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+) -> List[Dict[str, str]]:
+    """Zwraca wiersze od..do (jak wycinek listy z parse_csv_file) bez
+    parsowania poprzedzających danych. Nieaktualny lub brakujący indeks
+    jest budowany od nowa (z walidacją całego pliku)."""
+
+    offsety = _wczytaj_indeks(sciezka)
+    if offsety is None:
+        build_csv_index(sciezka, wymagane_pola, separator)
+        offsety = _wczytaj_indeks(sciezka)
+
+    od, do, _ = slice(od, do).indices(len(offsety) - 1)
+    if od >= do:
+        return []
+
+    with open(sciezka, "rb") as plik:
+        with mmap.mmap(plik.fileno(), 0, access=mmap.ACCESS_READ) as dane:
+            naglowek = dane[:offsety[0]].decode("utf-8")
+            tekst = dane[offsety[od]:offsety[do]].decode("utf-8")
+
+    with _bledy_csv():
+        naglowki = next(
+            csv.reader(
+                io.StringIO(naglowek, newline=None),
+                delimiter=separator,
+                skipinitialspace=True,
+            )
+        )
+        reader = csv.reader(
+            io.StringIO(tekst, newline=None),
+            delimiter=separator,
+            skipinitialspace=True,
+        )
+        return [_jako_slownik(naglowki, row) for row in reader]
+
+
+def read_csv_row(
+    sciezka: str,
+    numer: int,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+) -> Dict[str, str]:
+    """Pojedynczy wiersz danych o numerze `numer` (liczonym od 0)."""
+
+    wiersze = read_csv_rows(
+        sciezka,
+        numer,
+        numer + 1 if numer != -1 else None,
+        wymagane_pola,
+        separator,
+    )
+    if not wiersze:
+        raise IndexError(f"Brak wiersza o numerze {numer}.")
+    return wiersze[0]
+
+
+# Wznawianie wczytywania plików dopisywanych (plik obok danych, *.ckpt)
+
+def _sciezka_punktu(sciezka: str) -> str:
+    return sciezka + ".ckpt"
+
+
+def _odcisk(dane: bytes) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(dane, digest_size=8).digest(), "little"
+    )
+
+
+def _koniec_pelnych_rekordow(dane: bytes, separator: str) -> int:
+    """Pozycja tuż za ostatnim kompletnym rekordem (zakończonym nową
+    linią poza polem w cudzysłowie); niedopisany ogon jest pomijany."""
+
+    koniec = 0
+    for start, stop in _obszary_poza_cudzyslowem(dane, separator):
+        nl = dane.rfind(b"\n", start, stop)
+        if nl >= 0:
+            koniec = nl + 1
+    return koniec
+
+
+def _czytaj_naglowek(plik: Any, separator: str) -> bytes:
+    """Surowe bajty rekordu nagłówka (także z polami wieloliniowymi)."""
+
+    naglowek = plik.readline()
+    while not _koniec_pelnych_rekordow(naglowek, separator):
+        linia = plik.readline()
+        if not linia:
+            break
+        naglowek += linia
+    return naglowek
+
+
+def _wczytaj_punkt(
+    sciezka_punktu: str,
+    plik: Any,
+    odcisk_naglowka: int,
+    rozmiar: int,
+) -> Optional[array]:
+    """Punkt kontrolny [offset, wiersz, linia, odcisk nagłówka, odcisk
+    ogona] lub None, gdy go nie ma albo plik nie jest już tym samym
+    plikiem powiększonym o nowe dane (obcięty, zmieniony nagłówek lub
+    nadpisana końcówka)."""
+
+    try:
+        with open(sciezka_punktu, "rb") as f:
+            punkt = array("Q")
+            punkt.frombytes(f.read())
+    except FileNotFoundError:
+        return None
+
+    if len(punkt) != 5 or punkt[3] != odcisk_naglowka or punkt[0] > rozmiar:
+        return None
+    plik.seek(max(punkt[0] - 64, 0))
+    if _odcisk(plik.read(min(punkt[0], 64))) != punkt[4]:
+        return None
+    return punkt
+
+
+def _zapisz_punkt(sciezka_punktu: str, punkt: array) -> None:
+    tymczasowa = sciezka_punktu + ".tmp"
+    with open(tymczasowa, "wb") as f:
+        punkt.tofile(f)
+    os.replace(tymczasowa, sciezka_punktu)
+
+
+def parse_csv_appended(
+    sciezka: str,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    typ_wiersza: str = "dict",
+    punkt_kontrolny: Optional[str] = None,
+) -> List[Any]:
+    """Zwraca tylko wiersze dopisane od poprzedniego wywołania.
+
+    Po każdym udanym wywołaniu zapisywany jest punkt kontrolny (domyślnie
+    plik *.ckpt obok danych): offset bajtowy, numer następnego wiersza
+    i linii oraz odcisk nagłówka. Niedopisany ostatni rekord czeka na
+    kolejne wywołanie. Gdy plik obcięto, zmienił się nagłówek albo punktu
+    brak, plik czytany jest od początku. Numery wierszy w błędach są
+    takie jak w parse_csv_file; po błędzie punkt się nie przesuwa."""
+
+    _tylko_nieskompresowany(sciezka)
+    sciezka_punktu = punkt_kontrolny or _sciezka_punktu(sciezka)
+
+    with open(sciezka, "rb") as plik:
+        naglowek = _czytaj_naglowek(plik, separator)
+        koniec_naglowka = plik.tell()
+        rozmiar = os.fstat(plik.fileno()).st_size
+        odcisk_naglowka = _odcisk(naglowek)
+
+        punkt = _wczytaj_punkt(sciezka_punktu, plik, odcisk_naglowka, rozmiar)
+        if punkt is None:
+            punkt = array(
+                "Q",
+                [koniec_naglowka, 2, naglowek.count(b"\n") + 1,
+                 odcisk_naglowka, 0],
+            )
+        plik.seek(punkt[0])
+        dane = plik.read()
+        koniec = _koniec_pelnych_rekordow(dane, separator)
+        offset = punkt[0] + koniec
+        plik.seek(max(offset - 64, 0))
+        ogon = plik.read(min(offset, 64))
+
+    with _bledy_csv():
+        naglowki, wymagane_pola, _ = _otworz(
+            io.StringIO(naglowek.decode("utf-8"), newline=None),
+            wymagane_pola,
+            separator,
+        )
+        if not naglowek.endswith(b"\n"):
+            return []
+
+        tekst = dane[:koniec].decode("utf-8")
+        reader = csv.reader(
+            _linie(io.StringIO(tekst, newline=None), punkt[2]),
+            delimiter=separator,
+            skipinitialspace=True,
+        )
+        liczba_kolumn = len(naglowki)
+        dopelnij = typ_wiersza != "dict"
+        buduj = _fabryka_wiersza(naglowki, typ_wiersza)
+
+        wynik: List[Any] = []
+        for _, row in _waliduj_wiersze(
+            reader, naglowki, wymagane_pola, pierwszy_wiersz=punkt[1]
+        ):
+            if dopelnij and len(row) < liczba_kolumn:
+                row = row + [None] * (liczba_kolumn - len(row))
+            wynik.append(buduj(row))
+
+    _zapisz_punkt(
+        sciezka_punktu,
+        array(
+            "Q",
+            [offset, punkt[1] + len(wynik), punkt[2] + tekst.count("\n"),
+             odcisk_naglowka, _odcisk(ogon)],
+        ),
+    )
+    return wynik
+
+
+# Migawka kolumnowa wyniku parse_csv_file (plik binarny)
+#
+# Układ: nagłówek _NAGLOWEK_MIGAWKI, potem dla każdej kolumny dwa bloki
+# poprzedzone długością (u64): nazwa w UTF-8 oraz kolumna zakodowana
+# słownikowo – nagłówek _NAGLOWEK_KOLUMNY, offsety wpisów słownika (u64,
+# tylko gdy wpisy nie dają się rozdzielić znakiem NUL), tekst wpisów
+# w UTF-8 i kody wierszy (kod 0 = None). Typ kodów "-" oznacza kolumnę
+# bez powtórzeń i None – słownik jest wtedy samą kolumną.
+
+_MAGIA_MIGAWKI = b"CSVMIG01"
+_NAGLOWEK_MIGAWKI = struct.Struct("=8sQQQQQ")
+_NAGLOWEK_KOLUMNY = struct.Struct("=QQcc")
+
+
+def _odcisk_opcji(*opcje: Any) -> int:
+    return _odcisk(repr(opcje).encode("utf-8"))
+
+
+def _koduj_kolumne(kolumna: Iterable[Optional[str]]) -> bytes:
+    slownik: Dict[Optional[str], int] = {None: 0}
+    kody = [slownik.setdefault(w, len(slownik)) for w in kolumna]
+    wpisy = list(slownik)[1:]
+
+    if len(wpisy) == len(kody):
+        typ = "-"
+    elif len(slownik) <= 1 << 8:
+        typ = "B"
+    elif len(slownik) <= 1 << 16:
+        typ = "H"
+    else:
+        typ = "I"
+
+    polaczone = "\0".join(wpisy)
+    if polaczone.count("\0") == max(len(wpisy) - 1, 0):
+        offsety = b""
+        tekst = polaczone.encode("utf-8")
+    else:
+        teksty = [w.encode("utf-8") for w in wpisy]
+        offsety = array(
+            "Q", accumulate(map(len, teksty), initial=0)
+        ).tobytes()
+        tekst = b"".join(teksty)
+
+    return b"".join(
+        [
+            _NAGLOWEK_KOLUMNY.pack(
+                len(wpisy),
+                len(tekst),
+                typ.encode(),
+                b"o" if offsety else b"0",
+            ),
+            offsety,
+            tekst,
+            b"" if typ == "-" else array(typ, kody).tobytes(),
+        ]
+    )
+
+
+def _dekoduj_kolumne(blok: bytes) -> List[Optional[str]]:
+    liczba, dlugosc, typ, podzial = _NAGLOWEK_KOLUMNY.unpack_from(blok)
+    pozycja = _NAGLOWEK_KOLUMNY.size
+
+    if podzial == b"o":
+        offsety = array("Q")
+        offsety.frombytes(blok[pozycja:pozycja + 8 * (liczba + 1)])
+        pozycja += 8 * (liczba + 1)
+        tekst = blok[pozycja:pozycja + dlugosc]
+        wpisy = [
+            tekst[a:b].decode("utf-8")
+            for a, b in zip(offsety, offsety[1:])
+        ]
+    elif liczba:
+        wpisy = blok[pozycja:pozycja + dlugosc].decode("utf-8").split("\0")
+    else:
+        wpisy = []
+
+    if typ == b"-":
+        return wpisy
+    slownik = [None] + wpisy
+    kody = array(typ.decode())
+    kody.frombytes(blok[pozycja + dlugosc:])
+    return list(map(slownik.__getitem__, kody))
+
+
+def _zapisz_blok(plik: Any, dane: bytes) -> None:
+    plik.write(struct.pack("=Q", len(dane)))
+    plik.write(dane)
+
+
+def _czytaj_blok(dane: mmap.mmap, pozycja: int) -> Tuple[bytes, int]:
+    (dlugosc,) = struct.unpack_from("=Q", dane, pozycja)
+    pozycja += 8
+    if pozycja + dlugosc > len(dane):
+        raise ValueError("Blok migawki wykracza poza plik.")
+    return dane[pozycja:pozycja + dlugosc], pozycja + dlugosc
+
+
+def _zapisz_migawke(
+    migawka: str,
+    stat: os.stat_result,
+    opcje: int,
+    naglowki: List[str],
+    dane: List[Any],
+) -> None:
+    wartosci = (w.values() if isinstance(w, dict) else w for w in dane)
+    kolumny = list(zip(*wartosci)) or [()] * len(naglowki)
+
+    tymczasowa = migawka + ".tmp"
+    with open(tymczasowa, "wb") as plik:
+        plik.write(
+            _NAGLOWEK_MIGAWKI.pack(
+                _MAGIA_MIGAWKI,
+                stat.st_size,
+                stat.st_mtime_ns,
+                opcje,
+                len(dane),
+                len(naglowki),
+            )
+        )
+        for nazwa, kolumna in zip(naglowki, kolumny):
+            _zapisz_blok(plik, nazwa.encode("utf-8"))
+            _zapisz_blok(plik, _koduj_kolumne(kolumna))
+    os.replace(tymczasowa, migawka)
+
+
+def _wczytaj_migawke(
+    migawka: str,
+    stat: os.stat_result,
+    opcje: int,
+    typ_wiersza: str,
+) -> Optional[List[Any]]:
+    """Wiersze odtworzone z migawki lub None, gdy jej nie ma albo jest
+    nieaktualna (inne źródło, opcje lub wersja formatu) czy uszkodzona
+    (np. urwana) – wtedy plik CSV jest parsowany od nowa."""
+
+    try:
+        with open(migawka, "rb") as plik, mmap.mmap(
+            plik.fileno(), 0, access=mmap.ACCESS_READ
+        ) as dane:
+            if len(dane) < _NAGLOWEK_MIGAWKI.size:
+                return None
+            magia, rozmiar, mtime_ns, odcisk, liczba_wierszy, liczba_kolumn = (
+                _NAGLOWEK_MIGAWKI.unpack_from(dane)
+            )
+            if (magia, rozmiar, mtime_ns, odcisk) != (
+                _MAGIA_MIGAWKI, stat.st_size, stat.st_mtime_ns, opcje
+            ):
+                return None
+
+            pozycja = _NAGLOWEK_MIGAWKI.size
+            naglowki: List[str] = []
+            kolumny: List[List[Optional[str]]] = []
+            for _ in range(liczba_kolumn):
+                nazwa, pozycja = _czytaj_blok(dane, pozycja)
+                naglowki.append(nazwa.decode("utf-8"))
+                kolumna, pozycja = _czytaj_blok(dane, pozycja)
+                kolumny.append(_dekoduj_kolumne(kolumna))
+                if len(kolumny[-1]) != liczba_wierszy:
+                    return None
+            if pozycja != len(dane):
+                return None
+    except (FileNotFoundError, ValueError, IndexError, struct.error):
+        # ValueError: pusty plik migawki (mmap nie przyjmuje długości 0)
+        # albo urwany blok; IndexError: kod spoza słownika
+        return None
+
+    if typ_wiersza == "dict":
+        # wiersze z migawki mają zawsze komplet pól
+        return list(map(dict, map(zip, repeat(naglowki), zip(*kolumny))))
+    buduj = _fabryka_wiersza(naglowki, typ_wiersza)
+    return list(map(buduj, zip(*kolumny)))
+
+
+# Pamięć podręczna wyników parse_csv_file
+
+class _PamiecWynikow:
+    """LRU wyników parsowania z limitem szacowanego rozmiaru w bajtach.
+
+    Wiersze przechowywane są tylko do odczytu (krotka MappingProxyType
+    lub namedtuple), więc ten sam wynik można bezpiecznie zwracać wielu
+    wywołującym bez kopiowania."""
+
+    def __init__(self, limit_bajtow: int) -> None:
+        self.limit_bajtow = limit_bajtow
+        self._wpisy: "OrderedDict[tuple, Tuple[tuple, int]]" = OrderedDict()
+        self._bajty = 0
+        self._trafienia = 0
+        self._chybienia = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def klucz(
+        sciezka: str,
+        wymagane_pola: Optional[List[str]],
+        separator: str,
+        typ_wiersza: str,
+        kolumny: Optional[List[str]] = None,
+        warunek: Optional[Any] = None,
+        unikalne_pola: Optional[List[str]] = None,
+    ) -> tuple:
+        if typ_wiersza == "slots":
+            raise CSVParsingError(
+                "typ_wiersza='slots' nie jest obsługiwany z pamiec_podreczna "
+                "(wiersze muszą być niemodyfikowalne)."
+            )
+        sciezka = os.path.realpath(sciezka)
+        stat = os.stat(sciezka)
+        pola = None if wymagane_pola is None else tuple(wymagane_pola)
+        wybrane = None if kolumny is None else tuple(kolumny)
+        return (
+            sciezka,
+            stat.st_mtime_ns,
+            stat.st_size,
+            pola,
+            separator,
+            typ_wiersza,
+            wybrane,
+            _zamroz(warunek),
+            None if unikalne_pola is None else tuple(unikalne_pola),
+        )
+
+    def pobierz(self, klucz: tuple) -> Optional[tuple]:
+        with self._lock:
+            wpis = self._wpisy.get(klucz)
+            if wpis is None:
+                self._chybienia += 1
+                return None
+            self._wpisy.move_to_end(klucz)
+            self._trafienia += 1
+            return wpis[0]
+
+    def dodaj(self, klucz: tuple, dane: List[Any]) -> tuple:
+        zamrozone = tuple(
+            MappingProxyType(w) if isinstance(w, dict) else w for w in dane
+        )
+        rozmiar = _szacuj_rozmiar(dane)
+
+        with self._lock:
+            # inne wersje pliku (mtime_ns, rozmiar) nie będą już trafione;
+            # wyniki z innymi opcjami dla tej samej wersji zostają
+            for stary in [
+                k for k in self._wpisy
+                if k[0] == klucz[0] and (k[1:3] != klucz[1:3] or k == klucz)
+            ]:
+                self._usun(stary)
+
+            if rozmiar <= self.limit_bajtow:
+                self._wpisy[klucz] = (zamrozone, rozmiar)
+                self._bajty += rozmiar
+                while self._bajty > self.limit_bajtow:
+                    self._usun(next(iter(self._wpisy)))
+
+        return zamrozone
+
+    def _usun(self, klucz: tuple) -> None:
+        _, rozmiar = self._wpisy.pop(klucz)
+        self._bajty -= rozmiar
+
+    def ustaw_limit(self, limit_bajtow: int) -> None:
+        with self._lock:
+            self.limit_bajtow = limit_bajtow
+            while self._bajty > limit_bajtow:
+                self._usun(next(iter(self._wpisy)))
+
+    def wyczysc(self) -> None:
+        with self._lock:
+            self._wpisy.clear()
+            self._bajty = 0
+            self._trafienia = 0
+            self._chybienia = 0
+
+    def statystyki(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "trafienia": self._trafienia,
+                "chybienia": self._chybienia,
+                "wpisy": len(self._wpisy),
+                "bajty": self._bajty,
+                "limit_bajtow": self.limit_bajtow,
+            }
+
+
+def _zamroz(wartosc: Any) -> Any:
+    """Hashowalna postać warunku (do klucza pamięci podręcznej)."""
+
+    if isinstance(wartosc, dict):
+        return frozenset((k, _zamroz(v)) for k, v in wartosc.items())
+    if isinstance(wartosc, (list, tuple)):
+        return tuple(_zamroz(v) for v in wartosc)
+    if isinstance(wartosc, (set, frozenset)):
+        return frozenset(wartosc)
+    return wartosc
+
+
+def _szacuj_rozmiar(dane: List[Any]) -> int:
+    rozmiar = sys.getsizeof(dane)
+    for wiersz in dane:
+        wartosci = wiersz.values() if isinstance(wiersz, dict) else wiersz
+        rozmiar += sys.getsizeof(wiersz)
+        rozmiar += sum(sys.getsizeof(w) for w in wartosci)
+    return rozmiar
+
+
+_CACHE = _PamiecWynikow(limit_bajtow=256 * 1024 * 1024)
+
+
+def csv_cache_info() -> Dict[str, int]:
+    """Statystyki pamięci podręcznej parse_csv_file(pamiec_podreczna=True)."""
+
+    return _CACHE.statystyki()
+
+
+def csv_cache_clear() -> None:
+    _CACHE.wyczysc()
+
+
+def csv_cache_configure(limit_bajtow: int) -> None:
+    """Ustawia limit rozmiaru pamięci podręcznej (w bajtach)."""
+
+    _CACHE.ustaw_limit(limit_bajtow)
+
+
+# API asyncio
+
+async def aiter_csv(
+    sciezka: str,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    rozmiar_paczki: int = 1000,
+    wykonawca: Optional[Executor] = None,
+    **opcje: Any,
+) -> AsyncIterator[Any]:
+    """Asynchroniczny iterator wierszy (opcje jak w iter_csv_file).
+
+    Odczyt i parsowanie odbywają się w wątku, paczkami po rozmiar_paczki
+    wierszy; z wyprzedzeniem czytana jest co najwyżej jedna paczka, więc
+    wolny konsument wstrzymuje parsowanie. Po anulowaniu lub przerwaniu
+    iteracji praca kończy się na bieżącej paczce, a plik jest zamykany."""
+
+    petla = asyncio.get_running_loop()
+    wlasny = wykonawca is None
+    if wlasny:
+        wykonawca = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="aiter_csv",
+        )
+
+    wiersze = iter_csv_file(sciezka, wymagane_pola, separator, **opcje)
+
+    def nastepna_paczka() -> List[Any]:
+        return list(islice(wiersze, rozmiar_paczki))
+
+    zadanie = wykonawca.submit(nastepna_paczka)
+    try:
+        while True:
+            paczka = await asyncio.wrap_future(zadanie, loop=petla)
+            if not paczka:
+                break
+            zadanie = wykonawca.submit(nastepna_paczka)
+            for wiersz in paczka:
+                yield wiersz
+    finally:
+        # generator zamykamy dopiero, gdy wątek skończy bieżącą paczkę
+        zadanie.cancel()
+        zadanie.add_done_callback(lambda _: wiersze.close())
+        if wlasny:
+            wykonawca.shutdown(wait=False)
+
+
+async def aparse_csv_file(
+    sciezka: str,
+    wymagane_pola: Optional[List[str]] = None,
+    separator: str = ",",
+    rozmiar_paczki: int = 1000,
+    wykonawca: Optional[Executor] = None,
+    **opcje: Any,
+) -> List[Any]:
+    """Asynchroniczny odpowiednik parse_csv_file, nie blokuje pętli."""
+
+    return [
+        wiersz
+        async for wiersz in aiter_csv(
+            sciezka,
+            wymagane_pola,
+            separator,
+            rozmiar_paczki,
+            wykonawca,
+            **opcje,
+        )
+    ]
@@ -1,6 +1,9 @@
 import json
+import time
 from typing import Any, Dict, List, Optional, TextIO
 
+from ._narzedzia import BLEDY_ROZPAKOWANIA, rozpakowany, zmierz
+
 
 class JSONParsingError(Exception):
     """Błąd podczas parsowania lub walidacji JSON-a."""
@@ -10,20 +13,47 @@ def parse_json(
         data: str,
         required_keys: Optional[List[str]] = None,
         key_types: Optional[Dict[str, type]] = None,
+        statystyki: Optional[Dict[str, Any]] = None,
 ) -> Any:
+    """statystyki: słownik wypełniany czasami etapów (czasy_s), liczbą
+    znaków, elementów dokumentu i sprawdzeń reguł."""
+
+    if statystyki is not None:
+        statystyki.clear()
+        statystyki.update(
+            czasy_s=dict.fromkeys(
+                ["dekodowanie", "klucze", "typy", "razem"], 0.0
+            ),
+            znaki=len(data) if isinstance(data, (str, bytes)) else 0,
+            elementy=0,
+            reguly=dict.fromkeys(["klucze", "typy"], 0),
+        )
+    start = time.perf_counter()
+
     try:
         result = json.loads(data)
     except (json.JSONDecodeError, TypeError) as exc:
         raise JSONParsingError(f"Nieprawidłowy JSON: {exc}") from None
+    finally:
+        zmierz(statystyki, "dekodowanie", start)
+
+    if statystyki is not None:
+        statystyki["elementy"] = _policz_elementy(result)
 
     # klucze wymagane
+    etap = time.perf_counter()
     if required_keys and isinstance(result, dict):
+        if statystyki is not None:
+            statystyki["reguly"]["klucze"] += len(required_keys)
         missing = [k for k in required_keys if k not in result]
         if missing:
             raise JSONParsingError(f"Brakujące klucze: {', '.join(missing)}")
+    etap = zmierz(statystyki, "klucze", etap)
 
     # sprawdzanie typów
     if key_types and isinstance(result, dict):
+        if statystyki is not None:
+            statystyki["reguly"]["typy"] += len(key_types)
         for key, expected in key_types.items():
             val = result.get(key)
             if val is not None and not isinstance(val, expected):
@@ -32,24 +62,57 @@ def parse_json(
                     f"{expected.__name__}, a otrzymano "
                     f"{type(val).__name__}."
                 )
+    zmierz(statystyki, "typy", etap)
+    zmierz(statystyki, "razem", start)
 
     return result
 
 
+def _policz_elementy(wartosc: Any) -> int:
+    """Liczba węzłów zdekodowanego dokumentu (bez rekurencji)."""
+
+    licznik = 0
+    stos = [wartosc]
+    while stos:
+        wezel = stos.pop()
+        licznik += 1
+        if isinstance(wezel, dict):
+            stos.extend(wezel.values())
+        elif isinstance(wezel, list):
+            stos.extend(wezel)
+    return licznik
+
+
 def parse_json_file(
         file_obj: TextIO,
         required_keys: Optional[List[str]] = None,
         key_types: Optional[Dict[str, type]] = None,
+        statystyki: Optional[Dict[str, Any]] = None,
 ) -> Any:
+    """Pliki gzip, bz2 i xz są rozpoznawane po sygnaturze
+    i rozpakowywane w locie (bez pliku tymczasowego)."""
+
+    strumien = rozpakowany(file_obj)
     try:
-        content = file_obj.read()
+        if strumien is None:
+            content = file_obj.read()
+        else:
+            with strumien:
+                content = strumien.read().decode("utf-8")
     except UnicodeDecodeError as exc:
         raise JSONParsingError(
             f"Nie udało się odczytać pliku: {exc}"
         ) from None
+    except BLEDY_ROZPAKOWANIA as exc:
+        if strumien is None:
+            raise
+        raise JSONParsingError(
+            f"Nie udało się rozpakować pliku: {exc}"
+        ) from None
 
     return parse_json(
         content,
         required_keys=required_keys,
         key_types=key_types,
+        statystyki=statystyki,
     )
@@ -1,7 +1,10 @@
+import time
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from typing import Any, Dict, List, Optional, TextIO
 
+from ._narzedzia import BLEDY_ROZPAKOWANIA, rozpakowany, zmierz
+
 
 class XMLParsingError(Exception):
     """Używane, gdy cokolwiek pójdzie nie tak przy parsowaniu/walidacji."""
@@ -13,7 +16,27 @@ def parse_xml(
     required_attrs: Optional[Dict[str, List[str]]] = None,
     attr_types: Optional[Dict[str, Any]] = None,
     unique_tags: Optional[List[str]] = None,
+    statystyki: Optional[Dict[str, Any]] = None,
 ) -> ET.Element:
+    """statystyki: słownik wypełniany czasami etapów (czasy_s), liczbą
+    znaków, elementów drzewa i sprawdzeń każdej z reguł."""
+
+    if statystyki is not None:
+        statystyki.clear()
+        statystyki.update(
+            czasy_s=dict.fromkeys(
+                ["parsowanie", "tagi", "atrybuty", "typy", "unikalnosc",
+                 "razem"],
+                0.0,
+            ),
+            znaki=len(xml_input) if isinstance(xml_input, str) else 0,
+            elementy=0,
+            reguly=dict.fromkeys(
+                ["tagi", "atrybuty", "typy", "unikalnosc"], 0
+            ),
+        )
+        reguly = statystyki["reguly"]
+    start = time.perf_counter()
 
     #wczytanie danych
     try:
@@ -27,23 +50,36 @@ def parse_xml(
             )
     except ET.ParseError as exc:
         raise XMLParsingError(f"Niepoprawny XML: {exc}") from None
+    finally:
+        etap = zmierz(statystyki, "parsowanie", start)
+
+    if statystyki is not None:
+        statystyki["elementy"] = sum(1 for _ in root.iter())
 
     #wymóg obecności konkretnych tagów
     if required_tags:
         for tag in required_tags:
+            if statystyki is not None:
+                reguly["tagi"] += 1
             if not root.findall(f".//{tag}"):
                 raise XMLParsingError(f"Brak wymaganego taga <{tag}>.")
 
+    etap = zmierz(statystyki, "tagi", etap)
+
     #sprawdzanie atrybutów
     if required_attrs:
         for tag, attrs in required_attrs.items():
             for elem in root.findall(f".//{tag}"):
                 for attr in attrs:
+                    if statystyki is not None:
+                        reguly["atrybuty"] += 1
                     if attr not in elem.attrib:
                         raise XMLParsingError(
                             f"<{tag}> nie ma atrybutu '{attr}'."
                         )
 
+    etap = zmierz(statystyki, "atrybuty", etap)
+
     #kontrola typów atrybutów
     if attr_types:
         for key, expected in attr_types.items():
@@ -57,6 +93,8 @@ def parse_xml(
                 if attr not in elem.attrib:
                     continue  # brak atrybutu – nic nie sprawdzamy
 
+                if statystyki is not None:
+                    reguly["typy"] += 1
                 val = elem.attrib[attr]
 
                 # a) bool zapisany jako "true"/"false"
@@ -86,13 +124,19 @@ def parse_xml(
                             f"(oczekiwano {expected})."
                         )
 
+    etap = zmierz(statystyki, "typy", etap)
+
     #tagi, które muszą być unikalne
     if unique_tags:
         for tag in unique_tags:
+            if statystyki is not None:
+                reguly["unikalnosc"] += 1
             if len(root.findall(f".//{tag}")) > 1:
                 raise XMLParsingError(
                     f"Tego taga <{tag}> może być maksymalnie jeden."
                 )
+    zmierz(statystyki, "unikalnosc", etap)
+    zmierz(statystyki, "razem", start)
 
     return root
 
@@ -103,7 +147,27 @@ def parse_xml_file(
     required_attrs: Optional[Dict[str, List[str]]] = None,
     attr_types: Optional[Dict[str, Any]] = None,
     unique_tags: Optional[List[str]] = None,
+    statystyki: Optional[Dict[str, Any]] = None,
 ) -> ET.Element:
+    """Pliki gzip, bz2 i xz są rozpoznawane po sygnaturze; rozpakowany
+    strumień trafia wprost do parsera, bez pliku tymczasowego."""
+
+    strumien = rozpakowany(file_obj)
+    if strumien is not None:
+        try:
+            with strumien:
+                return parse_xml(
+                    strumien,
+                    required_tags=required_tags,
+                    required_attrs=required_attrs,
+                    attr_types=attr_types,
+                    unique_tags=unique_tags,
+                    statystyki=statystyki,
+                )
+        except BLEDY_ROZPAKOWANIA as exc:
+            raise XMLParsingError(
+                f"Nie udało się rozpakować pliku XML: {exc}"
+            ) from None
 
     try:
         xml_text = file_obj.read()
@@ -118,4 +182,5 @@ def parse_xml_file(
         required_attrs=required_attrs,
         attr_types=attr_types,
         unique_tags=unique_tags,
+        statystyki=statystyki,
     )
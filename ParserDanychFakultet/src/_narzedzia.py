@@ -0,0 +1,54 @@
+"""Pomocnicze funkcje wspólne dla ParserCSV, ParserJson i ParserXML."""
+
+import bz2
+import gzip
+import lzma
+import time
+from typing import Any, Dict, Optional
+
+
+# Pliki skompresowane
+
+# sygnatura na początku pliku -> moduł rozpakowujący
+_KOMPRESJA = (
+    (b"\x1f\x8b", gzip),
+    (b"BZh", bz2),
+    (b"\xfd7zXZ\x00", lzma),
+)
+
+# błędy uszkodzonego lub urwanego pliku skompresowanego
+BLEDY_ROZPAKOWANIA = (EOFError, OSError, lzma.LZMAError)
+
+
+def modul_kompresji(naglowek: bytes) -> Optional[Any]:
+    """gzip, bz2 lub lzma według sygnatury z początku pliku, inaczej None."""
+
+    for sygnatura, modul in _KOMPRESJA:
+        if naglowek.startswith(sygnatura):
+            return modul
+    return None
+
+
+def rozpakowany(file_obj: Any) -> Optional[Any]:
+    """Strumień rozpakowujący w locie, jeśli plik (otwarty przez open(),
+    tekstowo lub binarnie) jest skompresowany gzip, bz2 lub xz.
+    Sygnatura czytana jest przez peek(), bez przewijania pliku."""
+
+    surowy = getattr(file_obj, "buffer", file_obj)
+    if not hasattr(surowy, "peek"):
+        return None
+    modul = modul_kompresji(surowy.peek(6))
+    return None if modul is None else modul.open(surowy)
+
+
+# Statystyki
+
+def zmierz(
+    statystyki: Optional[Dict[str, Any]], etap: str, start: float
+) -> float:
+    """Dolicza czas od `start` do etapu; zwraca bieżący odczyt zegara."""
+
+    teraz = time.perf_counter()
+    if statystyki is not None:
+        statystyki["czasy_s"][etap] += teraz - start
+    return teraz
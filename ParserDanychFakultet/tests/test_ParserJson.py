@@ -1,5 +1,8 @@
+import bz2
+import gzip
 import io
 import json
+import lzma
 
 import pytest
 
@@ -240,3 +243,56 @@ class TestParseJsonFileErrors:
             match=r"Nie udało się odczytać pliku",
         ):
             parse_json_file(BadFile())
+
+
+# Statystyki etapów parsowania
+
+
+class TestStatystyki:
+    def test_counters_and_stages(self) -> None:
+        st = {}
+        tekst = '{"name": "Alice", "tags": [1, 2], "age": 30}'
+        parse_json(
+            tekst,
+            required_keys=["name", "age"],
+            key_types={"age": int},
+            statystyki=st,
+        )
+        assert st["znaki"] == len(tekst)
+        assert st["elementy"] == 6
+        assert st["reguly"] == {"klucze": 2, "typy": 1}
+        assert set(st["czasy_s"]) == {"dekodowanie", "klucze", "typy", "razem"}
+        assert st["czasy_s"]["razem"] >= st["czasy_s"]["dekodowanie"]
+
+    def test_stats_from_file(self) -> None:
+        st = {}
+        parse_json_file(io.StringIO("[1, 2, 3]"), statystyki=st)
+        assert st["elementy"] == 4
+
+    def test_decode_time_recorded_on_error(self) -> None:
+        st = {}
+        with pytest.raises(JSONParsingError, match=_PL_INVALID_JSON):
+            parse_json("{bad", statystyki=st)
+        assert st["czasy_s"]["dekodowanie"] > 0
+
+
+# Pliki skompresowane
+
+
+class TestParseJsonFileCompressed:
+    @pytest.mark.parametrize("modul", [gzip, bz2, lzma])
+    @pytest.mark.parametrize("tryb", ["rb", "r"])
+    def test_compressed_file(self, tmp_path, modul, tryb) -> None:
+        path = tmp_path / "dane.json.z"
+        path.write_bytes(modul.compress('{"name": "Żaneta"}'.encode()))
+        with open(path, tryb) as f:
+            assert parse_json_file(f, required_keys=["name"]) == {
+                "name": "Żaneta"
+            }
+
+    def test_truncated_file(self, tmp_path) -> None:
+        path = tmp_path / "dane.json.gz"
+        path.write_bytes(gzip.compress(b'{"a": 1}')[:-10])
+        with open(path, "rb") as f:
+            with pytest.raises(JSONParsingError, match="rozpakować"):
+                parse_json_file(f)
@@ -1,6 +1,12 @@
+import bz2
+import gzip
+import io
+import lzma
+
 import pytest
 
-from src.ParserXML import XMLParsingError, parse_xml
+from src._narzedzia import rozpakowany
+from src.ParserXML import XMLParsingError, parse_xml, parse_xml_file
 
 #fragmenty komunikatów
 
@@ -220,3 +226,71 @@ class TestXMLParserExtra:
             match=rf"{_PL_MISSING_TAG} <first>",
         ):
             parse_xml("<root/>", required_tags=["first", "second"])
+
+
+# Statystyki etapów parsowania
+
+
+class TestXMLParserStats:
+    def test_counters_and_stages(self) -> None:
+        st = {}
+        xml = '<root><item id="1"/><item id="2"/><meta/></root>'
+        parse_xml(
+            xml,
+            required_tags=["item"],
+            required_attrs={"item": ["id"]},
+            attr_types={"item@id": int},
+            unique_tags=["meta"],
+            statystyki=st,
+        )
+        assert st["znaki"] == len(xml)
+        assert st["elementy"] == 4
+        assert st["reguly"] == {
+            "tagi": 1, "atrybuty": 2, "typy": 2, "unikalnosc": 1,
+        }
+        assert st["czasy_s"]["razem"] >= st["czasy_s"]["parsowanie"]
+
+    def test_stats_from_file(self) -> None:
+        st = {}
+        parse_xml_file(io.StringIO("<root><a/></root>"), statystyki=st)
+        assert st["elementy"] == 2
+
+
+# Pliki skompresowane
+
+
+class TestXMLParserCompressed:
+    @pytest.mark.parametrize("modul", [gzip, bz2, lzma])
+    def test_compressed_file(self, tmp_path, modul) -> None:
+        path = tmp_path / "dane.xml.z"
+        path.write_bytes(modul.compress(b'<root><item id="1"/></root>'))
+        with open(path, "rb") as f:
+            root = parse_xml_file(
+                f, required_tags=["item"], attr_types={"item@id": int}
+            )
+        assert root.find("item").get("id") == "1"
+
+    def test_stream_is_closed(self, tmp_path, monkeypatch) -> None:
+        import src.ParserXML as parser_xml
+
+        strumienie = []
+
+        def zapamietaj(file_obj):
+            strumien = rozpakowany(file_obj)
+            strumienie.append(strumien)
+            return strumien
+
+        monkeypatch.setattr(parser_xml, "rozpakowany", zapamietaj)
+        path = tmp_path / "dane.xml.gz"
+        path.write_bytes(gzip.compress(b"<root><a/></root>"))
+        with open(path, "rb") as f:
+            parse_xml_file(f, required_tags=["a"])
+            assert not f.closed
+        assert strumienie[0].closed
+
+    def test_truncated_file(self, tmp_path) -> None:
+        path = tmp_path / "dane.xml.xz"
+        path.write_bytes(lzma.compress(b"<root><a/></root>")[:-8])
+        with open(path, "rb") as f:
+            with pytest.raises(XMLParsingError, match="rozpakować"):
+                parse_xml_file(f)
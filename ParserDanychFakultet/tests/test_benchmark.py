@@ -0,0 +1,28 @@
+import importlib
+import os
+
+import pytest
+
+KATALOG_GLOWNY = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+KATALOG_BENCHMARKOW = os.path.join(KATALOG_GLOWNY, "benchmarks")
+
+
+@pytest.fixture
+def bench(monkeypatch):
+    monkeypatch.syspath_prepend(KATALOG_BENCHMARKOW)
+    return importlib.import_module("bench_parsers")
+
+
+class TestBenchmarkSmoke:
+    """Każdy wariant i format daje się załadować i zmierzyć."""
+
+    @pytest.mark.parametrize("format_", ["csv", "json", "xml"])
+    def test_all_variants_run(self, bench, tmp_path, format_) -> None:
+        sciezka = str(tmp_path / f"dane.{format_}")
+        bench.GENERATORY[format_](sciezka, 20)
+        for wariant in bench.WARIANTY:
+            wynik = bench.zmierz(wariant, format_, sciezka, 20, 1)
+            assert "blad" not in wynik, (wariant, wynik.get("blad"))
+            assert wynik["rekordy_na_s"] > 0
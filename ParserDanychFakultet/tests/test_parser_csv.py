@@ -1,9 +1,47 @@
+import asyncio
+import bz2
+import gzip
 import io
+import lzma
+import os
+import sqlite3
+import threading
 import time
+import tracemalloc
+from array import array
+from datetime import date
 
 import pytest
 
-from src.ParserCSV import CSVParsingError, parse_csv, parse_csv_file
+import src.ParserCSV as parser_csv
+from src.ParserCSV import (
+    CSVErrorReport,
+    CSVRows,
+    CSVParsingError,
+    aiter_csv,
+    aparse_csv_file,
+    build_csv_index,
+    csv_cache_clear,
+    csv_cache_configure,
+    csv_cache_info,
+    iter_csv,
+    iter_csv_batches,
+    iter_csv_file,
+    load_csv_into_sqlite,
+    parse_csv,
+    parse_csv_appended,
+    parse_csv_columns,
+    parse_csv_columns_file,
+    parse_csv_file,
+    parse_csv_file_parallel,
+    parse_csv_files,
+    parse_csv_typed,
+    probe_csv_header,
+    profile_csv,
+    read_csv_row,
+    read_csv_rows,
+    validate_csv,
+)
 
 
 # Poprawne dane wejściowe
@@ -332,7 +370,7 @@ class TestCSVParserIOAndEdge:
 
     def test_unicode_decode_error(self) -> None:
         class Fake:  # noqa: D401
-            def readlines(self):  # noqa: D401
+            def __iter__(self):  # noqa: D401
                 raise UnicodeDecodeError("utf-8", b"", 0, 1, "err")
 
         with pytest.raises(
@@ -379,3 +417,1849 @@ class TestCSVParserIOAndEdge:
 
         assert elapsed < 1.0, f"Za wolno: {elapsed:.2f}s"
         assert len(result) == num
+
+
+
+# Strumieniowe API
+
+
+
+class TestCSVParserStreaming:
+    """iter_csv / iter_csv_file – walidacja w locie, bez pełnej listy."""
+
+    def test_iter_csv_yields_rows(self) -> None:
+        csv_ = "id,name\n1,Alice\n2,Bob"
+        rows = iter_csv(io.StringIO(csv_), wymagane_pola=["id", "name"])
+        assert next(rows)["name"] == "Alice"
+        assert next(rows)["name"] == "Bob"
+        with pytest.raises(StopIteration):
+            next(rows)
+
+    def test_iter_csv_is_lazy(self) -> None:
+        csv_ = "id,name\n1,Alice\n2,\n3,Carol"
+        rows = iter_csv(io.StringIO(csv_), wymagane_pola=["id", "name"])
+        assert next(rows)["name"] == "Alice"
+        with pytest.raises(
+            CSVParsingError,
+            match=r"Brak wartości w polach: name w wierszu 3",
+        ):
+            next(rows)
+
+    def test_iter_csv_blank_line_detected_inline(self) -> None:
+        csv_ = "id,name\n1,Alice\n   \n2,Bob"
+        rows = iter_csv(io.StringIO(csv_), wymagane_pola=["id", "name"])
+        assert next(rows)["id"] == "1"
+        with pytest.raises(CSVParsingError, match=r"Pusta linia.*wierszu 3"):
+            next(rows)
+
+    def test_iter_csv_does_not_need_seek(self) -> None:
+        lines = iter(["id,name\n", "1,Alice\n", "2,Bob\n"])
+        assert [r["name"] for r in iter_csv(lines)] == ["Alice", "Bob"]
+
+    def test_iter_csv_file(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n2,Bob\n", encoding="utf-8")
+        assert [r["id"] for r in iter_csv_file(str(path))] == ["1", "2"]
+
+
+
+# Układ kolumnowy
+
+
+
+class TestCSVParserColumns:
+    """parse_csv_columns – jedna lista na kolumnę zamiast słownika na wiersz."""
+
+    def test_columns_layout(self) -> None:
+        csv_ = "id,name,age\n1,Alice,30\n2,Bob,25"
+        kolumny, liczba = parse_csv_columns(io.StringIO(csv_))
+        assert liczba == 2
+        assert kolumny == {
+            "id": ["1", "2"],
+            "name": ["Alice", "Bob"],
+            "age": ["30", "25"],
+        }
+
+    def test_columns_match_rows(self) -> None:
+        csv_ = "id,name,email\n1,Alice,a@x.pl\n2,Bob"
+        wiersze = parse_csv(io.StringIO(csv_), wymagane_pola=["id", "name"])
+        kolumny, liczba = parse_csv_columns(
+            io.StringIO(csv_),
+            wymagane_pola=["id", "name"],
+        )
+        assert liczba == len(wiersze)
+        for naglowek, wartosci in kolumny.items():
+            assert wartosci == [w[naglowek] for w in wiersze]
+
+    def test_columns_header_only(self) -> None:
+        kolumny, liczba = parse_csv_columns(io.StringIO("id,name\n"))
+        assert liczba == 0
+        assert kolumny == {"id": [], "name": []}
+
+    @pytest.mark.parametrize(
+        ("csv_content", "pattern"),
+        [
+            ("id,name\n1,Alice\n\n2,Bob", r"Pusta linia"),
+            ("id,first name\n1,Alice", r"zawierają spacje"),
+            ("id,name\n1,Alice,extra", r"Dodatkowe kolumny w wierszu 2"),
+            ("id,name\n1,", r"Brak wartości w polach: name w wierszu 2"),
+        ],
+    )
+    def test_columns_validation(self, csv_content: str, pattern: str) -> None:
+        with pytest.raises(CSVParsingError, match=pattern):
+            parse_csv_columns(io.StringIO(csv_content))
+
+    def test_columns_file(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id;name\n1;Alice\n", encoding="utf-8")
+        kolumny, liczba = parse_csv_columns_file(str(path), separator=";")
+        assert (kolumny["name"], liczba) == (["Alice"], 1)
+
+
+
+# Konwersja typów wg schematu
+
+
+
+class TestCSVParserTyped:
+    """parse_csv_typed – kolumny konwertowane całościowo według schematu."""
+
+    CSV = (
+        "id,name,age,is_active,join_date\n"
+        "1,Alice,30,True,2021-01-15\n"
+        "2,Bob,25,false,2020-02-29"
+    )
+    SCHEMAT = {"age": int, "is_active": bool, "join_date": "iso"}
+
+    def test_typed_without_numpy(self, monkeypatch) -> None:
+        monkeypatch.setattr(parser_csv, "np", None)
+        kolumny, liczba = parse_csv_typed(io.StringIO(self.CSV), self.SCHEMAT)
+        assert liczba == 2
+        assert kolumny["age"] == array("q", [30, 25])
+        assert list(kolumny["is_active"]) == [1, 0]
+        assert kolumny["join_date"] == [date(2021, 1, 15), date(2020, 2, 29)]
+        assert kolumny["name"] == ["Alice", "Bob"]
+
+    def test_typed_with_numpy(self) -> None:
+        np = pytest.importorskip("numpy")
+        kolumny, _ = parse_csv_typed(io.StringIO(self.CSV), self.SCHEMAT)
+        assert kolumny["age"].dtype == np.int64
+        assert kolumny["is_active"].tolist() == [True, False]
+        assert str(kolumny["join_date"][0]) == "2021-01-15"
+
+    @pytest.mark.parametrize(
+        ("schemat", "pattern"),
+        [
+            ({"age": int}, r"'x' w kolumnie age nie jest typu int \(wiersz 3\)"),
+            ({"is_active": bool}, r"kolumnie is_active .* \(wiersz 2\)"),
+            ({"join_date": "iso"}, r"kolumnie join_date .* \(wiersz 3\)"),
+        ],
+    )
+    def test_typed_conversion_error_line(self, schemat, pattern) -> None:
+        csv_ = (
+            "id,age,is_active,join_date\n"
+            "1,30,yes,2021-01-15\n"
+            "2,x,true,15-01-2021"
+        )
+        with pytest.raises(CSVParsingError, match=pattern):
+            parse_csv_typed(io.StringIO(csv_), schemat)
+
+    def test_typed_unknown_column(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"nie występują"):
+            parse_csv_typed(io.StringIO(self.CSV), {"salary": float})
+
+    def test_typed_unsupported_type(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Nieobsługiwany typ"):
+            parse_csv_typed(io.StringIO(self.CSV), {"age": list})
+
+
+
+# Kompaktowe typy wierszy
+
+
+
+class TestCSVParserRowTypes:
+    """typ_wiersza="tuple"/"slots" – lekkie obiekty zamiast słowników."""
+
+    CSV = "id,name,email\n1,Alice,a@x.pl\n2,Bob"
+
+    @pytest.mark.parametrize("typ_wiersza", ["tuple", "slots"])
+    def test_row_type_values(self, typ_wiersza: str) -> None:
+        result = parse_csv(
+            io.StringIO(self.CSV),
+            wymagane_pola=["id", "name"],
+            typ_wiersza=typ_wiersza,
+        )
+        assert result[0].name == "Alice"
+        assert result[1].email is None
+        assert tuple(result[0]) == ("1", "Alice", "a@x.pl")
+        assert result[1]._asdict() == {"id": "2", "name": "Bob", "email": None}
+
+    @pytest.mark.parametrize("typ_wiersza", ["tuple", "slots"])
+    def test_one_class_per_header(self, typ_wiersza: str) -> None:
+        result = parse_csv(io.StringIO(self.CSV), ["id"], typ_wiersza=typ_wiersza)
+        assert type(result[0]) is type(result[1])
+        assert not hasattr(result[0], "__dict__")
+
+    def test_slots_rows_equal_across_parses(self) -> None:
+        a = parse_csv(io.StringIO(self.CSV), ["id"], typ_wiersza="slots")
+        b = parse_csv(io.StringIO(self.CSV), ["id"], typ_wiersza="slots")
+        assert type(a[0]) is not type(b[0])
+        assert a == b
+        assert a[0] != b[1]
+        inne = parse_csv(
+            io.StringIO("id,nazwa,email\n1,Alice,a@x.pl"), typ_wiersza="slots"
+        )
+        assert inne[0] != a[0]
+        assert a[0] != ("1", "Alice", "a@x.pl")
+
+    def test_spilled_slots_rows_equal(self) -> None:
+        a = parse_csv(io.StringIO(self.CSV), ["id"], typ_wiersza="slots")
+        with parse_csv(
+            io.StringIO(self.CSV), ["id"], typ_wiersza="slots", limit_pamieci=1
+        ) as b:
+            assert list(b) == a
+
+    def test_slots_item_access(self) -> None:
+        result = parse_csv(io.StringIO(self.CSV), ["id"], typ_wiersza="slots")
+        assert result[0]["email"] == "a@x.pl"
+
+    def test_slots_rejects_non_identifier_header(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"na\$me"):
+            parse_csv(
+                io.StringIO("id,na$me\n1,Alice"),
+                typ_wiersza="slots",
+            )
+
+    def test_row_type_keeps_validation(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Dodatkowe kolumny w wierszu 2"):
+            parse_csv(io.StringIO("id,name\n1,Alice,x"), typ_wiersza="tuple")
+
+    def test_unknown_row_type(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Nieznany typ_wiersza"):
+            parse_csv(io.StringIO(self.CSV), typ_wiersza="list")
+
+
+
+# Równoległe parsowanie
+
+
+
+def _zapisz_duzy_csv(path, wstawka: str = "", po_wierszu: int = 0) -> str:
+    linie = ["id,name,comment\n"]
+    for i in range(3000):
+        comment = '"wiele\nlinii, ""cytat"""' if i % 7 == 0 else f"c{i}"
+        linie.append(f"{i},User{i},{comment}\n")
+        if i == po_wierszu and wstawka:
+            linie.append(wstawka)
+    path.write_text("".join(linie), encoding="utf-8")
+    return str(path)
+
+
+class TestCSVParserParallel:
+    """parse_csv_file_parallel – zakresy bajtów w puli procesów."""
+
+    def test_parallel_matches_sequential(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv")
+        wynik = parse_csv_file_parallel(sciezka, procesy=3)
+        assert wynik == parse_csv_file(sciezka)
+        assert wynik[7]["comment"] == 'wiele\nlinii, "cytat"'
+
+    def test_parallel_row_type(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv")
+        wynik = parse_csv_file_parallel(sciezka, typ_wiersza="tuple", procesy=3)
+        assert [w.id for w in wynik] == [str(i) for i in range(3000)]
+
+    @pytest.mark.parametrize(
+        ("wstawka", "pattern"),
+        [
+            ("\n", r"Pusta linia wykryta w wierszu"),
+            ("x,,y\n", r"Brak wartości w polach: name w wierszu"),
+            ("x,y,z,extra\n", r"Dodatkowe kolumny w wierszu"),
+        ],
+    )
+    def test_parallel_global_line_numbers(
+        self,
+        tmp_path,
+        wstawka: str,
+        pattern: str,
+    ) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv", wstawka, 2500)
+        with pytest.raises(CSVParsingError) as sekwencyjnie:
+            parse_csv_file(sciezka)
+        with pytest.raises(CSVParsingError, match=pattern) as rownolegle:
+            parse_csv_file_parallel(sciezka, procesy=3)
+        assert str(rownolegle.value) == str(sekwencyjnie.value)
+
+    def test_parallel_header_validation(self, tmp_path) -> None:
+        path = tmp_path / "zly.csv"
+        path.write_text("id,first name\n1,Alice\n", encoding="utf-8")
+        with pytest.raises(CSVParsingError, match=r"zawierają spacje"):
+            parse_csv_file_parallel(str(path), procesy=2)
+
+    def test_parallel_single_process_fallback(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv")
+        assert parse_csv_file_parallel(sciezka, procesy=1) == parse_csv_file(
+            sciezka
+        )
+
+    def test_parallel_literal_quote_in_unquoted_field(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(
+            tmp_path / "dane.csv", 'tv,Screen,32" wide\n', 100
+        )
+        wynik = parse_csv_file_parallel(sciezka, procesy=8)
+        assert wynik == parse_csv_file(sciezka)
+        assert wynik[101]["comment"] == '32" wide'
+        assert profile_csv(sciezka, procesy=8)["wiersze"] == 3001
+
+
+
+# Indeks przesunięć wierszy
+
+
+
+class TestCSVParserRowIndex:
+    """Indeks *.idx i dostęp do wierszy przez mmap."""
+
+    def test_parse_csv_file_saves_index(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv")
+        wynik = parse_csv_file(sciezka, zapisz_indeks=True)
+        assert (tmp_path / "dane.csv.idx").exists()
+        assert read_csv_rows(sciezka, 0, 3) == wynik[0:3]
+        assert read_csv_rows(sciezka, 1400, 1410) == wynik[1400:1410]
+        assert read_csv_rows(sciezka, -2) == wynik[-2:]
+        assert read_csv_row(sciezka, 7) == wynik[7]
+
+    def test_index_is_array_of_offsets(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_bytes(b"id,name\n1,Alice\n2,Bob")
+        indeks = array("Q")
+        indeks.frombytes(open(build_csv_index(str(path)), "rb").read())
+        assert list(indeks[2:]) == [8, 16, 21]
+
+    def test_stale_index_is_rebuilt(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n2,Bob\n", encoding="utf-8")
+        build_csv_index(str(path))
+        path.write_text("id,name\n1,Alicja\n2,Bob\n3,Carol\n", encoding="utf-8")
+        assert read_csv_row(str(path), 0)["name"] == "Alicja"
+        assert read_csv_row(str(path), -1)["name"] == "Carol"
+
+    def test_missing_index_validates_file(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n2,\n", encoding="utf-8")
+        with pytest.raises(CSVParsingError, match=r"w wierszu 3"):
+            read_csv_row(str(path), 0)
+
+    def test_row_out_of_range(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        assert read_csv_rows(str(path), 5, 10) == []
+        with pytest.raises(IndexError):
+            read_csv_row(str(path), 1)
+
+    def test_literal_quote_in_unquoted_field(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(
+            tmp_path / "dane.csv", 'tv,Screen,32" wide\n', 3
+        )
+        wynik = parse_csv_file(sciezka)
+        build_csv_index(sciezka)
+        assert read_csv_row(sciezka, 10) == wynik[10]
+        assert read_csv_rows(sciezka, 0, 20) == wynik[0:20]
+        assert read_csv_rows(sciezka, -3) == wynik[-3:]
+
+
+
+# Pamięć podręczna wyników
+
+
+
+class TestCSVParserCache:
+    """parse_csv_file(pamiec_podreczna=True) – LRU z limitem bajtów."""
+
+    @pytest.fixture(autouse=True)
+    def _czysta_pamiec(self):
+        csv_cache_clear()
+        yield
+        csv_cache_configure(256 * 1024 * 1024)
+        csv_cache_clear()
+
+    def test_cache_hit_and_miss(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n2,Bob\n", encoding="utf-8")
+        pierwszy = parse_csv_file(str(path), pamiec_podreczna=True)
+        drugi = parse_csv_file(str(path), pamiec_podreczna=True)
+        assert drugi is pierwszy
+        assert drugi[1]["name"] == "Bob"
+        info = csv_cache_info()
+        assert (info["trafienia"], info["chybienia"], info["wpisy"]) == (1, 1, 1)
+
+    def test_cached_rows_are_read_only(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        wynik = parse_csv_file(str(path), pamiec_podreczna=True)
+        with pytest.raises(TypeError):
+            wynik[0]["name"] = "Mallory"
+
+    def test_options_are_part_of_key(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        parse_csv_file(str(path), pamiec_podreczna=True)
+        parse_csv_file(str(path), ["id"], pamiec_podreczna=True)
+        parse_csv_file(str(path), ["id"], typ_wiersza="tuple", pamiec_podreczna=True)
+        assert csv_cache_info()["chybienia"] == 3
+
+    def test_other_options_stay_cached(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        for _ in range(3):
+            parse_csv_file(str(path), pamiec_podreczna=True)
+            parse_csv_file(str(path), kolumny=["id"], pamiec_podreczna=True)
+        info = csv_cache_info()
+        assert (info["trafienia"], info["chybienia"]) == (4, 2)
+        assert info["wpisy"] == 2
+
+    def test_changed_file_is_reparsed(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        parse_csv_file(str(path), pamiec_podreczna=True)
+        path.write_text("id,name\n1,Alicja\n2,Bob\n", encoding="utf-8")
+        wynik = parse_csv_file(str(path), pamiec_podreczna=True)
+        assert wynik[0]["name"] == "Alicja"
+        assert csv_cache_info()["wpisy"] == 1
+
+    def test_lru_eviction_by_size(self, tmp_path) -> None:
+        sciezki = []
+        for i in range(3):
+            path = tmp_path / f"dane{i}.csv"
+            path.write_text("id,name\n" + "1,Alice\n" * 50, encoding="utf-8")
+            sciezki.append(str(path))
+        parse_csv_file(sciezki[0], pamiec_podreczna=True)
+        rozmiar = csv_cache_info()["bajty"]
+        csv_cache_configure(rozmiar * 2)
+        parse_csv_file(sciezki[1], pamiec_podreczna=True)
+        parse_csv_file(sciezki[0], pamiec_podreczna=True)  # odświeża LRU
+        parse_csv_file(sciezki[2], pamiec_podreczna=True)  # wypiera dane1
+        assert csv_cache_info()["wpisy"] == 2
+        parse_csv_file(sciezki[0], pamiec_podreczna=True)
+        parse_csv_file(sciezki[1], pamiec_podreczna=True)
+        assert csv_cache_info()["trafienia"] == 2
+        assert csv_cache_info()["bajty"] <= rozmiar * 2
+
+    def test_errors_are_not_cached(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,\n", encoding="utf-8")
+        for _ in range(2):
+            with pytest.raises(CSVParsingError):
+                parse_csv_file(str(path), pamiec_podreczna=True)
+        assert csv_cache_info()["wpisy"] == 0
+
+
+
+# Zbieranie wszystkich błędów
+
+
+
+class TestCSVParserCollectErrors:
+    """bledy="collect" – jeden przebieg, raport wszystkich błędów."""
+
+    CSV = "id,name\n1,Alice\n\n2,\n3,Bob,extra\n4,Carol\n   \n"
+
+    def test_collects_all_errors(self) -> None:
+        with pytest.raises(CSVErrorReport) as excinfo:
+            parse_csv(io.StringIO(self.CSV), bledy="collect")
+        assert [nr for nr, _ in excinfo.value.bledy] == [3, 4, 5, 7]
+        assert "Brak wartości w polach: name w wierszu 4" in str(excinfo.value)
+        assert "Dodatkowe kolumny w wierszu 5" in str(excinfo.value)
+        assert not excinfo.value.przerwano
+
+    def test_report_is_parsing_error(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Znaleziono 4 błędów"):
+            parse_csv(io.StringIO(self.CSV), bledy="collect")
+
+    def test_max_errors_stops_scan(self) -> None:
+        with pytest.raises(CSVErrorReport) as excinfo:
+            parse_csv(io.StringIO(self.CSV), bledy="collect", max_bledow=2)
+        assert [nr for nr, _ in excinfo.value.bledy] == [3, 4]
+        assert excinfo.value.przerwano
+
+    def test_iter_yields_valid_rows_before_report(self) -> None:
+        wiersze = iter_csv(io.StringIO(self.CSV), bledy="collect")
+        assert [next(wiersze)["id"], next(wiersze)["id"]] == ["1", "4"]
+        with pytest.raises(CSVErrorReport):
+            next(wiersze)
+
+    def test_collect_without_errors(self) -> None:
+        csv_ = "id,name\n1,Alice\n2,Bob"
+        assert parse_csv(io.StringIO(csv_), bledy="collect") == parse_csv(
+            io.StringIO(csv_)
+        )
+
+    def test_header_errors_still_raise_immediately(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Powtórzone nazwy"):
+            parse_csv(io.StringIO("id,id\n1,2"), bledy="collect")
+
+    def test_unknown_mode(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Nieznany tryb"):
+            parse_csv(io.StringIO("id\n1"), bledy="ignore")
+
+
+
+# Sprawdzenie samego nagłówka
+
+
+
+class TestCSVParserProbeHeader:
+    """probe_csv_header – tylko pierwszy rekord pliku."""
+
+    def test_probe_returns_header(self) -> None:
+        naglowki = probe_csv_header(
+            io.StringIO("id;name\n1;Alice"),
+            wymagane_pola=["id"],
+            separator=";",
+        )
+        assert naglowki == ["id", "name"]
+
+    def test_probe_reads_only_first_record(self) -> None:
+        def linie():
+            yield "id,name\n"
+            raise AssertionError("czytano za daleko")
+
+        assert probe_csv_header(linie()) == ["id", "name"]
+
+    def test_probe_ignores_bad_rows(self) -> None:
+        csv_ = "id,name\n\n1,Alice,extra"
+        assert probe_csv_header(io.StringIO(csv_)) == ["id", "name"]
+
+    @pytest.mark.parametrize(
+        ("csv_content", "wymagane", "pattern"),
+        [
+            ("", None, r"Brak wiersza nagłówka"),
+            ("1,2\n", None, r"tylko liczby"),
+            ("1col,name\n", None, r"cyfry"),
+            ("first name,id\n", None, r"spacje"),
+            ("id,id\n", None, r"Powtórzone"),
+            ("id,name\n", ["id", "age"], r"Brakujące pola w nagłówku: age"),
+        ],
+    )
+    def test_probe_header_checks(self, csv_content, wymagane, pattern) -> None:
+        with pytest.raises(CSVParsingError, match=pattern):
+            probe_csv_header(io.StringIO(csv_content), wymagane_pola=wymagane)
+
+    def test_probe_path(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        assert probe_csv_header(str(path)) == ["id", "name"]
+        assert probe_csv_header(path) == ["id", "name"]
+
+
+
+# Projekcja kolumn
+
+
+
+class TestCSVParserProjection:
+    """kolumny=[...] – tylko wybrane pola trafiają do wiersza."""
+
+    CSV = "id,name,age,note\n1,Alice,30,\n2,Bob,25,x"
+
+    def test_projection_keeps_selected_columns(self) -> None:
+        result = parse_csv(io.StringIO(self.CSV), kolumny=["name", "id"])
+        assert result == [
+            {"name": "Alice", "id": "1"},
+            {"name": "Bob", "id": "2"},
+        ]
+
+    def test_projection_requires_selected_by_default(self) -> None:
+        csv_ = "id,name,age\n1,,30"
+        assert parse_csv(io.StringIO(csv_), kolumny=["id", "age"]) == [
+            {"id": "1", "age": "30"}
+        ]
+        with pytest.raises(CSVParsingError, match=r"Brak wartości w polach: age"):
+            parse_csv(io.StringIO("id,name,age\n1,Alice,"), kolumny=["age"])
+
+    def test_projection_with_explicit_required(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"name w wierszu 2"):
+            parse_csv(
+                io.StringIO("id,name\n1,"),
+                wymagane_pola=["name"],
+                kolumny=["id"],
+            )
+
+    def test_projection_still_checks_extra_columns(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Dodatkowe kolumny"):
+            parse_csv(io.StringIO("id,name\n1,Alice,x"), kolumny=["id"])
+
+    def test_projection_unknown_column(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Brakujące pola w nagłówku: salary"):
+            parse_csv(io.StringIO(self.CSV), wymagane_pola=["id"], kolumny=["salary"])
+
+    @pytest.mark.parametrize("typ_wiersza", ["tuple", "slots"])
+    def test_projection_row_types(self, typ_wiersza: str) -> None:
+        result = parse_csv(
+            io.StringIO(self.CSV),
+            wymagane_pola=["id"],
+            kolumny=["note"],
+            typ_wiersza=typ_wiersza,
+        )
+        assert [r.note for r in result] == ["", "x"]
+
+
+
+# Filtrowanie wierszy
+
+
+
+class TestCSVParserWhere:
+    """warunek= – filtr na surowych polach przed zbudowaniem wiersza."""
+
+    CSV = (
+        "id,name,age,is_active\n"
+        "1,Alice,30,True\n"
+        "2,Bob,15,False\n"
+        "3,Carol,x,True"
+    )
+
+    def test_where_dict_equality(self) -> None:
+        result = parse_csv(io.StringIO(self.CSV), warunek={"is_active": "True"})
+        assert [r["id"] for r in result] == ["1", "3"]
+
+    def test_where_numeric_comparison(self) -> None:
+        result = parse_csv(io.StringIO(self.CSV), warunek=[("age", ">=", 18)])
+        assert [r["name"] for r in result] == ["Alice"]
+
+    def test_where_multiple_conditions(self) -> None:
+        result = parse_csv(
+            io.StringIO(self.CSV),
+            warunek=[("name", "in", {"Bob", "Carol"}), ("is_active", "!=", "False")],
+        )
+        assert [r["id"] for r in result] == ["3"]
+
+    def test_where_callable_gets_raw_fields(self) -> None:
+        widziane = []
+
+        def warunek(row):
+            widziane.append(row)
+            return row[0] == "2"
+
+        result = parse_csv(io.StringIO(self.CSV), warunek=warunek)
+        assert result == [{"id": "2", "name": "Bob", "age": "15", "is_active": "False"}]
+        assert all(isinstance(row, list) for row in widziane)
+
+    def test_where_with_projection(self) -> None:
+        result = parse_csv(
+            io.StringIO(self.CSV),
+            kolumny=["id"],
+            warunek={"is_active": "False"},
+        )
+        assert result == [{"id": "2"}]
+
+    def test_filtered_rows_still_validated(self) -> None:
+        csv_ = "id,name\n1,Alice\n2,\n"
+        with pytest.raises(CSVParsingError, match=r"name w wierszu 3"):
+            parse_csv(io.StringIO(csv_), warunek={"id": "1"})
+
+    def test_where_unknown_column(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Nieznana kolumna w warunku"):
+            parse_csv(io.StringIO(self.CSV), warunek={"salary": "1"})
+
+    def test_where_unknown_operator(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"Nieznany operator"):
+            parse_csv(io.StringIO(self.CSV), warunek=[("age", "~", 1)])
+
+
+
+# Paczki wierszy
+
+
+
+class TestCSVParserBatches:
+    """iter_csv_batches – paczki stałego rozmiaru z zakresem wierszy."""
+
+    CSV = "id,name\n" + "".join(f"{i},User{i}\n" for i in range(1, 8))
+
+    def test_batches_rows_layout(self) -> None:
+        paczki = list(iter_csv_batches(io.StringIO(self.CSV), rozmiar_paczki=3))
+        assert [len(p.dane) for p in paczki] == [3, 3, 1]
+        assert paczki[0].dane[0] == ("1", "User1")
+        assert paczki[0].naglowki == ["id", "name"]
+        assert [(p.pierwszy_wiersz, p.ostatni_wiersz) for p in paczki] == [
+            (2, 4),
+            (5, 7),
+            (8, 8),
+        ]
+
+    def test_batches_columns_layout(self) -> None:
+        paczki = list(
+            iter_csv_batches(
+                io.StringIO(self.CSV),
+                rozmiar_paczki=4,
+                uklad="kolumny",
+                kolumny=["name"],
+            )
+        )
+        assert paczki[0].dane == (("User1", "User2", "User3", "User4"),)
+        assert paczki[1].naglowki == ["name"]
+
+    def test_batches_error_after_earlier_batches(self) -> None:
+        csv_ = "id,name\n1,a\n2,b\n3,\n"
+        paczki = iter_csv_batches(io.StringIO(csv_), rozmiar_paczki=2)
+        assert next(paczki).ostatni_wiersz == 3
+        with pytest.raises(CSVParsingError, match=r"w wierszu 4"):
+            next(paczki)
+
+    def test_batches_from_path(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text(self.CSV, encoding="utf-8")
+        paczki = list(iter_csv_batches(str(path), rozmiar_paczki=10))
+        assert len(paczki) == 1 and len(paczki[0].dane) == 7
+
+    def test_batches_invalid_arguments(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"rozmiar_paczki"):
+            list(iter_csv_batches(io.StringIO(self.CSV), rozmiar_paczki=0))
+        with pytest.raises(CSVParsingError, match=r"Nieznany uklad"):
+            list(iter_csv_batches(io.StringIO(self.CSV), uklad="dict"))
+
+
+
+# API asyncio
+
+
+
+class TestCSVParserAsync:
+    """aiter_csv / aparse_csv_file – parsowanie poza pętlą zdarzeń."""
+
+    def test_aparse_matches_sync(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv")
+        wynik = asyncio.run(aparse_csv_file(sciezka, rozmiar_paczki=100))
+        assert wynik == parse_csv_file(sciezka)
+
+    def test_aiter_runs_off_loop_thread(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        watki = []
+
+        def warunek(row):
+            watki.append(threading.get_ident())
+            return True
+
+        async def main():
+            return [w async for w in aiter_csv(str(path), warunek=warunek)]
+
+        assert asyncio.run(main()) == [{"id": "1", "name": "Alice"}]
+        assert threading.main_thread().ident not in watki
+
+    def test_aiter_propagates_errors(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n2,\n", encoding="utf-8")
+
+        async def main():
+            return [w async for w in aiter_csv(str(path))]
+
+        with pytest.raises(CSVParsingError, match=r"w wierszu 3"):
+            asyncio.run(main())
+
+    def test_aiter_early_exit_stops_reading(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv")
+        przeczytane = []
+
+        def warunek(row):
+            przeczytane.append(row)
+            return True
+
+        async def main():
+            wiersze = aiter_csv(sciezka, rozmiar_paczki=10, warunek=warunek)
+            async for wiersz in wiersze:
+                break
+            await wiersze.aclose()
+            await asyncio.sleep(0.05)
+
+        asyncio.run(main())
+        assert len(przeczytane) <= 20
+
+    def test_aparse_cancellation(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv")
+
+        async def main():
+            zadanie = asyncio.create_task(
+                aparse_csv_file(sciezka, rozmiar_paczki=10)
+            )
+            await asyncio.sleep(0)
+            zadanie.cancel()
+            await zadanie
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(main())
+
+
+# Statystyki etapów parsowania
+
+
+class TestCSVParserStats:
+    def test_counters_and_stages(self) -> None:
+        st = {}
+        tekst = "id,name,age\n1,Alice,30\n2,Bob,17\n3,Ewa,45\n"
+        data = parse_csv(
+            io.StringIO(tekst),
+            warunek=[("age", ">=", 18)],
+            statystyki=st,
+        )
+        assert len(data) == 2
+        assert st["linie"] == 4
+        assert st["znaki"] == len(tekst)
+        assert st["wiersze"] == 3
+        assert st["wiersze_zwrocone"] == 2
+        assert st["reguly"]["odfiltrowane"] == 1
+        assert set(st["czasy_s"]) == {
+            "naglowek", "parsowanie", "walidacja",
+            "filtrowanie", "budowanie", "razem",
+        }
+        assert all(t >= 0 for t in st["czasy_s"].values())
+        assert st["czasy_s"]["razem"] >= st["czasy_s"]["budowanie"]
+
+    def test_rule_hits_in_collect_mode(self) -> None:
+        st = {}
+        with pytest.raises(CSVErrorReport):
+            parse_csv(
+                io.StringIO("id,name\n1,\n\n3,a,b\n4,d\n"),
+                bledy="collect",
+                statystyki=st,
+            )
+        assert st["reguly"]["pusta_linia"] == 1
+        assert st["reguly"]["brak_wartosci"] == 1
+        assert st["reguly"]["dodatkowe_kolumny"] == 1
+        assert st["wiersze"] == 3
+
+    def test_stats_filled_on_error(self) -> None:
+        st = {}
+        with pytest.raises(CSVParsingError, match=r"Dodatkowe kolumny"):
+            parse_csv(io.StringIO("id\n1\n2,3\n"), statystyki=st)
+        assert st["reguly"]["dodatkowe_kolumny"] == 1
+        assert st["czasy_s"]["razem"] > 0
+
+    def test_stats_reset_between_calls(self) -> None:
+        st = {}
+        parse_csv(io.StringIO("id\n1\n2\n"), statystyki=st)
+        parse_csv(io.StringIO("id\n1\n"), statystyki=st)
+        assert st["wiersze"] == 1
+
+    def test_file_stats_and_cache_hit(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        csv_cache_clear()
+        st = {}
+        parse_csv_file(str(path), pamiec_podreczna=True, statystyki=st)
+        assert st["bajty"] == path.stat().st_size
+        parse_csv_file(str(path), pamiec_podreczna=True, statystyki=st)
+        assert st["z_pamieci_podrecznej"] is True
+        assert st["wiersze_zwrocone"] == 1
+        csv_cache_clear()
+
+    def test_iter_csv_stats_after_exhaustion(self) -> None:
+        st = {}
+        wiersze = iter_csv(io.StringIO("id\n1\n2\n"), statystyki=st)
+        assert len(list(wiersze)) == 2
+        assert st["wiersze_zwrocone"] == 2
+
+
+# Walidacja bez budowania wierszy
+
+
+_NIEPOPRAWNE_CSV = [
+    ("", None),
+    ("1,2\n3,4\n", None),
+    ("id,1name\n1,a\n", None),
+    ("id,id\n1,2\n", None),
+    ("id,name\n1,Alice\n", ["email"]),
+    ("id,name\n1,Alice\n\n2,Bob\n", None),
+    ("id,name\n1,Alice,x\n", None),
+    ("id,name\n1,\n", ["id", "name"]),
+    ("id,name\n1\n", None),
+]
+
+
+class TestCSVParserValidate:
+    def test_valid_file_summary(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n2,Bob\n", encoding="utf-8")
+        wynik = validate_csv(str(path))
+        assert wynik.poprawny is True
+        assert wynik.wiersze == 2
+        assert wynik.bledy == []
+        assert wynik.bajty == path.stat().st_size
+
+    @pytest.mark.parametrize(("tekst", "wymagane"), _NIEPOPRAWNE_CSV)
+    def test_same_first_error_as_parse_csv(self, tekst, wymagane) -> None:
+        with pytest.raises(CSVParsingError) as exc:
+            parse_csv(io.StringIO(tekst), wymagane)
+        wynik = validate_csv(io.StringIO(tekst), wymagane)
+        assert wynik.poprawny is False
+        assert [k for _, k in wynik.bledy] == [str(exc.value)]
+        assert wynik.bajty is None
+
+    def test_short_row_with_required_fields_is_valid(self) -> None:
+        wynik = validate_csv(
+            io.StringIO("id,name,age\n1,Alice\n"), ["id", "name"]
+        )
+        assert wynik.poprawny is True
+        assert wynik.wiersze == 1
+
+    def test_stops_at_first_error(self) -> None:
+        wynik = validate_csv(io.StringIO("id\n1\n\n2\n3,4\n5\n"))
+        assert wynik.bledy == [(3, "Pusta linia wykryta w wierszu 3.")]
+        assert wynik.wiersze == 1
+
+    def test_all_errors_match_collect_mode(self) -> None:
+        tekst = "id,name\n1,\n\n3,a,b\n4,d\n5,e\n"
+        with pytest.raises(CSVErrorReport) as exc:
+            parse_csv(io.StringIO(tekst), bledy="collect")
+        wynik = validate_csv(io.StringIO(tekst), wszystkie_bledy=True)
+        assert wynik.bledy == exc.value.bledy
+        assert wynik.wiersze == 2
+
+    def test_max_errors_limit(self) -> None:
+        wynik = validate_csv(
+            io.StringIO("id\n\n\n\n1\n"),
+            wszystkie_bledy=True,
+            max_bledow=2,
+        )
+        assert len(wynik.bledy) == 2
+
+    def test_required_fields_only(self) -> None:
+        wynik = validate_csv(io.StringIO("id,name\n1, \n"), ["id"])
+        assert wynik.poprawny is True
+        wynik = validate_csv(io.StringIO("id,name\n1, \n"), ["name"])
+        assert wynik.bledy == [
+            (2, "Brak wartości w polach: name w wierszu 2.")
+        ]
+
+    def test_no_required_fields(self) -> None:
+        wynik = validate_csv(io.StringIO("id,name\n,\n"), [])
+        assert wynik.poprawny is True
+
+    def test_header_error_has_no_row_number(self) -> None:
+        wynik = validate_csv(io.StringIO("id,name\n"), ["email"])
+        assert wynik.bledy == [
+            (None, "Brakujące pola w nagłówku: email.")
+        ]
+
+
+# Wznawianie wczytywania plików dopisywanych
+
+
+class TestCSVParserAppended:
+    def test_returns_only_new_rows(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        assert parse_csv_appended(str(path)) == [{"id": "1", "name": "Alice"}]
+        assert parse_csv_appended(str(path)) == []
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("2,Bob\n3,Ewa\n")
+        assert parse_csv_appended(str(path)) == [
+            {"id": "2", "name": "Bob"},
+            {"id": "3", "name": "Ewa"},
+        ]
+        assert (tmp_path / "dane.csv.ckpt").exists()
+
+    def test_incomplete_last_record_waits(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text('id,name\n1,Alice\n2,"Bo', encoding="utf-8")
+        assert parse_csv_appended(str(path)) == [{"id": "1", "name": "Alice"}]
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('b\nJr"\n3,Ewa')
+        assert parse_csv_appended(str(path)) == [
+            {"id": "2", "name": "Bob\nJr"}
+        ]
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n")
+        assert parse_csv_appended(str(path)) == [{"id": "3", "name": "Ewa"}]
+
+    def test_literal_quote_in_unquoted_field(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text('id,name\n1,a\n2,TV 32"\n3,c\n', encoding="utf-8")
+        assert parse_csv_appended(str(path)) == parse_csv_file(str(path))
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("4,d\n")
+        assert parse_csv_appended(str(path)) == [{"id": "4", "name": "d"}]
+
+    def test_error_numbers_match_full_parse(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text('id,name\n1,"a\nb"\n', encoding="utf-8")
+        parse_csv_appended(str(path))
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("2,Bob\n\n3,Ewa\n")
+        with pytest.raises(CSVParsingError) as pelne:
+            parse_csv_file(str(path))
+        with pytest.raises(CSVParsingError) as wznowione:
+            parse_csv_appended(str(path))
+        assert str(wznowione.value) == str(pelne.value)
+
+    def test_checkpoint_not_advanced_on_error(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        parse_csv_appended(str(path))
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("2,\n")
+        for _ in range(2):
+            with pytest.raises(CSVParsingError, match=r"w wierszu 3"):
+                parse_csv_appended(str(path))
+
+    def test_truncated_file_is_read_again(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n2,Bob\n", encoding="utf-8")
+        parse_csv_appended(str(path))
+
+        path.write_text("id,name\n7,Ola\n", encoding="utf-8")
+        assert parse_csv_appended(str(path)) == [{"id": "7", "name": "Ola"}]
+
+    def test_rewritten_file_is_read_again(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        parse_csv_appended(str(path))
+
+        path.write_text("id,name\n2,Bobby\n3,Ewa\n", encoding="utf-8")
+        assert len(parse_csv_appended(str(path))) == 2
+
+    def test_changed_header_is_read_again(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        parse_csv_appended(str(path))
+
+        path.write_text("id,imie\n1,Alice\n2,Bob\n", encoding="utf-8")
+        assert parse_csv_appended(str(path)) == [
+            {"id": "1", "imie": "Alice"},
+            {"id": "2", "imie": "Bob"},
+        ]
+
+    def test_custom_checkpoint_path_and_row_type(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        punkt = tmp_path / "stan.ckpt"
+        path.write_text("id,name,age\n1,Alice\n", encoding="utf-8")
+        wiersze = parse_csv_appended(
+            str(path),
+            ["id", "name"],
+            typ_wiersza="tuple",
+            punkt_kontrolny=str(punkt),
+        )
+        assert wiersze[0] == ("1", "Alice", None)
+        assert punkt.exists()
+        assert not (tmp_path / "dane.csv.ckpt").exists()
+
+    def test_header_errors(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("", encoding="utf-8")
+        with pytest.raises(CSVParsingError, match=r"Brak wiersza nagłówka"):
+            parse_csv_appended(str(path))
+
+
+# Unikalność wartości w kolumnach
+
+
+class TestCSVParserUnique:
+    def test_duplicate_reports_both_rows(self) -> None:
+        with pytest.raises(
+            CSVParsingError,
+            match=r"Zduplikowana wartość id='1' w wierszu 4 "
+                  r"\(pierwsze wystąpienie w wierszu 2\)",
+        ):
+            parse_csv(
+                io.StringIO("id,name\n1,Alice\n2,Bob\n1,Ewa\n"),
+                unikalne_pola=["id"],
+            )
+
+    def test_composite_key(self) -> None:
+        tekst = "id,kraj\n1,PL\n1,DE\n2,PL\n"
+        wiersze = parse_csv(io.StringIO(tekst), unikalne_pola=["id", "kraj"])
+        assert len(wiersze) == 3
+        with pytest.raises(CSVParsingError, match=r"kraj='PL' w wierszu 4"):
+            parse_csv(io.StringIO(tekst), unikalne_pola=["kraj"])
+
+    def test_streaming_yields_rows_before_duplicate(self) -> None:
+        wiersze = iter_csv(
+            io.StringIO("id\n1\n2\n1\n"), unikalne_pola=["id"]
+        )
+        assert next(wiersze) == {"id": "1"}
+        assert next(wiersze) == {"id": "2"}
+        with pytest.raises(CSVParsingError, match=r"w wierszu 4"):
+            next(wiersze)
+
+    def test_collect_mode_skips_duplicates(self) -> None:
+        with pytest.raises(CSVErrorReport) as exc:
+            parse_csv(
+                io.StringIO("id,name\n1,a\n\n1,b\n2,\n2,c\n"),
+                bledy="collect",
+                unikalne_pola=["id"],
+            )
+        assert [nr for nr, _ in exc.value.bledy] == [3, 4, 5]
+        assert "pierwsze wystąpienie w wierszu 2" in exc.value.bledy[1][1]
+
+    def test_spills_over_memory_limit(self) -> None:
+        tekst = "id\n" + "".join(f"{i}\n" for i in range(5000))
+        assert len(
+            parse_csv(
+                io.StringIO(tekst), unikalne_pola=["id"], limit_unikalnych=4096
+            )
+        ) == 5000
+
+        with pytest.raises(
+            CSVParsingError,
+            match=r"id='17' w wierszu 5002 "
+                  r"\(pierwsze wystąpienie w wierszu 19\)",
+        ):
+            parse_csv(
+                io.StringIO(tekst + "17\n"),
+                unikalne_pola=["id"],
+                limit_unikalnych=4096,
+            )
+
+    def test_hash_set_finds_spilled_entries(self) -> None:
+        zbior = parser_csv._ZbiorSkrotow(4096)
+        skroty = range(1, 20_000 * 7919, 7919)
+        for nr, skrot in enumerate(skroty, start=2):
+            assert zbior.dodaj(skrot, nr) == 0
+        assert zbior._zrzuty
+        for nr, skrot in enumerate(skroty, start=2):
+            assert zbior.dodaj(skrot, 0) == nr
+        zbior.zamknij()
+
+    def test_spill_stays_within_memory_limit(self) -> None:
+        limit = 1 << 20
+        tracemalloc.start()
+        try:
+            zbior = parser_csv._ZbiorSkrotow(limit)
+            for nr, skrot in enumerate(range(1, 50_000 * 7919, 7919), 2):
+                zbior.dodaj(skrot, nr)
+            _, szczyt = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(zbior._zrzuty) == 1
+        assert zbior.dodaj(7920, 0) == 3
+        zbior.zamknij()
+        assert szczyt <= limit
+
+    def test_unknown_field(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"w nagłówku: x"):
+            parse_csv(io.StringIO("id\n1\n"), unikalne_pola=["x"])
+
+    def test_short_row_and_projection(self) -> None:
+        wiersze = parse_csv(
+            io.StringIO("id,name,email\n1,a\n2,b,b@x.pl\n"),
+            ["id"],
+            kolumny=["name"],
+            unikalne_pola=["email"],
+        )
+        assert wiersze == [{"name": "a"}, {"name": "b"}]
+
+    def test_duplicate_counted_in_stats(self) -> None:
+        st = {}
+        with pytest.raises(CSVErrorReport):
+            parse_csv(
+                io.StringIO("id\n1\n1\n1\n"),
+                bledy="collect",
+                unikalne_pola=["id"],
+                statystyki=st,
+            )
+        assert st["reguly"]["duplikaty"] == 2
+
+    def test_cache_key_includes_unique_fields(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id\n1\n1\n", encoding="utf-8")
+        csv_cache_clear()
+        assert len(parse_csv_file(str(path), pamiec_podreczna=True)) == 2
+        with pytest.raises(CSVParsingError, match=r"Zduplikowana"):
+            parse_csv_file(
+                str(path), pamiec_podreczna=True, unikalne_pola=["id"]
+            )
+        csv_cache_clear()
+
+
+# Migawka kolumnowa wyniku
+
+
+class TestCSVParserSnapshot:
+    @staticmethod
+    def _zablokuj_parsowanie(monkeypatch) -> None:
+        def nie_parsuj(*_, **__):
+            raise AssertionError("plik CSV nie powinien być parsowany")
+
+        monkeypatch.setattr(parser_csv, "parse_csv", nie_parsuj)
+
+    @pytest.mark.parametrize("typ_wiersza", ["dict", "tuple", "slots"])
+    def test_round_trip(self, tmp_path, monkeypatch, typ_wiersza) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text(
+            "id,miasto,opis\n1,Kraków,\"a\nb\"\n2,Kraków\n3,Łódź,x\0y\n",
+            encoding="utf-8",
+        )
+        migawka = str(tmp_path / "dane.mig")
+        oczekiwane = parse_csv_file(
+            str(path), ["id"], typ_wiersza=typ_wiersza
+        )
+        zapisane = parse_csv_file(
+            str(path), ["id"], typ_wiersza=typ_wiersza, migawka=migawka
+        )
+
+        self._zablokuj_parsowanie(monkeypatch)
+        wczytane = parse_csv_file(
+            str(path), ["id"], typ_wiersza=typ_wiersza, migawka=migawka
+        )
+        def wartosci(w):
+            return list(w.values()) if isinstance(w, dict) else list(w)
+
+        assert list(map(wartosci, wczytane)) == list(map(wartosci, oczekiwane))
+        assert len(zapisane) == 3
+        assert type(wczytane[0]).__name__ == type(oczekiwane[0]).__name__
+
+    def test_dict_rows_equal(self, tmp_path, monkeypatch) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv")
+        migawka = str(tmp_path / "dane.mig")
+        oczekiwane = parse_csv_file(sciezka, migawka=migawka)
+        self._zablokuj_parsowanie(monkeypatch)
+        assert parse_csv_file(sciezka, migawka=migawka) == oczekiwane
+
+    def test_header_only_file(self, tmp_path, monkeypatch) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n", encoding="utf-8")
+        migawka = str(tmp_path / "dane.mig")
+        assert parse_csv_file(str(path), migawka=migawka) == []
+        self._zablokuj_parsowanie(monkeypatch)
+        assert parse_csv_file(str(path), migawka=migawka) == []
+
+    def test_invalidated_when_source_changes(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id\n1\n", encoding="utf-8")
+        migawka = str(tmp_path / "dane.mig")
+        parse_csv_file(str(path), migawka=migawka)
+
+        path.write_text("id\n2\n3\n", encoding="utf-8")
+        assert parse_csv_file(str(path), migawka=migawka) == [
+            {"id": "2"},
+            {"id": "3"},
+        ]
+
+    def test_invalidated_when_options_change(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+        migawka = str(tmp_path / "dane.mig")
+        parse_csv_file(str(path), migawka=migawka)
+        assert parse_csv_file(
+            str(path), kolumny=["name"], migawka=migawka
+        ) == [{"name": "Alice"}]
+
+    def test_callable_condition_skips_snapshot(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,Alice\n2,Bob\n", encoding="utf-8")
+        migawka = tmp_path / "dane.mig"
+        wynik = parse_csv_file(
+            str(path), warunek=lambda row: row[0] == "2", migawka=str(migawka)
+        )
+        assert wynik == [{"id": "2", "name": "Bob"}]
+        assert not migawka.exists()
+
+    def test_invalid_source_writes_no_snapshot(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,name\n1,\n", encoding="utf-8")
+        migawka = tmp_path / "dane.mig"
+        with pytest.raises(CSVParsingError):
+            parse_csv_file(str(path), migawka=str(migawka))
+        assert not migawka.exists()
+
+    @pytest.mark.parametrize("zawartosc", [b"", b"CSVMIG00" + bytes(40)])
+    def test_broken_snapshot_is_rebuilt(self, tmp_path, zawartosc) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id\n1\n", encoding="utf-8")
+        migawka = tmp_path / "dane.mig"
+        migawka.write_bytes(zawartosc)
+        assert parse_csv_file(str(path), migawka=str(migawka)) == [
+            {"id": "1"}
+        ]
+        assert migawka.read_bytes().startswith(b"CSVMIG01")
+
+    def test_truncated_snapshot_is_rebuilt(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text(
+            "id,miasto\n"
+            + "".join(f"{i},{'ABC'[i % 3]}\n" for i in range(100)),
+            encoding="utf-8",
+        )
+        migawka = tmp_path / "dane.mig"
+        oczekiwane = parse_csv_file(str(path), migawka=str(migawka))
+        pelna = migawka.read_bytes()
+        for koniec in range(1, len(pelna)):
+            migawka.write_bytes(pelna[:koniec])
+            assert parse_csv_file(str(path), migawka=str(migawka)) == (
+                oczekiwane
+            )
+        migawka.write_bytes(pelna + b"\0")
+        assert parse_csv_file(str(path), migawka=str(migawka)) == oczekiwane
+
+    def test_stats_mark_snapshot_load(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id\n1\n2\n", encoding="utf-8")
+        migawka = str(tmp_path / "dane.mig")
+        parse_csv_file(str(path), migawka=migawka)
+        st = {}
+        parse_csv_file(str(path), migawka=migawka, statystyki=st)
+        assert st["z_migawki"] is True
+        assert st["wiersze_zwrocone"] == 2
+
+
+# Internowanie powtarzalnych wartości
+
+
+class TestCSVParserIntern:
+    _DANE = (
+        "id,miasto,aktywny\n"
+        "1,Kraków,True\n"
+        "2,Kraków,False\n"
+        "3,Gdańsk,True\n"
+    )
+
+    def test_chosen_columns_share_objects(self) -> None:
+        wiersze = parse_csv(io.StringIO(self._DANE), internuj=["miasto"])
+        assert wiersze == parse_csv(io.StringIO(self._DANE))
+        assert wiersze[0]["miasto"] is wiersze[1]["miasto"]
+        assert wiersze[0]["aktywny"] is not wiersze[2]["aktywny"]
+
+    def test_all_columns_below_threshold(self, monkeypatch) -> None:
+        monkeypatch.setattr(parser_csv, "_PROG_INTERNOWANIA", 2)
+        wiersze = parse_csv(
+            io.StringIO(self._DANE + "40,Kraków,True\n40,Kraków,True\n"),
+            internuj=True,
+        )
+        assert wiersze[0]["miasto"] is wiersze[4]["miasto"]
+        assert wiersze[0]["aktywny"] is wiersze[4]["aktywny"]
+        # kolumna id przekroczyła próg – wartości nie są już współdzielone
+        assert wiersze[3]["id"] is not wiersze[4]["id"]
+
+    def test_with_projection_and_row_types(self) -> None:
+        wiersze = parse_csv(
+            io.StringIO(self._DANE),
+            typ_wiersza="tuple",
+            kolumny=["miasto"],
+            internuj=["miasto"],
+        )
+        assert wiersze[0].miasto is wiersze[1].miasto
+
+    def test_short_rows(self) -> None:
+        wiersze = parse_csv(
+            io.StringIO("id,miasto\n1\n2,Kraków\n3,Kraków\n"),
+            ["id"],
+            internuj=["miasto"],
+        )
+        assert wiersze[0] == {"id": "1", "miasto": None}
+        assert wiersze[1]["miasto"] is wiersze[2]["miasto"]
+
+    def test_unknown_column(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"w nagłówku: kraj"):
+            parse_csv(io.StringIO(self._DANE), internuj=["kraj"])
+
+
+# Profil kolumn
+
+
+class TestCSVParserProfile:
+    def test_small_file_profile(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text(
+            "id,miasto,wiek\n"
+            "1,Kraków,30\n"
+            "2,Kraków,\n"
+            "3,Gdańsk,4.5\n"
+            "4,Kraków, \n",
+            encoding="utf-8",
+        )
+        profil = profile_csv(str(path), ["id", "miasto"], top_k=1)
+        assert profil["wiersze"] == 4
+
+        miasto = profil["kolumny"]["miasto"]
+        assert miasto["typ"] == "tekst"
+        assert (miasto["min"], miasto["max"]) == ("Gdańsk", "Kraków")
+        assert miasto["unikalne_szac"] == 2
+        assert miasto["najczestsze"] == [("Kraków", 3)]
+
+        wiek = profil["kolumny"]["wiek"]
+        assert (wiek["puste"], wiek["niepuste"]) == (2, 2)
+        assert wiek["typ"] == "liczba"
+        assert (wiek["min"], wiek["max"]) == (4.5, 30.0)
+
+    def test_empty_column_is_text(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text("id,uwagi\n1,\n2\n", encoding="utf-8")
+        uwagi = profile_csv(str(path), ["id"])["kolumny"]["uwagi"]
+        assert uwagi["puste"] == 2
+        assert uwagi["typ"] == "tekst"
+        assert uwagi["min"] is None
+        assert uwagi["najczestsze"] == []
+
+    def test_distinct_estimate_accuracy(self) -> None:
+        hll = parser_csv._HyperLogLog()
+        for i in range(20_000):
+            hll.dodaj(f"wartosc-{i}")
+        assert abs(hll.szacuj() - 20_000) < 20_000 * 0.05
+
+    def test_sketch_merge_matches_single_pass(self) -> None:
+        caly = parser_csv._ProfilKolumny(4)
+        czesci = [parser_csv._ProfilKolumny(4) for _ in range(2)]
+        wartosci = [str(i % 3) if i % 2 else str(i) for i in range(400)]
+        caly.dodaj_paczke(wartosci)
+        czesci[0].dodaj_paczke(wartosci[:150])
+        czesci[1].dodaj_paczke(wartosci[150:])
+        czesci[0].scal(czesci[1])
+
+        scalony, pojedynczy = czesci[0].wynik(2), caly.wynik(2)
+        najczestsze = scalony.pop("najczestsze")
+        pojedynczy.pop("najczestsze")
+        assert scalony == pojedynczy
+        # liczności Misra-Gries są dolnym oszacowaniem (prawdziwe: 67, 66)
+        assert {w for w, _ in najczestsze} == {"0", "1"}
+        assert all(n <= 67 for _, n in najczestsze)
+
+    def test_heavy_hitter_found_in_noise(self) -> None:
+        profil = parser_csv._ProfilKolumny(10)
+        wartosci = [
+            "popularna" if i % 4 == 0 else f"rzadka-{i}"
+            for i in range(20_000)
+        ]
+        for start in range(0, len(wartosci), 1000):
+            profil.dodaj_paczke(wartosci[start:start + 1000])
+        (wartosc, licznosc), = profil.wynik(1)["najczestsze"]
+        assert wartosc == "popularna"
+        assert 4000 <= licznosc <= 5000
+
+    def test_parallel_matches_sequential(self, tmp_path) -> None:
+        sciezka = _zapisz_duzy_csv(tmp_path / "dane.csv")
+        rownolegly = profile_csv(sciezka, procesy=2)
+        sekwencyjny = profile_csv(sciezka)
+        for profil in (rownolegly, sekwencyjny):
+            komentarz = profil["kolumny"]["comment"]
+            assert komentarz["najczestsze"][0][0] == 'wiele\nlinii, "cytat"'
+            for kolumna in profil["kolumny"].values():
+                del kolumna["najczestsze"]
+        assert rownolegly == sekwencyjny
+
+    @pytest.mark.parametrize("procesy", [None, 2])
+    def test_invalid_row_number(self, tmp_path, procesy) -> None:
+        sciezka = _zapisz_duzy_csv(
+            tmp_path / "dane.csv", wstawka="9999,,x\n", po_wierszu=2500
+        )
+        with pytest.raises(CSVParsingError) as pelne:
+            parse_csv_file(sciezka)
+        with pytest.raises(CSVParsingError) as profil:
+            profile_csv(sciezka, procesy=procesy)
+        assert str(profil.value) == str(pelne.value)
+
+
+# Wiele plików naraz
+
+
+class TestCSVParserManyFiles:
+    @staticmethod
+    def _pliki(tmp_path):
+        tresci = {
+            "a.csv": "id,name\n1,Alice\n2,Bob\n",
+            "zly.csv": "id,name\n1,\n",
+            "b.csv": "id,name\n3,Ewa\n",
+        }
+        sciezki = []
+        for nazwa, tresc in tresci.items():
+            (tmp_path / nazwa).write_text(tresc, encoding="utf-8")
+            sciezki.append(str(tmp_path / nazwa))
+        sciezki.append(str(tmp_path / "brak.csv"))
+        return sciezki
+
+    @pytest.mark.parametrize("procesy", [1, 2])
+    def test_errors_do_not_stop_batch(self, tmp_path, procesy) -> None:
+        sciezki = self._pliki(tmp_path)
+        wyniki = {
+            w.sciezka: w
+            for w in parse_csv_files(sciezki, procesy=procesy)
+        }
+        assert set(wyniki) == set(sciezki)
+        assert wyniki[sciezki[0]].dane == parse_csv_file(sciezki[0])
+        assert wyniki[sciezki[0]].blad is None
+        assert isinstance(wyniki[sciezki[1]].blad, CSVParsingError)
+        assert "w wierszu 2" in str(wyniki[sciezki[1]].blad)
+        assert wyniki[sciezki[1]].dane is None
+        assert isinstance(wyniki[sciezki[3]].blad, FileNotFoundError)
+
+        (tmp_path / "atrybuty.csv").write_text("id,na$me\n1,x\n")
+        sciezki.append(str(tmp_path / "atrybuty.csv"))
+        wyniki = {
+            w.sciezka: w
+            for w in parse_csv_files(
+                sciezki, typ_wiersza="slots", procesy=procesy
+            )
+        }
+        assert set(wyniki) == set(sciezki)
+        assert wyniki[sciezki[0]].dane[1].name == "Bob"
+        assert isinstance(wyniki[sciezki[4]].blad, CSVParsingError)
+        assert "na$me nie mogą być atrybutami" in str(wyniki[sciezki[4]].blad)
+        assert wyniki[sciezki[4]].dane is None
+
+    def test_input_order(self, tmp_path) -> None:
+        sciezki = self._pliki(tmp_path)
+        wyniki = parse_csv_files(sciezki, procesy=2, w_kolejnosci=True)
+        assert [w.sciezka for w in wyniki] == sciezki
+
+    def test_row_type_and_options(self, tmp_path) -> None:
+        sciezki = self._pliki(tmp_path)[::2]
+        wyniki = list(
+            parse_csv_files(
+                sciezki,
+                ["id"],
+                typ_wiersza="tuple",
+                procesy=2,
+                w_kolejnosci=True,
+                kolumny=["name"],
+            )
+        )
+        assert [tuple(w) for w in wyniki[0].dane] == [("Alice",), ("Bob",)]
+        assert wyniki[1].dane[0].name == "Ewa"
+
+    def test_aggregate_stats(self, tmp_path) -> None:
+        sciezki = self._pliki(tmp_path)
+        st = {}
+        for _ in parse_csv_files(sciezki, procesy=2, statystyki=st):
+            pass
+        assert st["pliki"] == 4
+        assert st["bledne"] == 2
+        assert st["wiersze"] == 3
+        assert st["bajty"] == sum(
+            os.path.getsize(p) for p in sciezki[:3]
+        )
+        assert st["wiersze_na_s"] > 0
+
+    def test_early_exit(self, tmp_path) -> None:
+        sciezki = self._pliki(tmp_path)
+        wyniki = parse_csv_files(sciezki, procesy=2, w_kolejnosci=True)
+        assert next(wyniki).sciezka == sciezki[0]
+        wyniki.close()
+
+    @pytest.mark.parametrize(
+        "opcja", [{"limit_pamieci": 1000}, {"pamiec_podreczna": True}]
+    )
+    def test_unsupported_options(self, tmp_path, opcja) -> None:
+        sciezki = self._pliki(tmp_path)
+        with pytest.raises(CSVParsingError, match="nie obsługuje opcji"):
+            list(parse_csv_files(sciezki, procesy=2, **opcja))
+
+
+# Wiersze ponad limit pamięci
+
+
+class TestCSVParserMemoryLimit:
+    _DANE = "id,name\n" + "".join(f"{i},User{i}\n" for i in range(2500))
+
+    def test_small_result_stays_a_list(self) -> None:
+        wiersze = parse_csv(io.StringIO(self._DANE), limit_pamieci=1 << 30)
+        assert isinstance(wiersze, list)
+        assert len(wiersze) == 2500
+
+    @pytest.mark.parametrize("typ_wiersza", ["dict", "tuple", "slots"])
+    def test_spilled_rows_behave_like_list(self, typ_wiersza) -> None:
+        oczekiwane = parse_csv(io.StringIO(self._DANE), typ_wiersza="dict")
+        with parse_csv(
+            io.StringIO(self._DANE),
+            typ_wiersza=typ_wiersza,
+            limit_pamieci=50_000,
+        ) as wiersze:
+            assert isinstance(wiersze, CSVRows)
+            assert len(wiersze) == 2500
+
+            def jako_dict(w):
+                return w if isinstance(w, dict) else w._asdict()
+
+            assert [jako_dict(w) for w in wiersze] == oczekiwane
+            assert jako_dict(wiersze[1234]) == oczekiwane[1234]
+            assert jako_dict(wiersze[-1]) == oczekiwane[-1]
+            wycinek = wiersze[10:13]
+            assert [jako_dict(w) for w in wycinek] == oczekiwane[10:13]
+            wycinek = wiersze[::1000]
+            assert [jako_dict(w) for w in wycinek] == oczekiwane[::1000]
+            assert wiersze[5:2] == []
+
+    def test_index_out_of_range(self) -> None:
+        wiersze = parse_csv(io.StringIO(self._DANE), limit_pamieci=1)
+        with pytest.raises(IndexError):
+            wiersze[2500]
+        with pytest.raises(IndexError):
+            wiersze[-2501]
+        wiersze.close()
+
+    def test_values_and_none_preserved(self) -> None:
+        wiersze = parse_csv(
+            io.StringIO("id,name,opis\n1,Ala\n2,Ola,\"a,b\"\n"),
+            ["id"],
+            limit_pamieci=1,
+        )
+        assert list(wiersze) == [
+            {"id": "1", "name": "Ala", "opis": None},
+            {"id": "2", "name": "Ola", "opis": "a,b"},
+        ]
+        assert {"id": "1", "name": "Ala", "opis": None} in wiersze
+
+    def test_error_while_spilling(self) -> None:
+        with pytest.raises(CSVParsingError, match=r"w wierszu 2502"):
+            parse_csv(io.StringIO(self._DANE + "x,\n"), limit_pamieci=1)
+
+    def test_file_result_not_cached(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv"
+        path.write_text(self._DANE, encoding="utf-8")
+        csv_cache_clear()
+        wiersze = parse_csv_file(
+            str(path), pamiec_podreczna=True, limit_pamieci=1
+        )
+        assert isinstance(wiersze, CSVRows)
+        assert csv_cache_info()["wpisy"] == 0
+
+
+# Ładowanie do SQLite
+
+
+class TestCSVParserSQLite:
+    _DANE = "id,name,score,joined\n" + "".join(
+        f"{i},Osoba {i},{i / 4},2024-01-{i % 28 + 1:02d}\n"
+        for i in range(1, 1001)
+    )
+
+    def _plik(self, tmp_path, dane=None) -> str:
+        path = tmp_path / "dane.csv"
+        path.write_text(self._DANE if dane is None else dane, encoding="utf-8")
+        return str(path)
+
+    def test_load_infers_types(self, tmp_path) -> None:
+        baza = str(tmp_path / "dane.db")
+        wynik = load_csv_into_sqlite(
+            self._plik(tmp_path), baza, "osoby", rozmiar_paczki=300
+        )
+        assert wynik.tabela == "osoby"
+        assert wynik.wiersze == 1000
+        assert wynik.paczki == 4
+        assert wynik.typy == {
+            "id": "INTEGER",
+            "name": "TEXT",
+            "score": "REAL",
+            "joined": "TEXT",
+        }
+        assert wynik.czas_s >= 0
+
+        with sqlite3.connect(baza) as polaczenie:
+            assert polaczenie.execute(
+                "SELECT count(*), sum(id) FROM osoby"
+            ).fetchone() == (1000, 500500)
+            assert polaczenie.execute(
+                "SELECT * FROM osoby WHERE id = 2"
+            ).fetchone() == (2, "Osoba 2", 0.5, "2024-01-03")
+            (tryb,) = polaczenie.execute("PRAGMA journal_mode").fetchone()
+        assert tryb == "delete"
+
+    def test_later_values_outside_inferred_type(self, tmp_path) -> None:
+        sciezka = self._plik(
+            tmp_path, "id,zip,ilosc\n1,10001,1_000\n2,60601,5\n3,00-001,\n"
+        )
+        polaczenie = sqlite3.connect(":memory:")
+        wynik = load_csv_into_sqlite(
+            sciezka, polaczenie, "adresy", ["id"], rozmiar_paczki=2
+        )
+        assert wynik.typy["zip"] == "INTEGER"
+        assert wynik.typy["ilosc"] == "TEXT"
+        assert polaczenie.execute(
+            "SELECT zip, ilosc FROM adresy ORDER BY id"
+        ).fetchall() == [(10001, "1_000"), (60601, "5"), ("00-001", "")]
+        polaczenie.close()
+
+    def test_leading_zeros_and_big_ids_stay_text(self, tmp_path) -> None:
+        sciezka = self._plik(
+            tmp_path,
+            "id,zip,maks\n"
+            "12345678901234567890,02134,9223372036854775807\n"
+            "2,00501,-9223372036854775808\n",
+        )
+        polaczenie = sqlite3.connect(":memory:")
+        wynik = load_csv_into_sqlite(sciezka, polaczenie, "t", ["id"])
+        assert wynik.typy == {"id": "TEXT", "zip": "TEXT", "maks": "INTEGER"}
+        assert polaczenie.execute("SELECT * FROM t").fetchall() == [
+            ("12345678901234567890", "02134", (1 << 63) - 1),
+            ("2", "00501", -(1 << 63)),
+        ]
+
+        sciezka = self._plik(tmp_path, "id\n1\n2\n12345678901234567890\n")
+        load_csv_into_sqlite(
+            sciezka, polaczenie, "t", jesli_istnieje="zastap",
+            rozmiar_paczki=2,
+        )
+        assert polaczenie.execute(
+            "SELECT typeof(id) FROM t"
+        ).fetchall() == [("integer",), ("integer",), ("real",)]
+        polaczenie.close()
+
+    def test_explicit_int_out_of_range(self, tmp_path) -> None:
+        sciezka = self._plik(tmp_path, "id\n1\n12345678901234567890\n")
+        polaczenie = sqlite3.connect(":memory:")
+        with pytest.raises(
+            CSVParsingError,
+            match=r"kolumnie id wykracza poza zakres INTEGER .*\(wiersz 3\)",
+        ):
+            load_csv_into_sqlite(
+                sciezka, polaczenie, "t", typy={"id": int}
+            )
+        assert polaczenie.execute(
+            "SELECT name FROM sqlite_master"
+        ).fetchall() == []
+        polaczenie.close()
+
+    def test_explicit_types_and_nulls(self, tmp_path) -> None:
+        sciezka = self._plik(
+            tmp_path,
+            "id,active,joined,kod\n1,true,2024-02-01,007\n2,,,\n",
+        )
+        polaczenie = sqlite3.connect(":memory:")
+        wynik = load_csv_into_sqlite(
+            sciezka,
+            polaczenie,
+            "t",
+            ["id"],
+            typy={"active": bool, "joined": "iso", "kod": str},
+        )
+        assert wynik.typy == {
+            "id": "INTEGER",
+            "active": "INTEGER",
+            "joined": "TEXT",
+            "kod": "TEXT",
+        }
+        assert polaczenie.execute("SELECT * FROM t").fetchall() == [
+            (1, 1, "2024-02-01", "007"),
+            (2, None, None, ""),
+        ]
+        assert not polaczenie.in_transaction
+        polaczenie.close()
+
+    def test_invalid_value_rolls_back(self, tmp_path) -> None:
+        sciezka = self._plik(tmp_path, self._DANE + "x,Ktoś,1.0,2024-01-01\n")
+        polaczenie = sqlite3.connect(":memory:")
+        with pytest.raises(
+            CSVParsingError,
+            match=r"'x' w kolumnie id nie jest typu int \(wiersz 1002\)",
+        ):
+            load_csv_into_sqlite(
+                sciezka,
+                polaczenie,
+                "osoby",
+                typy={"id": int},
+                rozmiar_paczki=300,
+            )
+        assert polaczenie.execute(
+            "SELECT name FROM sqlite_master"
+        ).fetchall() == []
+
+        with pytest.raises(CSVParsingError, match=r"w wierszu 3"):
+            load_csv_into_sqlite(
+                self._plik(tmp_path, "id,name\n1,a\n2,\n"),
+                polaczenie,
+                "osoby",
+                ["id", "name"],
+            )
+        assert polaczenie.execute(
+            "SELECT name FROM sqlite_master"
+        ).fetchall() == []
+        polaczenie.close()
+
+    def test_existing_table(self, tmp_path) -> None:
+        sciezka = self._plik(tmp_path)
+        polaczenie = sqlite3.connect(":memory:")
+        load_csv_into_sqlite(sciezka, polaczenie, "osoby")
+
+        with pytest.raises(CSVParsingError, match="OSOBY już istnieje"):
+            load_csv_into_sqlite(sciezka, polaczenie, "OSOBY")
+
+        load_csv_into_sqlite(
+            sciezka, polaczenie, "osoby", jesli_istnieje="dopisz"
+        )
+        assert polaczenie.execute(
+            "SELECT count(*) FROM osoby"
+        ).fetchone() == (2000,)
+
+        load_csv_into_sqlite(
+            sciezka, polaczenie, "osoby", jesli_istnieje="zastap"
+        )
+        assert polaczenie.execute(
+            "SELECT count(*) FROM osoby"
+        ).fetchone() == (1000,)
+        polaczenie.close()
+
+    def test_header_only_and_bad_options(self, tmp_path) -> None:
+        polaczenie = sqlite3.connect(":memory:")
+        wynik = load_csv_into_sqlite(
+            self._plik(tmp_path, "a,b\n"), polaczenie, "pusta"
+        )
+        assert (wynik.wiersze, wynik.paczki) == (0, 0)
+        assert wynik.typy == {"a": "TEXT", "b": "TEXT"}
+        assert polaczenie.execute("SELECT * FROM pusta").fetchall() == []
+
+        sciezka = self._plik(tmp_path)
+        with pytest.raises(CSVParsingError, match="jesli_istnieje"):
+            load_csv_into_sqlite(sciezka, polaczenie, "t", jesli_istnieje="x")
+        with pytest.raises(CSVParsingError, match="Nieobsługiwany typ"):
+            load_csv_into_sqlite(sciezka, polaczenie, "t", typy={"id": list})
+        with pytest.raises(CSVParsingError, match="nie występują"):
+            load_csv_into_sqlite(sciezka, polaczenie, "t", typy={"x": int})
+        polaczenie.close()
+
+
+# Pliki skompresowane
+
+
+class TestCSVParserCompressed:
+    _DANE = "id,name,age\n" + "".join(
+        f"{i},Osoba {i},{20 + i % 50}\n" for i in range(1, 501)
+    )
+
+    def _plik(self, tmp_path, modul, dane=None) -> str:
+        path = tmp_path / f"dane.csv.{modul.__name__}"
+        tekst = self._DANE if dane is None else dane
+        path.write_bytes(modul.compress(tekst.encode("utf-8")))
+        return str(path)
+
+    @pytest.mark.parametrize("modul", [gzip, bz2, lzma])
+    def test_file_entry_points(self, tmp_path, modul) -> None:
+        oczekiwane = parse_csv(io.StringIO(self._DANE))
+        sciezka = self._plik(tmp_path, modul)
+        assert parse_csv_file(sciezka) == oczekiwane
+        assert list(iter_csv_file(sciezka)) == oczekiwane
+        assert probe_csv_header(sciezka) == ["id", "name", "age"]
+        assert validate_csv(sciezka).wiersze == 500
+        kolumny, liczba = parse_csv_columns_file(sciezka)
+        assert (liczba, kolumny["id"][-1]) == (500, "500")
+        assert profile_csv(sciezka)["wiersze"] == 500
+
+    def test_parallel_falls_back_to_sequential(self, tmp_path) -> None:
+        sciezka = self._plik(tmp_path, gzip)
+        oczekiwane = parse_csv(io.StringIO(self._DANE))
+        assert parse_csv_file_parallel(sciezka, procesy=2) == oczekiwane
+        assert profile_csv(sciezka, procesy=2)["wiersze"] == 500
+
+    def test_error_row_numbers(self, tmp_path) -> None:
+        sciezka = self._plik(tmp_path, bz2, self._DANE + "501,,30\n")
+        with pytest.raises(CSVParsingError, match=r"w wierszu 502"):
+            parse_csv_file(sciezka)
+
+    def test_truncated_file(self, tmp_path) -> None:
+        path = tmp_path / "dane.csv.gz"
+        path.write_bytes(gzip.compress(self._DANE.encode())[:-10])
+        with pytest.raises(CSVParsingError, match="Nie można odczytać"):
+            parse_csv_file(str(path))
+
+    def test_random_access_rejected(self, tmp_path) -> None:
+        sciezka = self._plik(tmp_path, lzma)
+        with pytest.raises(CSVParsingError, match="skompresowany"):
+            build_csv_index(sciezka)
+        with pytest.raises(CSVParsingError, match="skompresowany"):
+            parse_csv_appended(sciezka)
+        assert not os.path.exists(sciezka + ".idx")
@@ -1,6 +1,6 @@
 import csv
 import re
-from typing import List, Dict, Optional, TextIO
+from typing import List, Dict, Iterable, Iterator, Optional, TextIO
 
 
 class CSVParsingError(Exception):
@@ -15,6 +15,12 @@ def parse_csv_file(file_path: str, required_fields: Optional[List[str]] = None,
         raise  # Pozwól na propagację, by test mógł złapać ten wyjątek
 
 
+def iter_csv_file(file_path: str, required_fields: Optional[List[str]] = None, delimiter: str = ',') -> Iterator[Dict[str, str]]:
+    """Streaming counterpart of parse_csv_file: rows are validated and yielded one by one."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from iter_csv(f, required_fields=required_fields, delimiter=delimiter)
+
+
 def parse_csv(
     file_obj: TextIO,
     required_fields: Optional[List[str]] = None,
@@ -29,19 +35,36 @@ def parse_csv(
     :return: List of dictionaries representing CSV rows.
     :raises CSVParsingError: If parsing fails or validation fails.
     """
+    return list(iter_csv(file_obj, required_fields=required_fields, delimiter=delimiter))
+
+
+def _check_empty_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Passes physical lines through, raising on an empty line after the header."""
+    for idx, line in enumerate(lines, start=1):
+        if not line.strip() and idx != 1:  # Skip header line
+            raise CSVParsingError(f"Empty line detected at line {idx}.")
+        yield line
+
+
+def iter_csv(
+    file_obj: TextIO,
+    required_fields: Optional[List[str]] = None,
+    delimiter: str = ','
+) -> Iterator[Dict[str, str]]:
+    """
+    Parses CSV data lazily, yielding one validated dictionary per row.
+
+    Empty lines, extra columns and missing required values are checked inline,
+    so the input is read only once and never held in memory as a whole.
+
+    :param file_obj: File-like object (or any iterable of lines) containing CSV data.
+    :param required_fields: List of required fields to validate. If None, all header fields are treated as required.
+    :param delimiter: Delimiter used in the CSV file.
+    :return: Iterator of dictionaries representing CSV rows.
+    :raises CSVParsingError: If parsing fails or validation fails.
+    """
     try:
-        # Pre-scan for empty lines if possible
-        try:
-            lines = file_obj.readlines()
-            for idx, line in enumerate(lines, start=1):
-                if not line.strip() and idx != 1:  # Skip header line
-                    raise CSVParsingError(f"Empty line detected at line {idx}.")
-            file_obj.seek(0)
-        except AttributeError:
-            # File-like object doesn't support readlines or seek; ignore pre-scan
-            pass
-
-        reader = csv.DictReader(file_obj, delimiter=delimiter, skipinitialspace=True)
+        reader = csv.DictReader(_check_empty_lines(file_obj), delimiter=delimiter, skipinitialspace=True)
 
         if not reader.fieldnames:
             raise CSVParsingError("CSV file has no header row.")
@@ -75,7 +98,6 @@ def parse_csv(
         if missing_fields:
             raise CSVParsingError(f"Missing required fields in header: {', '.join(missing_fields)}")
 
-        data = []
         for line_number, row in enumerate(reader, start=2):
             # 🛑 Check for extra columns
             if None in row:
@@ -91,9 +113,7 @@ def parse_csv(
                     f"Missing required values in fields: {', '.join(missing_values)} at line {line_number}."
                 )
 
-            data.append(row)
-
-        return data
+            yield row
 
     except UnicodeDecodeError:
         raise CSVParsingError("Unable to decode CSV file. Please check encoding.")
@@ -1,6 +1,6 @@
 import pytest
 import io
-from src.ParserCSV import parse_csv, CSVParsingError
+from src.ParserCSV import parse_csv, iter_csv, CSVParsingError
 import time
 
 
@@ -394,3 +394,19 @@ class TestCSVParserExceptions:
             parse_csv(file_obj, required_fields=["id", "name", "age"])
         msg = str(excinfo.value)
         assert "Missing required values" in msg and "line 3" in msg
+
+
+#testy strumieniowego API
+class TestCSVParserStreaming:
+
+    def test_iter_csv_validates_lazily(self):
+        """Test czy iter_csv zwraca poprawne wiersze przed błędnym."""
+        rows = iter_csv(io.StringIO("id,name\n1,Alice\n2,\n"), required_fields=["id", "name"])
+        assert next(rows)["name"] == "Alice"
+        with pytest.raises(CSVParsingError, match="line 3"):
+            next(rows)
+
+    def test_iter_csv_accepts_plain_iterator(self):
+        """Test czy iter_csv działa na iteratorze linii bez seek/readlines."""
+        rows = list(iter_csv(iter(["id,name\n", "1,Alice\n"])))
+        assert rows == [{"id": "1", "name": "Alice"}]
@@ -1,6 +1,6 @@
 import csv
 import re
-from typing import List, Dict, Optional, TextIO
+from typing import List, Dict, Iterable, Iterator, Optional, TextIO
 
 class CSVParsingError(Exception):
     """Błąd podczas parsowania CSV."""
@@ -19,23 +19,39 @@ def parse_csv_file(sciezka: str,
         # pozwalamy, by testy wychwyciły FileNotFoundError
         raise
 
+def iter_csv_file(sciezka: str,
+                  wymagane_pola: Optional[List[str]] = None,
+                  separator: str = ',') -> Iterator[Dict[str, str]]:
+    """
+    Strumieniowy odpowiednik parse_csv_file – wiersze są walidowane i zwracane po kolei.
+    """
+    with open(sciezka, 'r', encoding='utf-8') as plik:
+        yield from iter_csv(plik, wymagane_pola, separator)
+
 def parse_csv(plik: TextIO,
               wymagane_pola: Optional[List[str]] = None,
               separator: str = ',') -> List[Dict[str, str]]:
+    return list(iter_csv(plik, wymagane_pola, separator))
 
+def _linie(plik: Iterable[str]) -> Iterator[str]:
+    """
+    Przepuszcza kolejne linie pliku, zgłaszając puste linie po nagłówku.
+    """
+    for nr, linia in enumerate(plik, start=1):
+        if not linia.strip() and nr != 1:
+            raise CSVParsingError(f"Pusta linia wykryta w wierszu {nr}.")
+        yield linia
+
+def iter_csv(plik: TextIO,
+             wymagane_pola: Optional[List[str]] = None,
+             separator: str = ',') -> Iterator[Dict[str, str]]:
+    """
+    Waliduje i zwraca wiersze CSV jeden po drugim – plik czytany jest raz,
+    bez trzymania całej zawartości w pamięci.
+    """
     try:
-        # 1) Pre-skanujemy w poszukiwaniu pustych linii (po nagłówku)
-        try:
-            linie = plik.readlines()
-            for nr, linia in enumerate(linie, start=1):
-                if not linia.strip() and nr != 1:
-                    raise CSVParsingError(f"Pusta linia wykryta w wierszu {nr}.")
-            plik.seek(0)
-        except AttributeError:
-            # jeśli plik nie ma readlines/seek, pomijamy pre-skan
-            pass
-
-        czytnik = csv.DictReader(plik, delimiter=separator, skipinitialspace=True)
+        # 1) Puste linie wykrywamy w locie, bez pre-skanu readlines/seek
+        czytnik = csv.DictReader(_linie(plik), delimiter=separator, skipinitialspace=True)
         naglowki = czytnik.fieldnames
         if not naglowki:
             raise CSVParsingError("Brak wiersza nagłówka w pliku CSV.")
@@ -62,7 +78,6 @@ def parse_csv(plik: TextIO,
             raise CSVParsingError(f"Brakujące pola w nagłówku: {', '.join(brakujace)}.")
 
         # 4) Iteracja po wierszach danych
-        dane = []
         for nr, wiersz in enumerate(czytnik, start=2):
             if None in wiersz:
                 raise CSVParsingError(f"Dodatkowe kolumny w wierszu {nr}.")
@@ -71,10 +86,10 @@ def parse_csv(plik: TextIO,
             if puste:
                 raise CSVParsingError(f"Brak wartości w polach: {', '.join(puste)} w wierszu {nr}.")
 
-            dane.append(wiersz)
-
-        return dane
+            yield wiersz
 
+    except CSVParsingError:
+        raise
     except UnicodeDecodeError:
         raise CSVParsingError("Nie można odczytać pliku CSV (błąd kodowania).")
     except csv.Error as e:
@@ -1,6 +1,6 @@
 import pytest
 import io
-from src.ParserCSV import parse_csv, CSVParsingError, parse_csv_file
+from src.ParserCSV import parse_csv, iter_csv, CSVParsingError, parse_csv_file
 import time
 
 # Testy dla poprawnych danych
@@ -208,9 +208,9 @@ class TestCSVParserIOAndEdge:
         assert wynik[0]["name"] == "Alice"
 
     def test_unicode_decode_error(self):
-        # UnicodeDecodeError podczas readlines → CSVParsingError o kodowaniu
+        # UnicodeDecodeError podczas czytania → CSVParsingError o kodowaniu
         class Fake:
-            def readlines(self): raise UnicodeDecodeError("utf-8", b"", 0, 1, "err")
+            def __iter__(self): raise UnicodeDecodeError("utf-8", b"", 0, 1, "err")
         with pytest.raises(CSVParsingError, match="Nie można odczytać pliku CSV"):
             parse_csv(Fake(), wymagane_pola=["id"])
 
@@ -241,4 +241,11 @@ class TestCSVParserIOAndEdge:
         wynik = parse_csv(io.StringIO(content), wymagane_pola=["id", "name"])
         elapsed = time.time() - start
         assert elapsed < 1.0, f"Za wolno: {elapsed:.2f}s"
-        assert len(wynik) == num
\ No newline at end of file
+        assert len(wynik) == num
+
+    def test_iter_csv_streaming(self):
+        # iter_csv zwraca wiersze po kolei, błąd dopiero przy złym wierszu
+        wiersze = iter_csv(io.StringIO("id,name\n1,Alice\n\n2,Bob"), wymagane_pola=["id", "name"])
+        assert next(wiersze)["name"] == "Alice"
+        with pytest.raises(CSVParsingError, match="wierszu 3"):
+            next(wiersze)
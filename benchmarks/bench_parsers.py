@@ -0,0 +1,220 @@
+"""Benchmark parse_csv / parse_json / parse_xml we wszystkich wariantach.
+
+Każdy przypadek (wariant × format × rozmiar) uruchamiany jest w osobnym
+procesie, żeby szczytowe RSS dotyczyło tylko niego. Wynik trafia do pliku
+JSON, np.:
+
+    python benchmarks/bench_parsers.py --rozmiary 1000 100000 \\
+        --wynik wyniki.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional
+
+from generuj_dane import GENERATORY
+
+try:
+    import resource
+except ImportError:  # Windows – brak pomiaru RSS
+    resource = None
+
+KATALOG_GLOWNY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WARIANTY = ["ParserDanychFakultet", "ParserV2", "ParserV3"]
+MODULY = {"csv": "ParserCSV", "json": "ParserJson", "xml": "ParserXML"}
+
+
+def _zaladuj(wariant: str, format_: str) -> Any:
+    """Ładuje moduł parsera wariantu pod unikalną nazwą (wszystkie
+    warianty mają pakiet o tej samej nazwie ``src``). Pakiet ``src``
+    ładowany jest jako ``<wariant>_src``, żeby działały importy względne
+    między jego modułami."""
+
+    pakiet = f"{wariant}_src"
+    if pakiet not in sys.modules:
+        katalog = os.path.join(KATALOG_GLOWNY, wariant, "src")
+        spec = importlib.util.spec_from_file_location(
+            pakiet,
+            os.path.join(katalog, "__init__.py"),
+            submodule_search_locations=[katalog],
+        )
+        zaladowany = importlib.util.module_from_spec(spec)
+        sys.modules[pakiet] = zaladowany
+        spec.loader.exec_module(zaladowany)
+    return importlib.import_module(f"{pakiet}.{MODULY[format_]}")
+
+
+def _wywolanie(modul: Any, format_: str, sciezka: str) -> Callable[[], Any]:
+    """Pełna ścieżka „z pliku” z walidacją, wspólna dla wszystkich
+    wariantów (argumenty pozycyjne – nazwy różnią się między wariantami)."""
+
+    if format_ == "csv":
+        def uruchom() -> Any:
+            with open(sciezka, "r", encoding="utf-8") as plik:
+                return modul.parse_csv(plik, ["id", "name", "age"], ",")
+    elif format_ == "json":
+        def uruchom() -> Any:
+            with open(sciezka, "r", encoding="utf-8") as plik:
+                return modul.parse_json(
+                    plik.read(),
+                    ["metadata", "users"],
+                    {"users": list, "metadata": dict},
+                )
+    else:
+        def uruchom() -> Any:
+            with open(sciezka, "r", encoding="utf-8") as plik:
+                return modul.parse_xml(
+                    plik,
+                    ["user", "metadata"],
+                    {"user": ["id", "age"]},
+                    # "iso" pomijamy – ParserV2 go nie obsługuje
+                    {"user@age": int, "user@is_active": bool},
+                    ["metadata"],
+                )
+    return uruchom
+
+
+def _percentyl(czasy: List[float], p: float) -> float:
+    """Percentyl metodą najbliższej rangi."""
+
+    posortowane = sorted(czasy)
+    indeks = max(0, min(len(posortowane) - 1, round(p / 100 * len(posortowane) + 0.5) - 1))
+    return posortowane[indeks]
+
+
+def _rss_szczyt() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux podaje KiB, macOS bajty
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def zmierz(
+    wariant: str,
+    format_: str,
+    sciezka: str,
+    rekordy: int,
+    powtorzenia: int,
+) -> Dict[str, Any]:
+    """Mierzy jeden przypadek (uruchamiane w procesie potomnym)."""
+
+    wynik: Dict[str, Any] = {
+        "wariant": wariant,
+        "format": format_,
+        "rekordy": rekordy,
+        "bajty": os.path.getsize(sciezka),
+        "powtorzenia": powtorzenia,
+    }
+    try:
+        uruchom = _wywolanie(_zaladuj(wariant, format_), format_, sciezka)
+
+        czasy = []
+        for _ in range(powtorzenia):
+            start = time.perf_counter()
+            uruchom()
+            czasy.append(time.perf_counter() - start)
+        rss = _rss_szczyt()
+
+        tracemalloc.start()
+        uruchom()
+        _, szczyt = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    except Exception as exc:
+        wynik["blad"] = f"{type(exc).__name__}: {exc}"
+        return wynik
+
+    mediana = _percentyl(czasy, 50)
+    wynik.update(
+        {
+            "czasy_s": czasy,
+            "p50_s": mediana,
+            "p90_s": _percentyl(czasy, 90),
+            "p99_s": _percentyl(czasy, 99),
+            "rekordy_na_s": rekordy / mediana if mediana else None,
+            "mb_na_s": wynik["bajty"] / 1e6 / mediana if mediana else None,
+            "tracemalloc_szczyt_b": szczyt,
+            "rss_szczyt_b": rss,
+        }
+    )
+    return wynik
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rozmiary",
+        type=int,
+        nargs="+",
+        default=[1_000, 100_000, 10_000_000],
+    )
+    parser.add_argument("--formaty", nargs="+", choices=list(MODULY), default=list(MODULY))
+    parser.add_argument("--warianty", nargs="+", choices=WARIANTY, default=WARIANTY)
+    parser.add_argument("--powtorzenia", type=int, default=5)
+    parser.add_argument(
+        "--powtorzenia-duze",
+        type=int,
+        default=1,
+        help="liczba powtórzeń dla rozmiarów >= 1M rekordów",
+    )
+    parser.add_argument("--katalog-danych", default=None)
+    parser.add_argument("--wynik", default="benchmark_wyniki.json")
+    args = parser.parse_args(argv)
+
+    katalog = args.katalog_danych or tempfile.mkdtemp(prefix="bench_parsery_")
+    os.makedirs(katalog, exist_ok=True)
+
+    wyniki = []
+    kontekst = get_context("spawn")
+    for rekordy in args.rozmiary:
+        powtorzenia = args.powtorzenia if rekordy < 1_000_000 else args.powtorzenia_duze
+        for format_ in args.formaty:
+            sciezka = os.path.join(katalog, f"dane_{rekordy}.{format_}")
+            if not os.path.exists(sciezka):
+                GENERATORY[format_](sciezka, rekordy)
+
+            for wariant in args.warianty:
+                with ProcessPoolExecutor(max_workers=1, mp_context=kontekst) as pula:
+                    wynik = pula.submit(
+                        zmierz, wariant, format_, sciezka, rekordy, powtorzenia
+                    ).result()
+                wyniki.append(wynik)
+                if "blad" in wynik:
+                    opis = wynik["blad"]
+                else:
+                    opis = (
+                        f"p50={wynik['p50_s']:.4f}s "
+                        f"{wynik['rekordy_na_s']:,.0f} rek/s "
+                        f"{wynik['mb_na_s']:.1f} MB/s"
+                    )
+                print(f"{format_:4} {rekordy:>10} {wariant:22} {opis}", flush=True)
+
+    with open(args.wynik, "w", encoding="utf-8") as plik:
+        json.dump(
+            {
+                "srodowisko": {
+                    "python": sys.version,
+                    "platforma": platform.platform(),
+                    "procesory": os.cpu_count(),
+                },
+                "wyniki": wyniki,
+            },
+            plik,
+            indent=2,
+            ensure_ascii=False,
+        )
+    print(f"Zapisano {args.wynik}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Syntetyczne dane wejściowe o kształcie advanced_sample.csv/.json.
+
+Pliki zapisywane są strumieniowo, więc nawet 10M rekordów nie wymaga
+trzymania całej zawartości w pamięci."""
+
+import json
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator
+
+IMIONA = ["Alice", "Bob", "Charlie", "David", "Eve", "Frank", "Grace"]
+MIASTA = [
+    ("New York", "10001"),
+    ("Los Angeles", "90001"),
+    ("Chicago", "60601"),
+    ("Warszawa", "00-001"),
+    ("Kraków", "30-001"),
+]
+ROLE = [[], ["viewer"], ["editor"], ["admin", "editor"]]
+
+
+def _uzytkownicy(liczba: int, ziarno: int = 0) -> Iterator[Dict]:
+    los = random.Random(ziarno)
+    poczatek = date(2015, 1, 1)
+    for i in range(1, liczba + 1):
+        imie = los.choice(IMIONA)
+        miasto, kod = los.choice(MIASTA)
+        yield {
+            "id": i,
+            "name": f"{imie}{i}",
+            "age": los.randint(18, 80),
+            "email": f"{imie.lower()}{i}@example.com",
+            "is_active": los.random() < 0.7,
+            "join_date": (poczatek + timedelta(days=los.randint(0, 3650))).isoformat(),
+            "roles": los.choice(ROLE),
+            "address": {"city": miasto, "zip": kod},
+        }
+
+
+def generuj_csv(sciezka: str, liczba: int) -> None:
+    with open(sciezka, "w", encoding="utf-8", newline="") as plik:
+        plik.write("id,name,age,email,is_active,join_date\n")
+        for u in _uzytkownicy(liczba):
+            plik.write(
+                f"{u['id']},{u['name']},{u['age']},{u['email']},"
+                f"{u['is_active']},{u['join_date']}\n"
+            )
+
+
+def generuj_json(sciezka: str, liczba: int) -> None:
+    with open(sciezka, "w", encoding="utf-8") as plik:
+        plik.write(
+            '{"metadata": {"source": "user_import", '
+            '"timestamp": "2025-05-15T10:30:00Z"},\n"users": [\n'
+        )
+        for u in _uzytkownicy(liczba):
+            if u["id"] > 1:
+                plik.write(",\n")
+            plik.write(json.dumps(u, ensure_ascii=False))
+        plik.write("\n]}\n")
+
+
+def generuj_xml(sciezka: str, liczba: int) -> None:
+    with open(sciezka, "w", encoding="utf-8") as plik:
+        plik.write('<users>\n<metadata source="user_import"/>\n')
+        for u in _uzytkownicy(liczba):
+            plik.write(
+                f'<user id="{u["id"]}" age="{u["age"]}" '
+                f'is_active="{str(u["is_active"]).lower()}" '
+                f'join_date="{u["join_date"]}">'
+                f'<name>{u["name"]}</name><email>{u["email"]}</email>'
+                f'<address city="{u["address"]["city"]}" zip="{u["address"]["zip"]}"/>'
+                "</user>\n"
+            )
+        plik.write("</users>\n")
+
+
+GENERATORY = {
+    "csv": generuj_csv,
+    "json": generuj_json,
+    "xml": generuj_xml,
+}